@@ -8,6 +8,183 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 UPLOADS_DIR = os.path.join(BASE_DIR, "uploads")
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
+# --- Session store (see app/services/session_store.py) ---
+# "sqlite" (durable, shared between workers) or "memory"
+SESSION_STORE_BACKEND = os.environ.get("SESSION_STORE_BACKEND", "sqlite").lower()
+SESSION_DB_PATH = os.environ.get("SESSION_DB_PATH", os.path.join(DATA_DIR, "sessions.db"))
+# emotion vectors kept per question for the completion report's percentiles
+# (exact up to this many chunks, a uniform sample beyond)
+SESSION_PERCENTILE_SAMPLES = int(os.environ.get("SESSION_PERCENTILE_SAMPLES", "64"))
+
+# --- Models (see app/services/model_registry.py) ---
+# "eager": load + warm up every model at startup; "lazy": load on first use (fast dev startup)
+MODEL_LOAD_MODE = os.environ.get("MODEL_LOAD_MODE", "eager").lower()
+WHISPER_MODEL_SIZE = os.environ.get("WHISPER_MODEL_SIZE", "small")
+# None lets whisper pick (cuda if available, else cpu)
+WHISPER_DEVICE: Optional[str] = os.environ.get("WHISPER_DEVICE") or None
+# speech-to-text engine (see app/services/asr_backends.py): "openai-whisper" or "faster-whisper"
+ASR_BACKEND = os.environ.get("ASR_BACKEND", "openai-whisper").lower()
+# faster-whisper only: CTranslate2 compute type ("int8", "int8_float16", "float32", ...),
+# intra-op threads (0 = library default) and beam size (1 = greedy, like openai-whisper)
+ASR_COMPUTE_TYPE = os.environ.get("ASR_COMPUTE_TYPE", "int8")
+ASR_CPU_THREADS = int(os.environ.get("ASR_CPU_THREADS", "0"))
+ASR_BEAM_SIZE = int(os.environ.get("ASR_BEAM_SIZE", "1"))
+EMOTION_MODEL_NAME = os.environ.get("EMOTION_MODEL_NAME", "SamLowe/roberta-base-go_emotions")
+# transformers device: -1 = cpu, 0 = first GPU, or a string like "cuda:0"
+EMOTION_DEVICE = os.environ.get("EMOTION_DEVICE", "-1")
+# emotion inference path (see app/services/emotion_backends.py):
+# "torch" (fp32), "torch-int8", "onnx" or "onnx-int8"
+EMOTION_BACKEND = os.environ.get("EMOTION_BACKEND", "torch").lower()
+# ONNX exports are written here once and reused on later startups
+EMOTION_ONNX_DIR = os.environ.get("EMOTION_ONNX_DIR", os.path.join(DATA_DIR, "onnx"))
+# ONNX Runtime sessions in the pool, and intra-op threads per session (0 = ORT default)
+EMOTION_ONNX_SESSIONS = int(os.environ.get("EMOTION_ONNX_SESSIONS", "2"))
+EMOTION_ONNX_THREADS = int(os.environ.get("EMOTION_ONNX_THREADS", "0"))
+
+# --- Voice activity detection gate in front of Whisper (see audio_processing.detect_speech) ---
+VAD_ENABLED = os.environ.get("VAD_ENABLED", "1") == "1"
+VAD_FRAME_MS = int(os.environ.get("VAD_FRAME_MS", "30"))
+# frames louder than VAD_THRESHOLD_DB count as speech (dBFS); when the chunk's
+# frame levels are bimodal (background + speech) or flat (background only),
+# the bar is raised to noise floor + VAD_MARGIN_DB
+VAD_THRESHOLD_DB = float(os.environ.get("VAD_THRESHOLD_DB", "-45"))
+VAD_MARGIN_DB = float(os.environ.get("VAD_MARGIN_DB", "10"))
+# minimum distance between the quiet and loud frame groups' mean levels (dB)
+# for the levels to count as bimodal
+VAD_BIMODAL_GAP_DB = float(os.environ.get("VAD_BIMODAL_GAP_DB", "20"))
+# chunks with less speech than this are not transcribed at all
+VAD_MIN_SPEECH_RATIO = float(os.environ.get("VAD_MIN_SPEECH_RATIO", "0.02"))
+# silence kept around the detected speech when trimming
+VAD_PAD_MS = int(os.environ.get("VAD_PAD_MS", "200"))
+
+# --- Emotion transcript windowing (see analysis.analyze_emotions) ---
+# long transcripts are split on token boundaries into windows of at most this
+# many tokens (capped by the tokenizer's limit, special tokens included) ...
+EMOTION_WINDOW_TOKENS = int(os.environ.get("EMOTION_WINDOW_TOKENS", "512"))
+# ... overlapping by this many tokens, so no sentence is only seen cut in half
+EMOTION_WINDOW_OVERLAP = int(os.environ.get("EMOTION_WINDOW_OVERLAP", "64"))
+
+# --- Emotion micro-batching (see app/services/emotion_batcher.py) ---
+# how long the scheduler waits for more texts after the first one arrives
+EMOTION_BATCH_WINDOW_MS = float(os.environ.get("EMOTION_BATCH_WINDOW_MS", "15"))
+# flush early once this many texts are pending
+EMOTION_BATCH_MAX_SIZE = int(os.environ.get("EMOTION_BATCH_MAX_SIZE", "32"))
+
+# --- Inference executor (see app/services/inference_executor.py) ---
+# "thread" or "process"
+INFERENCE_EXECUTOR = os.environ.get("INFERENCE_EXECUTOR", "thread").lower()
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", "2"))
+# jobs allowed to wait for a free worker before new work is rejected (503)
+INFERENCE_MAX_QUEUE = int(os.environ.get("INFERENCE_MAX_QUEUE", "16"))
+# full recordings analyzed at once (/feedback/analyze-recording); each one's
+# stage threads only coordinate, their Whisper calls share the pool above
+RECORDING_MAX_CONCURRENT = int(os.environ.get("RECORDING_MAX_CONCURRENT", "2"))
+
+# --- Upload ingest (see app/services/upload_ingest.py) ---
+# uploads are streamed in pieces of this size
+UPLOAD_PIECE_BYTES = int(os.environ.get("UPLOAD_PIECE_BYTES", str(1024 * 1024)))
+# per-upload limits, enforced while streaming (413 when exceeded)
+MAX_CHUNK_UPLOAD_BYTES = int(os.environ.get("MAX_CHUNK_UPLOAD_BYTES", str(16 * 1024 * 1024)))
+MAX_RECORDING_UPLOAD_BYTES = int(os.environ.get("MAX_RECORDING_UPLOAD_BYTES", str(256 * 1024 * 1024)))
+MAX_FILE_UPLOAD_BYTES = int(os.environ.get("MAX_FILE_UPLOAD_BYTES", str(32 * 1024 * 1024)))
+
+# --- Chunk uploads ---
+# keep a copy of every uploaded chunk under UPLOADS_DIR (written asynchronously;
+# transcription always decodes from memory)
+ARCHIVE_UPLOADS = os.environ.get("ARCHIVE_UPLOADS", "1") == "1"
+
+# --- Inference caches (see app/services/inference_cache.py) ---
+AUDIO_CACHE_ENTRIES = int(os.environ.get("AUDIO_CACHE_ENTRIES", "512"))
+# optional on-disk tier under DATA_DIR/cache/audio
+AUDIO_CACHE_DISK = os.environ.get("AUDIO_CACHE_DISK", "1") == "1"
+AUDIO_CACHE_DISK_MAX_MB = int(os.environ.get("AUDIO_CACHE_DISK_MAX_MB", "256"))
+# repeated transcripts (short/silent chunks) in front of analyze_emotions
+TEXT_CACHE_ENTRIES = int(os.environ.get("TEXT_CACHE_ENTRIES", "2048"))
+
+# --- WebSocket streaming (see app/routes/stream.py) ---
+# audio is finalized (transcript + clarity/emotion feedback, persisted) per window
+WS_WINDOW_SECONDS = float(os.environ.get("WS_WINDOW_SECONDS", "10"))
+# partial transcripts of the open window are pushed at most this often
+WS_PARTIAL_SECONDS = float(os.environ.get("WS_PARTIAL_SECONDS", "2"))
+
+# --- Background chunk-analysis jobs (see app/services/jobs.py) ---
+# uploads are rejected (503) once this many jobs are queued or running
+JOBS_MAX_PENDING = int(os.environ.get("JOBS_MAX_PENDING", "256"))
+# finished jobs kept around for polling
+JOBS_MAX_RETAINED = int(os.environ.get("JOBS_MAX_RETAINED", "2000"))
+# a job (or recording chunk) whose inference stage finds the pool full retries
+# that stage with backoff, at most this many times / this long, before failing
+JOBS_BUSY_MAX_ATTEMPTS = int(os.environ.get("JOBS_BUSY_MAX_ATTEMPTS", "8"))
+JOBS_BUSY_DEADLINE_SECONDS = float(os.environ.get("JOBS_BUSY_DEADLINE_SECONDS", "30"))
+# events buffered per SSE connection before they are dropped
+JOBS_SUBSCRIBER_BUFFER = int(os.environ.get("JOBS_SUBSCRIBER_BUFFER", "100"))
+
+# --- LLM calls (see app/services/llm_client.py) ---
+# Gemini REST endpoint; point GEMINI_API_BASE at a local stub server for testing
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+GEMINI_API_BASE = os.environ.get("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-pro")
+# per-attempt socket timeout, and overall deadline for one call including retries
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", "8"))
+LLM_DEADLINE_SECONDS = float(os.environ.get("LLM_DEADLINE_SECONDS", "12"))
+# retries after the first attempt, with exponential backoff (+ jitter) between them
+LLM_RETRIES = int(os.environ.get("LLM_RETRIES", "2"))
+LLM_BACKOFF_BASE_MS = float(os.environ.get("LLM_BACKOFF_BASE_MS", "200"))
+LLM_BACKOFF_MAX_MS = float(os.environ.get("LLM_BACKOFF_MAX_MS", "2000"))
+# circuit breaker: after this many failed calls in a row, skip the LLM (templated
+# fallbacks) for LLM_BREAKER_RESET_SECONDS, then let one trial call through
+LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.environ.get("LLM_BREAKER_RESET_SECONDS", "30"))
+# keep-alive connections per host, and threads for concurrent question generation
+LLM_POOL_SIZE = int(os.environ.get("LLM_POOL_SIZE", "10"))
+LLM_FANOUT_WORKERS = int(os.environ.get("LLM_FANOUT_WORKERS", "8"))
+
+# --- Question bank (see app/services/question_bank.py) ---
+# JSONL file, seeded with the built-in questions on first start
+QUESTION_BANK_PATH = os.environ.get("QUESTION_BANK_PATH", os.path.join(DATA_DIR, "question_bank.jsonl"))
+# how often (at most) the file's mtime is checked for hot reload
+QUESTION_BANK_RELOAD_SECONDS = float(os.environ.get("QUESTION_BANK_RELOAD_SECONDS", "5"))
+
+# --- Resume skill matching (see app/services/skill_matcher.py) ---
+# optional taxonomy file (canonical skill → aliases); the built-in one is used if absent
+SKILL_TAXONOMY_PATH = os.environ.get("SKILL_TAXONOMY_PATH", os.path.join(DATA_DIR, "skill_taxonomy.json"))
+
+# --- Resume ingestion (see app/services/resume_ingest.py) ---
+# background extraction threads for uploaded PDF / DOCX / TXT resumes
+RESUME_INGEST_WORKERS = int(os.environ.get("RESUME_INGEST_WORKERS", "1"))
+# POST /sessions waits at most this long for an extraction that is still running
+RESUME_INGEST_WAIT_SECONDS = float(os.environ.get("RESUME_INGEST_WAIT_SECONDS", "5"))
+# extracted text is capped; DOCX bodies larger than this are rejected (zip bombs)
+RESUME_MAX_CHARS = int(os.environ.get("RESUME_MAX_CHARS", "100000"))
+RESUME_MAX_XML_BYTES = int(os.environ.get("RESUME_MAX_XML_BYTES", str(20 * 1024 * 1024)))
+# extracted texts by content hash, in memory and under DATA_DIR/cache/resume
+RESUME_CACHE_ENTRIES = int(os.environ.get("RESUME_CACHE_ENTRIES", "256"))
+RESUME_CACHE_DISK_MAX_MB = int(os.environ.get("RESUME_CACHE_DISK_MAX_MB", "64"))
+
+# --- Resume question / skill memoization (see resume_parser.generate_resume_questions) ---
+# LLM questions per (resume, domain, count), in memory and under DATA_DIR/cache/resume_questions
+RESUME_QUESTION_CACHE_ENTRIES = int(os.environ.get("RESUME_QUESTION_CACHE_ENTRIES", "256"))
+RESUME_QUESTION_CACHE_DISK_MB = int(os.environ.get("RESUME_QUESTION_CACHE_DISK_MB", "32"))
+# entries older than REFRESH are served once more while a fresh variant is
+# generated in the background; entries older than TTL are regenerated first
+RESUME_QUESTION_REFRESH_HOURS = float(os.environ.get("RESUME_QUESTION_REFRESH_HOURS", "24"))
+RESUME_QUESTION_TTL_HOURS = float(os.environ.get("RESUME_QUESTION_TTL_HOURS", "168"))
+# extract_skills results per (resume, taxonomy)
+SKILL_CACHE_ENTRIES = int(os.environ.get("SKILL_CACHE_ENTRIES", "1024"))
+SKILL_CACHE_DISK_MB = int(os.environ.get("SKILL_CACHE_DISK_MB", "8"))
+
+# --- Pre-generated question pool (see app/services/question_pool.py) ---
+# 0 = every session generates its AI questions with a blocking Gemini call
+QUESTION_POOL_ENABLED = os.environ.get("QUESTION_POOL_ENABLED", "1") == "1"
+# a background refill starts once a pool holds fewer than LOW_WATER questions
+# and tops it up to TARGET, asking for BATCH questions per LLM call
+QUESTION_POOL_TARGET = int(os.environ.get("QUESTION_POOL_TARGET", "30"))
+QUESTION_POOL_LOW_WATER = int(os.environ.get("QUESTION_POOL_LOW_WATER", "10"))
+QUESTION_POOL_BATCH = int(os.environ.get("QUESTION_POOL_BATCH", "5"))
+# pooled questions older than this are discarded instead of served
+QUESTION_POOL_TTL_HOURS = float(os.environ.get("QUESTION_POOL_TTL_HOURS", "72"))
+QUESTION_POOL_PATH = os.environ.get("QUESTION_POOL_PATH", os.path.join(DATA_DIR, "question_pool.json"))
+
 # optional helper to ensure dirs exist
 def ensure_dirs():
     os.makedirs(UPLOADS_DIR, exist_ok=True)
@@ -7,11 +7,12 @@ from . import config
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from .services.json_response import FastJSONResponse
 
 LOG = logging.getLogger("uvicorn.error")
 
 # --- Create app early so we can attach middleware / mounts / routers safely ---
-app = FastAPI(title="Interview Coach Backend")
+app = FastAPI(title="Interview Coach Backend", default_response_class=FastJSONResponse)
 
 # --- CORS: allow frontend origins (include Vite default) ---
 default_origins = ["http://localhost:5173", "http://localhost:3000", "http://127.0.0.1:5173", "http://127.0.0.1:3000"]
@@ -60,8 +61,10 @@ files_mod = try_import("app.routes.files")
 sessions_mod = try_import("app.routes.sessions")
 feedback_mod = try_import("app.routes.feedback")
 auth_mod = try_import("app.routes.auth")
+health_mod = try_import("app.routes.health")
+stream_mod = try_import("app.routes.stream")
 
-# --- Register routers if present (order: sessions, feedback, files, auth) ---
+# --- Register routers if present (order: sessions, feedback, files, auth, health, stream) ---
 if sessions_mod and hasattr(sessions_mod, "router"):
     app.include_router(sessions_mod.router)
 else:
@@ -82,6 +85,16 @@ if auth_mod and hasattr(auth_mod, "router"):
 else:
     LOG.debug("auth router not found; skipping auth routes.")
 
+if health_mod and hasattr(health_mod, "router"):
+    app.include_router(health_mod.router)
+else:
+    LOG.info("health router not found; /health endpoints will be unavailable.")
+
+if stream_mod and hasattr(stream_mod, "router"):
+    app.include_router(stream_mod.router)
+else:
+    LOG.info("stream router not found; /ws streaming endpoints will be unavailable.")
+
 # --- Try to import services for preloading models (optional) ---
 audio_processing = try_import("app.services.audio_processing")
 analysis = try_import("app.services.analysis")
@@ -96,9 +109,12 @@ async def on_startup():
     os.makedirs(DATA_DIR, exist_ok=True)
     LOG.info("Ensured uploads and data directories exist: %s, %s", UPLOADS_DIR, DATA_DIR)
 
-    # Try to call optional loaders if provided by services
+    # Try to call optional loaders if provided by services (eager mode only;
+    # in lazy mode the model registry loads each model on first use)
+    if config.MODEL_LOAD_MODE != "eager":
+        LOG.info("MODEL_LOAD_MODE=%s: skipping model warmup.", config.MODEL_LOAD_MODE)
     try:
-        if audio_processing and hasattr(audio_processing, "load_models"):
+        if config.MODEL_LOAD_MODE == "eager" and audio_processing and hasattr(audio_processing, "load_models"):
             LOG.info("Loading audio_processing models...")
             audio_processing.load_models()
             LOG.info("audio_processing models loaded.")
@@ -106,7 +122,7 @@ async def on_startup():
         LOG.exception("audio_processing.load_models() failed: %s", e)
 
     try:
-        if analysis and hasattr(analysis, "load_models"):
+        if config.MODEL_LOAD_MODE == "eager" and analysis and hasattr(analysis, "load_models"):
             LOG.info("Loading analysis models...")
             analysis.load_models()
             LOG.info("analysis models loaded.")
@@ -121,6 +137,24 @@ async def on_startup():
     except Exception:
         LOG.debug("session_store._ensure_data_dir absent or failed; continuing.")
 
+    # refill the pre-generated question pools in the background (sessions
+    # created meanwhile fall back to direct generation)
+    try:
+        question_bank = try_import("app.services.question_bank")
+        if question_bank and hasattr(question_bank, "warm_pools"):
+            question_bank.warm_pools()
+    except Exception:
+        LOG.exception("question pool warmup failed; continuing.")
+
+# --- Shutdown: release inference workers ---
+@app.on_event("shutdown")
+async def on_shutdown():
+    try:
+        from app.services.inference_executor import inference
+        inference.shutdown(wait=False)
+    except Exception:
+        LOG.debug("inference executor shutdown failed; continuing.")
+
 # --- Simple health root ---
 @app.get("/")
 async def root():
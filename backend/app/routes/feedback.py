@@ -1,101 +1,196 @@
 # backend/app/routes/feedback.py
+import asyncio
 import os
+import random
+import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
-from app.services import session_store
+from app import config
+from app.services import jobs, session_store, upload_ingest
+from app.services.inference_cache import audio_cache, content_key
+from app.services.json_response import FastJSONResponse
+from app.services.session_models import dumps
+from app.services.upload_ingest import ingest_upload, UploadTooLarge
+from app.services.inference_executor import inference, InferenceBusyError
 
-router = APIRouter(tags=["feedback"])
+router = APIRouter(tags=["feedback"], default_response_class=FastJSONResponse)
 
 # ensure uploads directory exists
 UPLOADS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "uploads"))
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
+# Own lane for full recordings: admission is capped, and the pipeline's
+# coordinating threads run here instead of on an inference worker
+_recording_slots = threading.BoundedSemaphore(max(1, config.RECORDING_MAX_CONCURRENT))
+_recording_pool = ThreadPoolExecutor(max_workers=max(1, config.RECORDING_MAX_CONCURRENT), thread_name_prefix="recording")
 
-@router.post("/feedback/analyze")
-async def analyze_feedback(
-    audio: UploadFile = File(...),
-    session_id: str = Form(...),
-    question_id: str = Form(...),
-    chunk_index: int = Form(...),
-    chunk_start_time: Optional[int] = Form(None),
-    chunk_end_time: Optional[int] = Form(None),
-):
+
+async def _read_form(request: Request, max_bytes: int, label: str):
+    """upload_ingest.read_form with its errors mapped to 413 / 400."""
+    try:
+        return await upload_ingest.read_form(request, max_bytes, label=label)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid form data: {e}")
+
+
+_CHUNK_FORM_SCHEMA = upload_ingest.form_schema(
+    "audio",
+    {
+        "session_id": {"type": "string"},
+        "question_id": {"type": "string"},
+        "chunk_index": {"type": "integer"},
+        "chunk_start_time": {"type": "integer"},
+        "chunk_end_time": {"type": "integer"},
+        "mode": {"type": "string", "enum": ["job"]},
+    },
+    required=("session_id", "question_id", "chunk_index"),
+)
+
+
+@router.post("/feedback/analyze", openapi_extra=_CHUNK_FORM_SCHEMA)
+async def analyze_feedback(request: Request):
     """
     Endpoint for uploading one audio chunk (browser chunk).
     Expects multipart/form-data with:
-      - audio (file)
+      - audio (file, at most MAX_CHUNK_UPLOAD_BYTES; 413 while uploading otherwise)
       - session_id (str)
       - question_id (str)
       - chunk_index (int)
       - optional chunk_start_time / chunk_end_time (ms)
+      - optional mode ("job" = return immediately, run the pipeline in the background)
 
     Returns:
-      feedback JSON (transcript, clarity_score, confidence_score, emotions)
+      feedback JSON (transcript, clarity_score, confidence_score, emotions),
+      or in job mode 202 { job_id, status } — poll GET /feedback/jobs/{job_id}
+      or listen on GET /feedback/sessions/{session_id}/events.
     """
+    form = await _read_form(request, config.MAX_CHUNK_UPLOAD_BYTES, "chunk")
+    try:
+        try:
+            audio = upload_ingest.form_file(form, "audio")
+            session_id = upload_ingest.form_text(form, "session_id", required=True)
+            question_id = upload_ingest.form_text(form, "question_id", required=True)
+            chunk_index = upload_ingest.form_int(form, "chunk_index", required=True)
+            chunk_start_time = upload_ingest.form_int(form, "chunk_start_time")
+            chunk_end_time = upload_ingest.form_int(form, "chunk_end_time")
+            mode = upload_ingest.form_text(form, "mode")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    # 1) Basic validation: session must exist
-    sess = session_store.get_session(session_id)
-    if not sess:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+        # 1) Basic validation: session must exist
+        if not session_store.session_exists(session_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
 
-    # 2) Save uploaded file to uploads dir
-    try:
-        ext = os.path.splitext(audio.filename)[1] or ".webm"
+        job_mode = (mode or "").lower() == "job"
+        if job_mode and jobs.pending_count() >= config.JOBS_MAX_PENDING:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many pending analysis jobs", headers={"Retry-After": "2"})
+
+        # 2) Read the parsed upload (size-limited, hashed on the fly); decoding
+        #    happens in memory, archiving to disk is optional
+        ext = os.path.splitext(audio.filename or "")[1] or ".webm"
+        try:
+            ingest = await ingest_upload(audio, max_bytes=config.MAX_CHUNK_UPLOAD_BYTES, keep_bytes=True, label="chunk")
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed reading upload: {e}")
+    finally:
+        await form.close()
+    contents = ingest.data
+
+    audio_path = None
+    if config.ARCHIVE_UPLOADS:
         fname = f"{uuid.uuid4().hex}{ext}"
-        dest_path = os.path.join(UPLOADS_DIR, fname)
-        with open(dest_path, "wb") as f:
-            contents = await audio.read()
-            f.write(contents)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed saving upload: {e}")
+        _archive_upload(contents, fname)
+        audio_path = f"/uploads/{fname}"
 
-    # 3) Transcribe the chunk (lazy import of audio_processing)
-    transcript = ""
-    try:
-        from app.services.audio_processing import transcribe_chunk
-        transcript = transcribe_chunk(dest_path)
-    except Exception as e:
-        # transcription failed — keep transcript empty but continue storing file
-        transcript = ""
-        # don't raise; we want to return something to frontend. Log the error.
-        # If you want transcription to be mandatory, raise HTTPException here.
-        print("transcription error:", e)
+    # 3-6) Job mode: hand the chunk to a background worker
+    if job_mode:
+        job = jobs.create_job(session_id, question_id, int(chunk_index))
+        jobs.start(job["id"], _run_job(job["id"], contents, ingest.sha256, audio_path, session_id, question_id,
+                                       chunk_index, chunk_start_time, chunk_end_time))
+        return FastJSONResponse(status_code=status.HTTP_202_ACCEPTED, content={"job_id": job["id"], "status": job["status"]})
 
-    # 4) Run analysis on transcript (try multiple available functions)
-    analysis_result = {}
+    feedback = await _process_chunk(contents, ingest.sha256, audio_path, session_id, question_id,
+                                    chunk_index, chunk_start_time, chunk_end_time)
+
+    # 7) Return feedback JSON to caller
+    return FastJSONResponse(status_code=200, content=feedback)
+
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _archive_upload(data: bytes, fname: str):
+    """Fire-and-forget copy of the raw upload into UPLOADS_DIR (off the event loop)."""
+    dest_path = os.path.join(UPLOADS_DIR, fname)
+    fut = asyncio.get_running_loop().run_in_executor(None, _write_file, dest_path, data)
+    fut.add_done_callback(_log_archive_error)
+
+
+def _log_archive_error(fut):
+    exc = fut.exception()
+    if exc:
+        print("archive upload error:", exc)
+
+
+async def _process_chunk(
+    audio_bytes: bytes,
+    audio_sha256: str,
+    audio_path: Optional[str],
+    session_id: str,
+    question_id: str,
+    chunk_index: int,
+    chunk_start_time: Optional[int],
+    chunk_end_time: Optional[int],
+    retry_busy: bool = False,
+) -> dict:
+    """
+    Transcribe + analyze one uploaded chunk and persist it to session_store.
+    Shared by the synchronous endpoint and background jobs (retry_busy=True:
+    a saturated inference pool is retried per stage, see _infer).
+    """
+    # 3) Cache lookup: a retried upload of byte-identical audio reuses earlier results
     try:
         import app.services.analysis as analysis
     except Exception:
         analysis = None
+    from app.services import audio_processing
+
+    model_id = audio_processing.model_identity() + "|" + (analysis.model_identity() if analysis else "none")
+    cache_key = content_key(audio_sha256, model_id)
+    cached = audio_cache.get(cache_key)
 
+    analysis_result = {}
     clarity_score = None
     confidence_score = None
     emotions = {}
 
-    if analysis:
-        # prefer analyze_text (single-text API)
-        try:
-            if hasattr(analysis, "analyze_text"):
-                # analyze_text should return dict with keys: emotions, clarity_score, confidence_score
-                analysis_result = analysis.analyze_text(transcript)
-            elif hasattr(analysis, "analyze_emotions"):
-                # some modules return emotions only
-                analysis_result = analysis.analyze_emotions([transcript])  # may return list
-                # normalize if list
-                if isinstance(analysis_result, list) and analysis_result:
-                    analysis_result = analysis_result[0]
-            elif hasattr(analysis, "analyze_chunks"):
-                # analyze_chunks may accept list
-                analysis_result = analysis.analyze_chunks([transcript])[0]
-        except Exception as e:
-            # analysis may fail for many reasons (model not loaded, etc.)
-            print("analysis error:", e)
-            analysis_result = {}
+    if cached is not None:
+        transcript = cached.get("transcript", "")
+        speech_ratio = cached.get("speech_ratio")
+        analysis_result = {"emotions": cached.get("emotions") or {}}
+    else:
+        transcript, speech_ratio, analysis_result, ok = await _run_models(audio_bytes, audio_processing, analysis, retry_busy)
+        if ok:
+            # only successful runs are cached; failures get retried
+            audio_cache.put(cache_key, {
+                "transcript": transcript,
+                "speech_ratio": speech_ratio,
+                "emotions": (analysis_result.get("emotions") or {}) if isinstance(analysis_result, dict) else {},
+            })
 
     # Map results to fields (robust)
     if isinstance(analysis_result, dict):
@@ -105,25 +200,10 @@ async def analyze_feedback(
 
     # If analysis didn't give us scores, attempt simple heuristics:
     if clarity_score is None:
-        # simple filler-word heuristic (very rough, 0..1)
-        try:
-            words = transcript.lower().split()
-            fillers = {"um", "uh", "like", "so", "actually", "basically", "right", "okay", "ok", "you", "know"}
-            filler_count = sum(1 for w in words if w in fillers)
-            clarity_score = max(0.0, 1.0 - (filler_count / max(1, len(words))) * 2.0) if words else 0.0
-        except Exception:
-            clarity_score = 0.0
+        clarity_score = _heuristic(analysis, "estimate_clarity", transcript, 0.0)
 
     if confidence_score is None:
-        # attempt simple confidence estimate from emotions if available
-        try:
-            joy = float(emotions.get("joy", 0.0)) if isinstance(emotions, dict) else 0.0
-            neutral = float(emotions.get("neutral", 0.0)) if isinstance(emotions, dict) else 0.0
-            sadness = float(emotions.get("sadness", 0.0)) if isinstance(emotions, dict) else 0.0
-            raw = (joy + neutral) - sadness
-            confidence_score = max(0.0, min(1.0, (raw + 1.0) / 2.0))
-        except Exception:
-            confidence_score = 0.5
+        confidence_score = _heuristic(analysis, "estimate_confidence", emotions, 0.5)
 
     # 5) Build feedback object
     feedback = {
@@ -131,7 +211,8 @@ async def analyze_feedback(
         "clarity_score": float(clarity_score) if clarity_score is not None else None,
         "confidence_score": float(confidence_score) if confidence_score is not None else None,
         "emotions": emotions or {},
-        "audio_path": f"/uploads/{fname}",
+        "speech_ratio": speech_ratio,
+        "audio_path": audio_path,
         "processed_at": datetime.utcnow().isoformat() + "Z",
     }
 
@@ -151,5 +232,301 @@ async def analyze_feedback(
         print("session_store.add_chunk_feedback error:", e)
         raise HTTPException(status_code=500, detail=f"Failed to persist chunk feedback: {e}")
 
-    # 7) Return feedback JSON to caller
-    return JSONResponse(status_code=200, content=feedback)
+    return feedback
+
+
+async def _infer(stage: str, fn, *args, retry_busy: bool = False):
+    """
+    inference.run(stage, fn, *args). With retry_busy, an InferenceBusyError is
+    retried (only this stage) with jittered exponential backoff, at most
+    JOBS_BUSY_MAX_ATTEMPTS times within JOBS_BUSY_DEADLINE_SECONDS; the last
+    InferenceBusyError is re-raised after that.
+    """
+    if not retry_busy:
+        return await inference.run(stage, fn, *args)
+    deadline = time.monotonic() + config.JOBS_BUSY_DEADLINE_SECONDS
+    delay = 0.25
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await inference.run(stage, fn, *args)
+        except InferenceBusyError:
+            pause = random.uniform(delay / 2, delay)
+            if attempt >= config.JOBS_BUSY_MAX_ATTEMPTS or time.monotonic() + pause > deadline:
+                raise
+            await asyncio.sleep(pause)
+            delay = min(delay * 2, 4.0)
+
+
+async def _run_models(audio_bytes: bytes, audio_processing, analysis, retry_busy: bool = False):
+    """
+    Decode + transcribe on the inference pool, then score emotions through
+    the shared emotion batcher.
+    Returns (transcript, speech_ratio, analysis_result, ok) where ok means both
+    stages succeeded. Chunks the VAD gate finds silent skip both models.
+    """
+    # Decode in memory + transcribe on the inference pool
+    transcript = ""
+    speech_ratio = None
+    transcribed = False
+    try:
+        asr = await _infer("transcribe", audio_processing.transcribe_bytes, audio_bytes, retry_busy=retry_busy)
+        transcript = asr["text"]
+        speech_ratio = asr["speech_ratio"]
+        transcribed = True
+        if asr["vad_skipped"]:
+            # silence: nothing to score, and an empty transcript is the right answer
+            return transcript, speech_ratio, {}, True
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        # transcription failed — keep transcript empty but continue storing feedback
+        transcript = ""
+        # don't raise; we want to return something to frontend. Log the error.
+        # If you want transcription to be mandatory, raise HTTPException here.
+        print("transcription error:", e)
+
+    # Run analysis on transcript (try multiple available functions)
+    analysis_result = {}
+    analyzed = True
+    if analysis:
+        try:
+            if hasattr(analysis, "analyze_text_async"):
+                # awaited on the emotion batcher, not on the inference pool: a
+                # pool worker blocked on a batch future would cap every batch
+                # at INFERENCE_WORKERS texts
+                analysis_result = await analysis.analyze_text_async(transcript)
+            elif hasattr(analysis, "analyze_text"):
+                # analyze_text should return dict with keys: emotions, clarity_score, confidence_score
+                analysis_result = await _infer("analyze", analysis.analyze_text, transcript, retry_busy=retry_busy)
+            elif hasattr(analysis, "analyze_emotions"):
+                # some modules return emotions only
+                analysis_result = await _infer("analyze", analysis.analyze_emotions, [transcript], retry_busy=retry_busy)  # may return list
+                # normalize if list
+                if isinstance(analysis_result, list) and analysis_result:
+                    analysis_result = analysis_result[0]
+            elif hasattr(analysis, "analyze_chunks"):
+                # analyze_chunks may accept list
+                analysis_result = (await _infer("analyze", analysis.analyze_chunks, [transcript], retry_busy=retry_busy))[0]
+        except InferenceBusyError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+        except Exception as e:
+            # analysis may fail for many reasons (model not loaded, etc.)
+            print("analysis error:", e)
+            analysis_result = {}
+            analyzed = False
+
+    return transcript, speech_ratio, analysis_result, transcribed and analyzed
+
+
+def _heuristic(analysis, name: str, arg, default: float) -> float:
+    try:
+        return getattr(analysis, name)(arg)
+    except Exception:
+        return default
+
+
+async def _run_job(job_id: str, *args):
+    """
+    Background worker for job mode. A saturated inference pool is retried per
+    stage with backoff (bounded, see _infer); after that the job fails.
+    """
+    jobs.mark_running(job_id)
+    try:
+        feedback = await _process_chunk(*args, retry_busy=True)
+    except HTTPException as e:
+        jobs.mark_failed(job_id, str(e.detail))
+        return
+    except Exception as e:
+        jobs.mark_failed(job_id, str(e))
+        return
+    jobs.mark_done(job_id, feedback)
+
+
+_RECORDING_FORM_SCHEMA = upload_ingest.form_schema(
+    "audio",
+    {
+        "session_id": {"type": "string"},
+        "question_id": {"type": "string"},
+        "chunk_seconds": {"type": "integer", "default": 30},
+    },
+)
+
+
+@router.post("/feedback/analyze-recording", openapi_extra=_RECORDING_FORM_SCHEMA)
+async def analyze_recording(request: Request):
+    """
+    Analyze a full recording server-side: segmentation, transcription and
+    emotion scoring run as overlapping stages connected by bounded queues.
+    If session_id and question_id are given, every chunk is also persisted
+    to session_store. At most RECORDING_MAX_CONCURRENT recordings run at once
+    (503 otherwise); their per-chunk transcriptions share the inference pool.
+
+    multipart/form-data: audio (file, at most MAX_RECORDING_UPLOAD_BYTES;
+    413 while uploading otherwise), optional session_id, question_id,
+    chunk_seconds (default 30). The recording goes to a temp file, never
+    into memory.
+
+    Returns { chunks: [...], aggregated: {...}, timings: {stage: wall/busy seconds} }
+    """
+    if not _recording_slots.acquire(blocking=False):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many recordings in progress", headers={"Retry-After": "5"})
+    try:
+        form = await _read_form(request, config.MAX_RECORDING_UPLOAD_BYTES, "recording")
+        try:
+            try:
+                audio = upload_ingest.form_file(form, "audio")
+                session_id = upload_ingest.form_text(form, "session_id")
+                question_id = upload_ingest.form_text(form, "question_id")
+                chunk_seconds = upload_ingest.form_int(form, "chunk_seconds", default=30)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if chunk_seconds <= 0:
+                raise HTTPException(status_code=400, detail="chunk_seconds must be positive")
+            persist = bool(session_id and question_id)
+            if persist and not session_store.session_exists(session_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+            result = await _analyze_recording(audio, chunk_seconds)
+        finally:
+            await form.close()
+    finally:
+        _recording_slots.release()
+
+    if persist:
+        now = datetime.utcnow().isoformat() + "Z"
+        try:
+            for c in result["chunks"]:
+                start_ms = int(c["start_seconds"] * 1000)
+                session_store.add_chunk_feedback(session_id, question_id, {
+                    "chunk_index": c["chunk_index"],
+                    "chunk_start_time": start_ms,
+                    "chunk_end_time": start_ms + int(c["duration_seconds"] * 1000),
+                    "feedback": {
+                        "transcript": c["transcript"],
+                        "clarity_score": c["clarity_score"],
+                        "confidence_score": c["confidence_score"],
+                        "emotions": c["emotions"],
+                        "audio_path": None,
+                        "processed_at": now,
+                    },
+                    "saved_at": now,
+                })
+        except Exception as e:
+            print("session_store.add_chunk_feedback error:", e)
+            raise HTTPException(status_code=500, detail=f"Failed to persist chunk feedback: {e}")
+
+    return FastJSONResponse(status_code=200, content=result)
+
+
+async def _analyze_recording(audio: UploadFile, chunk_seconds: int) -> dict:
+    """Copy the upload to a temp file (ffmpeg decodes it from there) and run the pipeline."""
+    ext = os.path.splitext(audio.filename or "")[1].lower() or ".webm"
+    fd, path = tempfile.mkstemp(prefix="recording-", suffix=ext)
+    os.close(fd)
+    try:
+        return await _run_recording(audio, path, chunk_seconds)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def _run_recording(audio: UploadFile, path: str, chunk_seconds: int) -> dict:
+    try:
+        await ingest_upload(audio, max_bytes=config.MAX_RECORDING_UPLOAD_BYTES, dest_path=path, label="recording")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed reading upload: {e}")
+
+    from app.services import audio_processing
+    from app.services.recording_pipeline import run_recording_pipeline
+
+    loop = asyncio.get_running_loop()
+
+    def transcribe_chunk(audio_chunk):
+        # called on the pipeline's transcribe thread; the model call itself
+        # waits for an inference slot like every other transcription
+        return asyncio.run_coroutine_threadsafe(
+            _infer("recording_transcribe", audio_processing.transcribe_audio, audio_chunk, retry_busy=True), loop
+        ).result()
+
+    try:
+        return await loop.run_in_executor(
+            _recording_pool, lambda: run_recording_pipeline(path, chunk_seconds, transcribe_fn=transcribe_chunk)
+        )
+    except RuntimeError as e:
+        if isinstance(e.__cause__, InferenceBusyError):
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "5"})
+        raise HTTPException(status_code=500, detail=f"Recording analysis failed: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Recording analysis failed: {e}")
+
+
+@router.get("/feedback/jobs/{job_id}")
+def get_feedback_job(job_id: str):
+    """Poll a background analysis job (status: queued | running | done | failed)."""
+    job = jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return FastJSONResponse(job)
+
+
+@router.get("/feedback/sessions/{session_id}/events")
+async def feedback_events(session_id: str, request: Request):
+    """
+    Server-sent events stream pushing each chunk's feedback for a session
+    as its background job finishes (events: chunk_feedback, chunk_failed).
+    """
+    if not session_store.session_exists(session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+    queue = jobs.subscribe(session_id)
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    msg = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # keep-alive comment so proxies don't close the stream
+                    yield ": ping\n\n"
+                    continue
+                job = msg["job"]
+                yield f"id: {job['id']}\nevent: {msg['event']}\ndata: {dumps(job).decode('utf-8')}\n\n"
+        finally:
+            jobs.unsubscribe(session_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/feedback/metrics")
+def feedback_metrics():
+    """
+    Tuning metrics for the inference path: per-stage executor queue depth and
+    wait time, emotion micro-batching (batch sizes, queue wait, inference time),
+    audio/text cache hit/miss counters and upload ingest throughput.
+    """
+    metrics = {"executor": inference.stats(), "jobs": {"pending": jobs.pending_count()}}
+    metrics["cache"] = {"audio": audio_cache.stats()}
+    metrics["ingest"] = upload_ingest.stats()
+    try:
+        import app.services.analysis as analysis
+        metrics["emotion_batcher"] = analysis.batcher.stats()
+        metrics["cache"]["text"] = analysis.text_cache.stats()
+        metrics["emotion_windows"] = analysis.window_stats()
+    except Exception as e:
+        metrics["emotion_batcher"] = {"error": str(e)}
+    try:
+        from app.services import audio_processing
+        metrics["vad"] = audio_processing.vad_stats()
+    except Exception as e:
+        metrics["vad"] = {"error": str(e)}
+    return FastJSONResponse(metrics)
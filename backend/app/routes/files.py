@@ -3,13 +3,15 @@ import os
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
 
 # import config (safe, no circular import)
-from ..config import UPLOADS_DIR
+from ..config import UPLOADS_DIR, MAX_FILE_UPLOAD_BYTES
+from ..services import resume_ingest, upload_ingest
+from ..services.json_response import FastJSONResponse
+from ..services.upload_ingest import ingest_upload, UploadTooLarge
 
-router = APIRouter(prefix="/files", tags=["files"])
+router = APIRouter(prefix="/files", tags=["files"], default_response_class=FastJSONResponse)
 
 def _safe_filename(session_id: Optional[str], question_id: Optional[str], chunk_index: Optional[str], original_filename: str):
     ext = os.path.splitext(original_filename)[1] or ".bin"
@@ -19,35 +21,81 @@ def _safe_filename(session_id: Optional[str], question_id: Optional[str], chunk_
     uid = uuid.uuid4().hex[:8]
     return f"{sid}__{qid}__chunk{idx}__{uid}{ext}"
 
-@router.post("/upload")
-async def upload_file(
-    file: UploadFile = File(...),
-    session_id: Optional[str] = Form(None),
-    question_id: Optional[str] = Form(None),
-    chunk_index: Optional[str] = Form(None),
-):
-    if file is None:
-        raise HTTPException(status_code=400, detail="No file uploaded")
+_UPLOAD_FORM_SCHEMA = upload_ingest.form_schema(
+    "file",
+    {"session_id": {"type": "string"}, "question_id": {"type": "string"}, "chunk_index": {"type": "string"}},
+)
 
-    os.makedirs(UPLOADS_DIR, exist_ok=True)
-
-    filename = _safe_filename(session_id, question_id, chunk_index, file.filename or "upload.bin")
-    dest_path = os.path.join(UPLOADS_DIR, filename)
 
+@router.post("/upload", openapi_extra=_UPLOAD_FORM_SCHEMA)
+async def upload_file(request: Request):
+    """
+    multipart/form-data: file (at most MAX_FILE_UPLOAD_BYTES; 413 while
+    uploading otherwise), optional session_id, question_id, chunk_index.
+    Returns { status, file_url, size, sha256, ... } (+ resume extraction status).
+    """
     try:
-        with open(dest_path, "wb") as dest:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                dest.write(chunk)
+        form = await upload_ingest.read_form(request, MAX_FILE_UPLOAD_BYTES, label="files")
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
     except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid form data: {exc}")
+    try:
         try:
-            if os.path.exists(dest_path):
-                os.remove(dest_path)
-        except Exception:
-            pass
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {exc}")
+            file = upload_ingest.form_file(form, "file")
+            session_id = upload_ingest.form_text(form, "session_id")
+            question_id = upload_ingest.form_text(form, "question_id")
+            chunk_index = upload_ingest.form_text(form, "chunk_index")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        os.makedirs(UPLOADS_DIR, exist_ok=True)
+
+        filename = _safe_filename(session_id, question_id, chunk_index, file.filename or "upload.bin")
+        dest_path = os.path.join(UPLOADS_DIR, filename)
+
+        try:
+            # read in bounded pieces; ingest removes a partial file on failure
+            ingest = await ingest_upload(file, max_bytes=MAX_FILE_UPLOAD_BYTES, dest_path=dest_path, label="files")
+        except UploadTooLarge as exc:
+            raise HTTPException(status_code=413, detail=str(exc))
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"Failed to save file: {exc}")
+    finally:
+        await form.close()
 
     file_url = f"/uploads/{filename}"
-    return JSONResponse({"status": "ok", "file_url": file_url, "session_id": session_id, "question_id": question_id, "chunk_index": chunk_index})
+    response = {
+        "status": "ok",
+        "file_url": file_url,
+        "session_id": session_id,
+        "question_id": question_id,
+        "chunk_index": chunk_index,
+        "size": ingest.size,
+        "sha256": ingest.sha256,
+    }
+    # resumes: extract text + skills in the background (pass file_url as resume_file_path later)
+    if os.path.splitext(filename)[1].lower() in resume_ingest.SUPPORTED_EXTENSIONS:
+        try:
+            resume = resume_ingest.submit(dest_path, ingest.sha256)
+            response["resume"] = {"status": resume["status"], "status_url": f"/files/resumes/{ingest.sha256}"}
+        except Exception as e:
+            print("Resume ingestion could not be queued:", e)
+    return FastJSONResponse(response)
+
+
+@router.get("/resumes/{sha256}")
+def resume_status(sha256: str, include_text: bool = False):
+    """
+    Extraction status of an uploaded resume (queued / running / done / failed),
+    with the detected skills once done; include_text=true adds the extracted text.
+    """
+    status = resume_ingest.get_status(sha256)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if include_text and status["status"] == "done":
+        result = resume_ingest.get_result(sha256)
+        if result:
+            status["text"] = result["text"]
+            status["skill_counts"] = result["skill_counts"]
+    return FastJSONResponse(status)
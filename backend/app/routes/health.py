@@ -0,0 +1,45 @@
+# backend/app/routes/health.py
+from fastapi import APIRouter
+
+from app import config
+from app.services.json_response import FastJSONResponse
+from app.services.model_registry import registry
+
+router = APIRouter(prefix="/health", tags=["health"], default_response_class=FastJSONResponse)
+
+
+@router.get("/models")
+def models_health():
+    """
+    Model registry status: per model whether it is loaded, load/warmup time,
+    parameter memory and process RSS growth while loading.
+    """
+    # make sure the services have registered their models
+    try:
+        import app.services.audio_processing  # noqa: F401
+        import app.services.analysis  # noqa: F401
+    except Exception:
+        pass
+    return {"mode": config.MODEL_LOAD_MODE, "models": registry.stats()}
+
+
+@router.get("/llm")
+def llm_health():
+    """
+    LLM client status: per endpoint call/failure/retry counts, latency and
+    circuit breaker state, plus the pre-generated question pool sizes and
+    the resume question / skill caches.
+    """
+    from app.services import llm_client, question_pool
+    # make sure the services have created their clients
+    try:
+        import app.services.gemini_client  # noqa: F401
+        import app.services.resume_parser  # noqa: F401
+    except Exception:
+        pass
+    try:
+        from app.services.resume_parser import cache_stats as resume_cache_stats
+        resume_caches = resume_cache_stats()
+    except Exception:
+        resume_caches = None
+    return {"llm": llm_client.stats(), "question_pool": question_pool.stats(), "resume_caches": resume_caches}
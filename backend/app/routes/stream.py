@@ -0,0 +1,208 @@
+# backend/app/routes/stream.py
+"""
+WebSocket endpoint for real-time answer streaming.
+
+  ws://.../ws/sessions/{session_id}/questions/{question_id}?format=pcm_s16le
+
+The client sends binary audio frames (16 kHz mono pcm_s16le / f32le, or an
+Opus webm/ogg stream with format=webm|ogg) and may send a text frame
+{"type": "stop"} to flush and close. The server keeps a rolling 16 kHz
+buffer for the open window and replies with JSON messages:
+
+  {"type": "partial", "window_index", "transcript"}   while the window grows
+  {"type": "final", "window_index", "feedback"}       once per closed window
+  {"type": "busy"} / {"type": "error", "detail"}
+
+Every final window is persisted through session_store.add_chunk_feedback.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app import config
+from app.services import analysis, audio_processing, session_store
+from app.services.inference_executor import inference, InferenceBusyError
+
+router = APIRouter(tags=["stream"])
+
+SAMPLE_RATE = audio_processing.SAMPLE_RATE
+
+
+class _Connection:
+    """Per-socket state: rolling buffer, window bookkeeping and a send lock."""
+
+    def __init__(self, ws: WebSocket, session_id: str, question_id: str, start_index: int):
+        self.ws = ws
+        self.session_id = session_id
+        self.question_id = question_id
+        self.window_index = start_index
+        self.window_start_sample = 0
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.samples_at_last_partial = 0
+        self.partial_task: Optional[asyncio.Task] = None
+        self.send_lock = asyncio.Lock()
+        self.closed = False
+        # closed windows waiting for transcription + analysis, finalized in order
+        self.finals: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+    async def send(self, payload: dict):
+        """Best effort: once the client is gone, results are still persisted, just not pushed."""
+        if self.closed:
+            return
+        async with self.send_lock:
+            try:
+                await self.ws.send_text(json.dumps(payload))
+            except Exception:
+                self.closed = True
+
+
+async def _run_with_retry(stage: str, fn, *args):
+    """Final windows must not be dropped: wait for the pool instead of failing."""
+    while True:
+        try:
+            return await inference.run(stage, fn, *args)
+        except InferenceBusyError:
+            await asyncio.sleep(0.25)
+
+
+async def _partial(conn: _Connection, window_index: int, audio: np.ndarray):
+    try:
+        # partials re-read the growing window; only the final transcription counts in vad_stats
+        text = (await inference.run("transcribe", audio_processing.transcribe_audio, audio, record_stats=False))["text"]
+    except InferenceBusyError:
+        await conn.send({"type": "busy"})
+        return
+    except Exception as e:
+        await conn.send({"type": "error", "detail": f"partial transcription failed: {e}"})
+        return
+    # a partial that finishes after its window closed is stale
+    if window_index == conn.window_index:
+        await conn.send({"type": "partial", "window_index": window_index, "transcript": text})
+
+
+async def _finalizer(conn: _Connection):
+    """Transcribe, analyze and persist closed windows, one at a time, in order."""
+    while True:
+        item = await conn.finals.get()
+        if item is None:
+            return
+        window_index, start_sample, audio = item
+        try:
+            asr = await _run_with_retry("transcribe", audio_processing.transcribe_audio, audio)
+            transcript = asr["text"]
+            emotions = {}
+            if not asr["vad_skipped"]:
+                result = await analysis.analyze_text_async(transcript)
+                emotions = result.get("emotions") or {}
+            now = datetime.utcnow().isoformat() + "Z"
+            feedback = {
+                "transcript": transcript,
+                "clarity_score": float(analysis.estimate_clarity(transcript)),
+                "confidence_score": float(analysis.estimate_confidence(emotions)),
+                "emotions": emotions,
+                "speech_ratio": asr["speech_ratio"],
+                "audio_path": None,
+                "processed_at": now,
+            }
+            start_ms = int(start_sample * 1000 / SAMPLE_RATE)
+            session_store.add_chunk_feedback(conn.session_id, conn.question_id, {
+                "chunk_index": window_index,
+                "chunk_start_time": start_ms,
+                "chunk_end_time": start_ms + int(len(audio) * 1000 / SAMPLE_RATE),
+                "feedback": feedback,
+                "saved_at": now,
+            })
+            await conn.send({"type": "final", "window_index": window_index, "feedback": feedback})
+        except Exception as e:
+            print("stream finalize error:", e)
+            await conn.send({"type": "error", "window_index": window_index, "detail": str(e)})
+
+
+async def _close_window(conn: _Connection, upto: int):
+    """Move buffer[:upto] into the finalize queue and open the next window."""
+    audio, conn.buffer = conn.buffer[:upto], conn.buffer[upto:]
+    item = (conn.window_index, conn.window_start_sample, audio)
+    conn.window_index += 1
+    conn.window_start_sample += len(audio)
+    conn.samples_at_last_partial = 0
+    await conn.finals.put(item)  # blocks (backpressure) if finalization falls behind
+
+
+async def _on_audio(conn: _Connection, samples: np.ndarray):
+    if samples.size:
+        conn.buffer = np.concatenate((conn.buffer, samples))
+
+    window = int(config.WS_WINDOW_SECONDS * SAMPLE_RATE)
+    while len(conn.buffer) >= window:
+        await _close_window(conn, window)
+
+    # sliding partial over the open window; never queue more than one
+    step = int(config.WS_PARTIAL_SECONDS * SAMPLE_RATE)
+    if (len(conn.buffer) - conn.samples_at_last_partial >= step
+            and (conn.partial_task is None or conn.partial_task.done())):
+        conn.samples_at_last_partial = len(conn.buffer)
+        conn.partial_task = asyncio.create_task(_partial(conn, conn.window_index, conn.buffer.copy()))
+
+
+@router.websocket("/ws/sessions/{session_id}/questions/{question_id}")
+async def stream_answer(websocket: WebSocket, session_id: str, question_id: str, format: str = "pcm_s16le", start_index: int = 0):
+    if not session_store.session_exists(session_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Session not found")
+        return
+    await websocket.accept()
+    conn = _Connection(websocket, session_id, question_id, start_index)
+
+    try:
+        decoder = audio_processing.StreamDecoder(format)
+    except Exception as e:
+        await conn.send({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    finalizer = asyncio.create_task(_finalizer(conn))
+    disconnected = False
+    try:
+        while True:
+            msg = await websocket.receive()
+            if msg["type"] == "websocket.disconnect":
+                disconnected = True
+                break
+            if msg.get("bytes") is not None:
+                samples = await asyncio.to_thread(decoder.feed, msg["bytes"])
+                await _on_audio(conn, samples)
+            elif msg.get("text") is not None:
+                try:
+                    control = json.loads(msg["text"])
+                except ValueError:
+                    control = {}
+                if control.get("type") == "stop":
+                    break
+    except WebSocketDisconnect:
+        disconnected = True
+    except Exception as e:
+        await conn.send({"type": "error", "detail": str(e)})
+    finally:
+        # flush: whatever is buffered becomes the last window (persisted even if the client left)
+        try:
+            tail = await asyncio.to_thread(decoder.close)
+            if tail.size:
+                conn.buffer = np.concatenate((conn.buffer, tail))
+            if len(conn.buffer):
+                await _close_window(conn, len(conn.buffer))
+        except Exception as e:
+            print("stream flush error:", e)
+        await conn.finals.put(None)
+        await finalizer
+        if conn.partial_task is not None:
+            conn.partial_task.cancel()
+        if not disconnected:
+            await conn.send({"type": "done", "windows": conn.window_index - start_index})
+            try:
+                await websocket.close()
+            except Exception:
+                pass
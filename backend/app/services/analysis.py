@@ -1,44 +1,257 @@
-from transformers import pipeline
+import asyncio
+import threading
+from typing import List, Optional, Tuple
 
-# Load emotion model once
-emotion_model = pipeline(
-    "text-classification",
-    model="SamLowe/roberta-base-go_emotions",
-    return_all_scores=True
+from app import config
+from app.services import emotion_backends, emotion_matrix
+from app.services.emotion_batcher import EmotionBatcher
+from app.services.inference_cache import LRUCache
+from app.services.model_registry import registry
+
+
+# Selected inference path for the go_emotions classifier (EMOTION_BACKEND)
+emotion_backend = emotion_backends.make_backend()
+
+
+def _load_emotion_model():
+    return emotion_backend.load()
+
+
+def _warmup_emotion_model(backend):
+    backend.warmup()
+
+
+registry.register(
+    "emotion",
+    _load_emotion_model,
+    warmup=_warmup_emotion_model,
+    info={"model": emotion_backend.identity(), "device": config.EMOTION_DEVICE},
+)
+
+
+def get_emotion_model():
+    """The shared emotion backend (loaded once by the model registry)."""
+    return registry.get("emotion")
+
+
+def load_models():
+    """Startup hook used by main.on_startup in eager mode."""
+    registry.warmup("emotion")
+
+
+def _score_batch(texts: list) -> list:
+    """One padded forward pass over a whole batch of texts (windows already fit the model)."""
+    return get_emotion_model().score(texts)
+
+
+# Shared scheduler: concurrent requests are coalesced into one batch
+batcher = EmotionBatcher(
+    _score_batch,
+    max_batch_size=config.EMOTION_BATCH_MAX_SIZE,
+    window_ms=config.EMOTION_BATCH_WINDOW_MS,
 )
 
+
+# Repeated transcripts (short answers, "Thank you." on near-silent chunks) skip the model
+text_cache = LRUCache(config.TEXT_CACHE_ENTRIES)
+
+
+def model_identity() -> str:
+    """Identifies the emotion model and backend for cache keys."""
+    return emotion_backend.identity()
+
+
+def _text_key(text: str) -> str:
+    return " ".join(text.split())
+
+
+_WINDOW_STATS = {"texts": 0, "windowed_texts": 0, "windows": 0}
+_WINDOW_LOCK = threading.Lock()
+
+
+def _window_size(tokenizer) -> int:
+    """Content tokens per window: the configured/model limit minus <s> </s> style special tokens."""
+    limit = config.EMOTION_WINDOW_TOKENS
+    model_max = getattr(tokenizer, "model_max_length", None)
+    if isinstance(model_max, int) and 0 < model_max < limit:
+        limit = model_max
+    try:
+        special = tokenizer.num_special_tokens_to_add()
+    except Exception:
+        special = 2
+    return max(1, limit - special)
+
+
+def split_windows(text: str, tokenizer) -> List[Tuple[str, int]]:
+    """
+    Split text on token boundaries into overlapping windows that fit the model.
+    Returns [(window_text, token_count)]; short texts are a single window.
+    Windows are sliced from the original text via token offsets when the
+    tokenizer provides them (fast tokenizers), else decoded from the ids.
+    """
+    size = _window_size(tokenizer)
+    try:
+        enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = enc["offset_mapping"]
+    except Exception:
+        enc = tokenizer(text, add_special_tokens=False)
+        offsets = None
+    ids = enc["input_ids"]
+    n = len(ids)
+    if n <= size:
+        return [(text, max(1, n))]
+
+    step = max(1, size - max(0, config.EMOTION_WINDOW_OVERLAP))
+    windows = []
+    for start in range(0, n, step):
+        end = min(n, start + size)
+        if offsets is not None:
+            chunk = text[offsets[start][0]:offsets[end - 1][1]]
+        else:
+            chunk = tokenizer.decode(ids[start:end])
+        windows.append((chunk, end - start))
+        if end == n:
+            break
+    return windows
+
+
+def _combine_windows(window_results: list, weights: List[int]) -> list:
+    """Token-length weighted average of window scores, in the model's label order."""
+    if len(window_results) == 1:
+        return window_results[0]
+    total = float(sum(weights))
+    sums = {}
+    for result, w in zip(window_results, weights):
+        for emo in result:
+            sums[emo["label"]] = sums.get(emo["label"], 0.0) + w * float(emo["score"])
+    return [{"label": label, "score": value / total} for label, value in sums.items()]
+
+
+def _prepare(transcripts: list):
+    """
+    Cache lookup + windowing (tokenizer only, no model call).
+    Returns (texts, results, missing, windows, owners, weights); results has
+    None for every text in `missing`, whose windows still need scoring.
+    """
+    texts = [t for t in transcripts if len(t.strip()) > 0]
+    results = [text_cache.get(_text_key(t)) for t in texts]
+    missing = [i for i, r in enumerate(results) if r is None]
+    windows, owners, weights = [], [], []
+    if missing:
+        tokenizer = get_emotion_model().tokenizer
+        windowed = 0
+        for i in missing:
+            parts = split_windows(texts[i], tokenizer)
+            windowed += len(parts) > 1
+            for chunk, n_tokens in parts:
+                windows.append(chunk)
+                owners.append(i)
+                weights.append(n_tokens)
+        with _WINDOW_LOCK:
+            _WINDOW_STATS["texts"] += len(missing)
+            _WINDOW_STATS["windows"] += len(windows)
+            _WINDOW_STATS["windowed_texts"] += windowed
+    return texts, results, missing, windows, owners, weights
+
+
+def _finish(texts, results, missing, owners, weights, scored) -> list:
+    """Combine scored windows back per text and fill the text cache."""
+    per_text = {}
+    for owner, result, w in zip(owners, scored, weights):
+        entry = per_text.setdefault(owner, ([], []))
+        entry[0].append(result)
+        entry[1].append(w)
+    for i in missing:
+        window_results, window_weights = per_text[i]
+        results[i] = _combine_windows(window_results, window_weights)
+        text_cache.put(_text_key(texts[i]), results[i])
+    return results
+
+
 def analyze_emotions(transcripts: list) -> list:
     """
     Runs emotion analysis on each transcript chunk.
+    Long transcripts are scored as overlapping token windows; the windows
+    of every uncached transcript go to the model together and are combined
+    back per transcript (weighted by window length).
     Returns list of per-chunk results.
     """
-    chunk_results = []
-    for text in transcripts:
-        if len(text.strip()) == 0:
-            continue
-        scores = emotion_model(text[:512])  # avoid very long input
-        chunk_results.append(scores[0])
-    return chunk_results
+    texts, results, missing, windows, owners, weights = _prepare(transcripts)
+    if not texts:
+        return []
+    scored = batcher.score(windows) if windows else []
+    return _finish(texts, results, missing, owners, weights, scored)
 
 
-def aggregate_emotions(chunk_results: list) -> dict:
+async def analyze_emotions_async(transcripts: list) -> list:
     """
-    Aggregates per-chunk emotion results into overall averages.
+    analyze_emotions for async routes: windowing runs in a plain thread and
+    the windows are awaited on the batcher, so no inference worker sits
+    blocked on a batch future and concurrent requests actually share batches.
     """
-    emotion_totals = {}
-    num_chunks = len(chunk_results)
+    texts, results, missing, windows, owners, weights = await asyncio.to_thread(_prepare, transcripts)
+    if not texts:
+        return []
+    scored = await batcher.ascore(windows) if windows else []
+    return _finish(texts, results, missing, owners, weights, scored)
+
+
+def window_stats() -> dict:
+    with _WINDOW_LOCK:
+        st = dict(_WINDOW_STATS)
+    st["avg_windows_per_text"] = (st["windows"] / st["texts"]) if st["texts"] else 0.0
+    return st
 
-    for result in chunk_results:
-        for emo in result:
-            label = emo['label']
-            score = emo['score']
-            emotion_totals[label] = emotion_totals.get(label, 0) + score
 
-    # Normalize to averages
-    for label in emotion_totals:
-        emotion_totals[label] /= num_chunks
+def _as_text_result(results: list) -> dict:
+    if not results:
+        return {"emotions": {}}
+    return {"emotions": {emo["label"]: float(emo["score"]) for emo in results[0]}}
 
-    return emotion_totals
+
+def analyze_text(transcript: str) -> dict:
+    """
+    Single-transcript API (blocking).
+    Returns {"emotions": {label: score}} (empty for blank transcripts).
+    """
+    return _as_text_result(analyze_emotions([transcript or ""]))
+
+
+async def analyze_text_async(transcript: str) -> dict:
+    """analyze_text for /feedback/analyze and the WebSocket finalizer (see analyze_emotions_async)."""
+    return _as_text_result(await analyze_emotions_async([transcript or ""]))
+
+
+FILLER_WORDS = {"um", "uh", "like", "so", "actually", "basically", "right", "okay", "ok", "you", "know"}
+
+
+def estimate_clarity(transcript: str) -> float:
+    """Simple filler-word heuristic (very rough, 0..1)."""
+    words = (transcript or "").lower().split()
+    if not words:
+        return 0.0
+    filler_count = sum(1 for w in words if w in FILLER_WORDS)
+    return max(0.0, 1.0 - (filler_count / len(words)) * 2.0)
+
+
+def estimate_confidence(emotions: dict) -> float:
+    """Simple confidence estimate (0..1) from joy/neutral vs. sadness scores."""
+    if not isinstance(emotions, dict):
+        return 0.5
+    joy = float(emotions.get("joy", 0.0))
+    neutral = float(emotions.get("neutral", 0.0))
+    sadness = float(emotions.get("sadness", 0.0))
+    raw = (joy + neutral) - sadness
+    return max(0.0, min(1.0, (raw + 1.0) / 2.0))
+
+
+def aggregate_emotions(chunk_results: list, weights: Optional[list] = None) -> dict:
+    """
+    Aggregates per-chunk emotion results into overall averages, optionally
+    weighted (e.g. by chunk duration; one weight per chunk result).
+    """
+    matrix = emotion_matrix.stack(chunk_results)
+    return emotion_matrix.to_dict(emotion_matrix.mean(matrix, weights))
 
 
 def generate_feedback(transcript: str, emotions: dict) -> dict:
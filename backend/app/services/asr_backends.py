@@ -0,0 +1,132 @@
+# backend/app/services/asr_backends.py
+"""
+Speech-to-text backends behind one small interface.
+
+  - "openai-whisper": the reference PyTorch implementation (fp32 on CPU).
+  - "faster-whisper": CTranslate2 re-implementation of the same weights,
+    int8-quantized by default, typically several times faster on CPU.
+
+audio_processing picks one with ASR_BACKEND (model size from
+WHISPER_MODEL_SIZE) and registers it with the model registry;
+app/services/asr_parity.py compares backends on the fixture set in
+backend/fixtures/asr.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type, Union
+
+import numpy as np
+
+from app import config
+
+SAMPLE_RATE = 16000
+
+
+class ASRBackend(ABC):
+    """
+    load() builds the underlying model (self.model), transcribe() takes a
+    file path or 16 kHz mono float32 audio and returns the stripped text.
+    """
+
+    name = "base"
+
+    def __init__(self, model_size: str, device: Optional[str] = None):
+        self.model_size = model_size
+        self.device = device
+        self.model = None
+
+    def identity(self) -> str:
+        """Stable description of model + decoding settings (used in cache keys)."""
+        return f"{self.name}/{self.model_size}"
+
+    @abstractmethod
+    def load(self) -> "ASRBackend":
+        ...
+
+    @abstractmethod
+    def transcribe(self, audio: Union[str, np.ndarray]) -> str:
+        ...
+
+    def warmup(self):
+        # one second of silence exercises the full decode path
+        self.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+
+class OpenAIWhisperBackend(ASRBackend):
+    name = "openai-whisper"
+    fp16 = False
+
+    def load(self):
+        try:
+            # Lazy import to avoid heavy imports at module import time
+            import whisper
+        except Exception:
+            raise RuntimeError("whisper not available in backend venv. Install openai-whisper or set ASR_BACKEND.")
+        self.model = whisper.load_model(self.model_size, device=self.device)
+        # fp16 only runs on CUDA; on CPU whisper would warn and fall back on every call
+        self.fp16 = getattr(self.model.device, "type", "cpu") == "cuda"
+        return self
+
+    def transcribe(self, audio):
+        result = self.model.transcribe(audio, fp16=self.fp16)
+        return result.get("text", "").strip()
+
+    def warmup(self):
+        self.model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), fp16=self.fp16)
+
+
+class FasterWhisperBackend(ASRBackend):
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str, device: Optional[str] = None, compute_type: str = "int8",
+                 cpu_threads: int = 0, beam_size: int = 1):
+        super().__init__(model_size, device)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        # 1 = greedy, which is what openai-whisper's transcribe() does by default
+        self.beam_size = beam_size
+
+    def identity(self):
+        return f"{self.name}/{self.model_size}/{self.compute_type}/beam{self.beam_size}"
+
+    def load(self):
+        try:
+            from faster_whisper import WhisperModel
+        except Exception:
+            raise RuntimeError("faster-whisper not available in backend venv. Install faster-whisper or set ASR_BACKEND.")
+        self.model = WhisperModel(
+            self.model_size,
+            device=self.device or "auto",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+        )
+        return self
+
+    def transcribe(self, audio):
+        segments, _info = self.model.transcribe(audio, beam_size=self.beam_size)
+        # segments is a lazy generator: decoding happens while iterating
+        return "".join(seg.text for seg in segments).strip()
+
+
+BACKENDS: Dict[str, Type[ASRBackend]] = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def make_backend(name: Optional[str] = None, model_size: Optional[str] = None) -> ASRBackend:
+    """Instantiate (without loading) the configured backend, or `name` if given."""
+    name = (name or config.ASR_BACKEND).lower()
+    model_size = model_size or config.WHISPER_MODEL_SIZE
+    if name == FasterWhisperBackend.name:
+        return FasterWhisperBackend(
+            model_size,
+            device=config.WHISPER_DEVICE,
+            compute_type=config.ASR_COMPUTE_TYPE,
+            cpu_threads=config.ASR_CPU_THREADS,
+            beam_size=config.ASR_BEAM_SIZE,
+        )
+    cls = BACKENDS.get(name)
+    if cls is None:
+        raise ValueError(f"unknown ASR backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+    return cls(model_size, device=config.WHISPER_DEVICE)
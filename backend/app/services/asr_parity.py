@@ -0,0 +1,169 @@
+# backend/app/services/asr_parity.py
+"""
+Parity harness for the ASR backends (see asr_backends.py).
+
+Runs every backend over a fixed fixture set and reports word error rate
+and latency per backend, plus each backend's WER against the first
+(reference) backend's output. Fixtures are audio files with a same-named
+.txt reference transcript next to them, e.g.
+
+  fixtures/asr/intro_01.wav  fixtures/asr/intro_01.txt
+
+backend/fixtures/asr is the tracked default; its README explains how to
+record and add fixtures. Usage (from backend/):
+
+  python -m app.services.asr_parity \\
+      --backends openai-whisper,faster-whisper --max-wer-delta 0.03
+
+Exits non-zero when a backend's WER is worse than the reference backend's
+by more than --max-wer-delta.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from app import config
+from app.services import asr_backends
+from app.services.audio_processing import SAMPLE_RATE, decode_audio_bytes
+
+# tracked fixture set (see its README.md)
+FIXTURES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "asr"))
+
+AUDIO_EXTS = {".wav", ".webm", ".ogg", ".mp3", ".m4a", ".flac"}
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words without punctuation, so formatting differences don't count as errors."""
+    return re.findall(r"[a-z0-9']+", (text or "").lower())
+
+
+def word_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """(substitutions + deletions + insertions, reference word count) via word-level edit distance."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1], len(ref)
+
+
+def load_fixtures(directory: str) -> List[dict]:
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in AUDIO_EXTS:
+            continue
+        ref_path = os.path.join(directory, stem + ".txt")
+        if not os.path.exists(ref_path):
+            continue
+        with open(os.path.join(directory, name), "rb") as f:
+            audio = decode_audio_bytes(f.read())
+        with open(ref_path, "r", encoding="utf-8") as f:
+            reference = f.read().strip()
+        fixtures.append({"name": name, "audio": audio, "reference": reference})
+    return fixtures
+
+
+def run_backend(name: str, model_size: str, fixtures: List[dict], repeat: int = 1) -> dict:
+    backend = asr_backends.make_backend(name, model_size)
+    started = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - started
+    backend.warmup()
+
+    outputs: Dict[str, str] = {}
+    latencies = []
+    errors = words = 0
+    audio_seconds = 0.0
+    for fx in fixtures:
+        runs = []
+        for _ in range(max(1, repeat)):
+            began = time.perf_counter()
+            text = backend.transcribe(fx["audio"])
+            runs.append(time.perf_counter() - began)
+        outputs[fx["name"]] = text
+        latencies.append(min(runs))
+        e, n = word_errors(fx["reference"], text)
+        errors += e
+        words += n
+        audio_seconds += len(fx["audio"]) / SAMPLE_RATE
+
+    total = sum(latencies)
+    return {
+        "backend": backend.identity(),
+        "load_seconds": round(load_seconds, 3),
+        "wer": (errors / words) if words else 0.0,
+        "latency_mean_s": statistics.mean(latencies) if latencies else 0.0,
+        "latency_p50_s": statistics.median(latencies) if latencies else 0.0,
+        "latency_max_s": max(latencies) if latencies else 0.0,
+        "real_time_factor": (total / audio_seconds) if audio_seconds else 0.0,
+        "outputs": outputs,
+    }
+
+
+def compare(results: List[dict], fixtures: List[dict]) -> None:
+    """Add each backend's WER against the reference (first) backend's transcripts."""
+    base = results[0]["outputs"]
+    for res in results:
+        errors = words = 0
+        for fx in fixtures:
+            e, n = word_errors(base[fx["name"]], res["outputs"][fx["name"]])
+            errors += e
+            words += n
+        res["wer_vs_reference_backend"] = (errors / words) if words else 0.0
+        res["speedup_vs_reference_backend"] = (
+            results[0]["latency_mean_s"] / res["latency_mean_s"] if res["latency_mean_s"] else None
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare ASR backends on local fixtures (WER + latency).")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--backends", default=",".join(asr_backends.BACKENDS),
+                        help="comma separated; the first one is the reference")
+    parser.add_argument("--model-size", default=config.WHISPER_MODEL_SIZE)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per fixture (fastest is kept)")
+    parser.add_argument("--max-wer-delta", type=float, default=0.03)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"no fixtures (audio + .txt reference) found in {args.fixtures}; "
+              f"see {os.path.join(FIXTURES_DIR, 'README.md')}", file=sys.stderr)
+        return 2
+
+    names = [n.strip() for n in args.backends.split(",") if n.strip()]
+    results = [run_backend(n, args.model_size, fixtures, args.repeat) for n in names]
+    compare(results, fixtures)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{len(fixtures)} fixtures, model size {args.model_size}")
+        print(f"{'backend':<40} {'WER':>7} {'vs ref':>7} {'mean s':>8} {'p50 s':>8} {'RTF':>6} {'speedup':>8}")
+        for r in results:
+            speedup = r["speedup_vs_reference_backend"]
+            print(f"{r['backend']:<40} {r['wer']:>7.3f} {r['wer_vs_reference_backend']:>7.3f} "
+                  f"{r['latency_mean_s']:>8.3f} {r['latency_p50_s']:>8.3f} {r['real_time_factor']:>6.2f} "
+                  f"{(speedup or 0):>7.2f}x")
+
+    reference_wer = results[0]["wer"]
+    failed = [r["backend"] for r in results[1:] if r["wer"] - reference_wer > args.max_wer_delta]
+    if failed:
+        print(f"WER regression beyond {args.max_wer_delta:.3f}: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
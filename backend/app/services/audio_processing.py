@@ -1,57 +1,121 @@
 # backend/app/services/audio_processing.py
+import io
 import os
 import subprocess
-import math
+import threading
 import uuid
-from typing import List
+import wave
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+
+from app import config
+from app.services import asr_backends
+from app.services.model_registry import registry
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # .../app/services
 UPLOADS_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "..", "uploads"))
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
+# Whisper's native input: 16 kHz mono float32 in [-1, 1]
+SAMPLE_RATE = 16000
+
 # If you have a whisper wrapper already, import here in functions (lazy import)
 # Example: from app.services.whisper_wrapper import transcribe_file
 
+
+def _decode_wav_native(data: bytes) -> Optional[np.ndarray]:
+    """
+    Decode a PCM wav already at 16 kHz without spawning ffmpeg.
+    Returns None when the file needs resampling or isn't plain PCM,
+    so the caller can fall back to ffmpeg.
+    """
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            if wf.getframerate() != SAMPLE_RATE:
+                return None
+            width = wf.getsampwidth()
+            channels = wf.getnchannels()
+            frames = wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    if width == 2:
+        audio = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        audio = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    elif width == 1:
+        audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        return None
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    return audio
+
+
+def _ffmpeg_decode_bytes(data: bytes) -> np.ndarray:
+    """Pipe encoded audio through ffmpeg (stdin -> stdout) into 16 kHz mono float32."""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, input=data, capture_output=True, check=False)
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found, ensure ffmpeg is installed and on PATH")
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {proc.stderr.decode(errors='ignore').strip()}")
+    # copy: frombuffer on bytes is read-only and torch wants a writable array
+    return np.frombuffer(proc.stdout, dtype=np.float32).copy()
+
+
+def decode_audio_bytes(data: bytes) -> np.ndarray:
+    """
+    Decode uploaded webm/ogg/wav/... bytes straight into a 16 kHz mono
+    float32 buffer, without touching the disk.
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        audio = _decode_wav_native(data)
+        if audio is not None:
+            return audio
+    return _ffmpeg_decode_bytes(data)
+
 def _ffmpeg_split_into_chunks(src_path: str, chunk_seconds: int = 30) -> List[str]:
     """
-    Split src_path into multiple chunk files using ffmpeg.
-    Returns list of absolute file paths.
+    Split src_path into multiple 16 kHz mono chunk files with ONE ffmpeg run
+    (segment muxer): the source is opened and decoded once instead of
+    re-seeking it for every chunk.
+    Returns list of absolute file paths, in order.
     """
     if not os.path.exists(src_path):
         raise FileNotFoundError(src_path)
 
-    # Get duration using ffprobe (ffmpeg)
+    prefix = uuid.uuid4().hex
+    pattern = os.path.join(UPLOADS_DIR, f"{prefix}_chunk_%d.wav")
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", src_path,
+        "-ar", str(SAMPLE_RATE), "-ac", "1",
+        "-f", "segment", "-segment_time", str(chunk_seconds), "-reset_timestamps", "1",
+        pattern,
+    ]
     try:
-        probe = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of",
-             "default=noprint_wrappers=1:nokey=1", src_path],
-            capture_output=True, text=True, check=True
-        )
-        duration = float(probe.stdout.strip())
-    except Exception:
-        # fallback: try using ffmpeg -i and parse; but raise if not possible
-        raise RuntimeError("ffprobe failed, ensure ffmpeg is installed and on PATH")
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found, ensure ffmpeg is installed and on PATH")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffmpeg split failed: {e.stderr.decode(errors='ignore').strip()}")
 
-    num_chunks = math.ceil(duration / chunk_seconds)
     out_files = []
-
-    for i in range(num_chunks):
-        start = i * chunk_seconds
-        out_name = f"{uuid.uuid4().hex}_chunk_{i}.wav"
-        out_path = os.path.join(UPLOADS_DIR, out_name)
-        # ffmpeg: -ss start -t chunk_seconds -i input -ar 16000 -ac 1 -y out_path
-        cmd = [
-            "ffmpeg", "-y",
-            "-ss", str(start),
-            "-t", str(chunk_seconds),
-            "-i", src_path,
-            "-ar", "16000", "-ac", "1",
-            out_path
-        ]
-        # run ffmpeg
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    i = 0
+    while True:
+        out_path = pattern % i
+        if not os.path.exists(out_path):
+            break
         out_files.append(out_path)
-
+        i += 1
     return out_files
 
 def split_audio(file_path: str, chunk_seconds: int = 30) -> List[str]:
@@ -62,25 +126,320 @@ def split_audio(file_path: str, chunk_seconds: int = 30) -> List[str]:
     return _ffmpeg_split_into_chunks(file_path, chunk_seconds=chunk_seconds)
 
 
-# Example transcribe wrapper (lazy whisper import)
-def transcribe_chunk(chunk_path: str) -> str:
+def _read_exactly(stream, n: int) -> bytes:
+    """Read up to n bytes from a pipe, looping over short reads; b"" at EOF."""
+    parts = []
+    remaining = n
+    while remaining > 0:
+        part = stream.read(remaining)
+        if not part:
+            break
+        parts.append(part)
+        remaining -= len(part)
+    return b"".join(parts)
+
+
+def iter_audio_chunks(source: Union[str, bytes], chunk_seconds: int = 30) -> Iterator[np.ndarray]:
     """
-    Transcribe a single chunk. Uses whisper (openai-whisper) if available.
-    Returns transcript string.
+    Streaming variant of split_audio: decode `source` (a file path or encoded
+    bytes) with a single ffmpeg process and yield 16 kHz mono float32 chunks
+    as soon as each one is decoded, so chunk 0 can be transcribed while the
+    rest of the file is still being split. The last chunk may be shorter.
     """
+    from_bytes = not isinstance(source, str)
+    if not from_bytes and not os.path.exists(source):
+        raise FileNotFoundError(source)
+
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0" if from_bytes else source,
+        "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+    ]
     try:
-        # Lazy import to avoid heavy imports at module import time
-        import whisper
-    except Exception:
-        # If whisper isn't installed, raise helpful error
-        raise RuntimeError("whisper not available in backend venv. Install openai-whisper or adjust transcribe_chunk.")
-
-    # Load model once per process (cache on module)
-    global _whisper_model
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if from_bytes else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found, ensure ffmpeg is installed and on PATH")
+
+    feeder = None
+    if from_bytes:
+        # feed stdin from a thread so a full stdout pipe can't deadlock us
+        def _feed():
+            try:
+                proc.stdin.write(source)
+            except (BrokenPipeError, ValueError):
+                pass
+            finally:
+                try:
+                    proc.stdin.close()
+                except Exception:
+                    pass
+        feeder = threading.Thread(target=_feed, name="ffmpeg-feed", daemon=True)
+        feeder.start()
+
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * 4  # float32
     try:
-        _whisper_model
-    except NameError:
-        _whisper_model = whisper.load_model("small")  # or use desired model
-    result = _whisper_model.transcribe(chunk_path)
-    text = result.get("text", "").strip()
-    return text
+        while True:
+            data = _read_exactly(proc.stdout, chunk_bytes)
+            if not data:
+                break
+            usable = len(data) - (len(data) % 4)
+            yield np.frombuffer(data[:usable], dtype=np.float32).copy()
+            if len(data) < chunk_bytes:
+                break
+        if proc.wait() != 0:
+            raise RuntimeError("ffmpeg decode failed while streaming chunks")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        if proc.stdout:
+            proc.stdout.close()
+        if feeder is not None:
+            feeder.join(timeout=1.0)
+
+
+class StreamDecoder:
+    """
+    Incremental decoder for live audio streams (WebSocket ingest).
+
+    fmt:
+      - "pcm_s16le" / "f32le": raw 16 kHz mono PCM, converted in-process
+      - anything else ("webm", "ogg", ...): encoded Opus/etc., decoded by one
+        long-lived ffmpeg process fed over stdin
+
+    feed(data) returns the float32 samples decoded so far that haven't been
+    returned yet; close() flushes and returns whatever is left.
+    """
+
+    PCM_FORMATS = {"pcm_s16le": ("<i2", 32768.0), "f32le": ("<f4", 1.0)}
+
+    def __init__(self, fmt: str = "pcm_s16le"):
+        self.fmt = fmt
+        self._carry = b""
+        self._proc = None
+        self._reader = None
+        self._out = []
+        self._out_lock = threading.Lock()
+        if fmt not in self.PCM_FORMATS:
+            cmd = [
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "pipe:1",
+            ]
+            try:
+                self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            except FileNotFoundError:
+                raise RuntimeError("ffmpeg not found, ensure ffmpeg is installed and on PATH")
+            self._reader = threading.Thread(target=self._read_loop, name="ffmpeg-stream", daemon=True)
+            self._reader.start()
+
+    def _read_loop(self):
+        while True:
+            data = self._proc.stdout.read1(64 * 1024) if hasattr(self._proc.stdout, "read1") else self._proc.stdout.read(64 * 1024)
+            if not data:
+                break
+            with self._out_lock:
+                self._out.append(data)
+
+    def _convert(self, data: bytes, dtype: str, scale: float) -> np.ndarray:
+        data = self._carry + data
+        width = np.dtype(dtype).itemsize
+        usable = len(data) - (len(data) % width)
+        self._carry = data[usable:]
+        if usable == 0:
+            return np.zeros(0, dtype=np.float32)
+        audio = np.frombuffer(data[:usable], dtype=dtype).astype(np.float32)
+        return audio / scale if scale != 1.0 else audio
+
+    def _drain(self) -> np.ndarray:
+        with self._out_lock:
+            data, self._out = b"".join(self._out), []
+        return self._convert(data, "<f4", 1.0)
+
+    def feed(self, data: bytes) -> np.ndarray:
+        if self._proc is None:
+            dtype, scale = self.PCM_FORMATS[self.fmt]
+            return self._convert(data, dtype, scale)
+        try:
+            self._proc.stdin.write(data)
+            self._proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            raise RuntimeError("ffmpeg stream decoder exited")
+        return self._drain()
+
+    def close(self) -> np.ndarray:
+        if self._proc is None:
+            self._carry = b""
+            return np.zeros(0, dtype=np.float32)
+        try:
+            self._proc.stdin.close()
+        except Exception:
+            pass
+        self._reader.join(timeout=5.0)
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        return self._drain()
+
+
+# -------------------------
+# Voice activity detection
+# -------------------------
+_VAD_STATS = {"chunks": 0, "skipped": 0, "input_seconds": 0.0, "transcribed_seconds": 0.0}
+_VAD_LOCK = threading.Lock()
+
+
+def _has_noise_floor(level_db: np.ndarray) -> bool:
+    """
+    Whether the 10th percentile frame level is a background estimate: true
+    when the levels are flat (spread under VAD_MARGIN_DB: hum or silence
+    only) or bimodal, i.e. the best two-way split of the sorted levels
+    (Otsu) leaves groups of at least 10% of the frames whose mean levels are
+    VAD_BIMODAL_GAP_DB apart. Continuous speech is neither, and there the
+    quietest frames are still speech.
+    """
+    levels = np.sort(level_db.astype(np.float64))
+    n = len(levels)
+    if levels[int(n * 0.9)] - levels[int(n * 0.1)] < config.VAD_MARGIN_DB:
+        return True
+    min_group = max(1, int(np.ceil(n * 0.1)))
+    if n < 2 * min_group:
+        return False
+    csum = np.cumsum(levels)
+    k = np.arange(min_group, n - min_group + 1)  # size of the quiet group
+    low = csum[k - 1] / k
+    high = (csum[-1] - csum[k - 1]) / (n - k)
+    best = int(np.argmax(k * (n - k) * np.square(high - low)))
+    return bool(high[best] - low[best] >= config.VAD_BIMODAL_GAP_DB)
+
+
+def detect_speech(audio: np.ndarray) -> dict:
+    """
+    Energy-based VAD over 16 kHz float32 audio.
+    Frames (VAD_FRAME_MS) whose RMS level exceeds VAD_THRESHOLD_DB are
+    speech. If the chunk has a recognizable background (see
+    _has_noise_floor), the bar is raised to the 10th percentile frame level
+    + VAD_MARGIN_DB, so a constant hum doesn't count as speech.
+    Returns {"speech_ratio", "start", "end"} with start/end as sample
+    offsets of the (padded) speech region, or None when there is no speech.
+    """
+    frame = max(1, int(SAMPLE_RATE * config.VAD_FRAME_MS / 1000))
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return {"speech_ratio": 0.0, "start": None, "end": None}
+
+    frames = audio[: n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    level_db = 20.0 * np.log10(rms + 1e-10)
+    threshold = config.VAD_THRESHOLD_DB
+    if _has_noise_floor(level_db):
+        threshold = max(threshold, float(np.percentile(level_db, 10)) + config.VAD_MARGIN_DB)
+    speech = level_db > threshold
+
+    ratio = float(speech.mean())
+    if not speech.any():
+        return {"speech_ratio": ratio, "start": None, "end": None}
+    idx = np.flatnonzero(speech)
+    pad = int(SAMPLE_RATE * config.VAD_PAD_MS / 1000)
+    start = max(0, int(idx[0]) * frame - pad)
+    end = min(len(audio), (int(idx[-1]) + 1) * frame + pad)
+    return {"speech_ratio": ratio, "start": start, "end": end}
+
+
+def _record_vad(seconds: float, skipped: bool, transcribed_seconds: float):
+    with _VAD_LOCK:
+        _VAD_STATS["chunks"] += 1
+        _VAD_STATS["input_seconds"] += seconds
+        if skipped:
+            _VAD_STATS["skipped"] += 1
+        else:
+            _VAD_STATS["transcribed_seconds"] += transcribed_seconds
+
+
+def vad_stats() -> dict:
+    with _VAD_LOCK:
+        st = dict(_VAD_STATS)
+    st["skip_rate"] = (st["skipped"] / st["chunks"]) if st["chunks"] else 0.0
+    st["saved_seconds"] = st["input_seconds"] - st["transcribed_seconds"]
+    return st
+
+
+# Selected ASR backend (ASR_BACKEND); the registry entry keeps the "whisper" name
+asr_backend = asr_backends.make_backend()
+
+
+def _load_whisper_model():
+    return asr_backend.load()
+
+
+def _warmup_whisper_model(backend):
+    backend.warmup()
+
+
+registry.register(
+    "whisper",
+    _load_whisper_model,
+    warmup=_warmup_whisper_model,
+    info={"model": asr_backend.identity(), "device": config.WHISPER_DEVICE or "auto"},
+)
+
+
+def load_models():
+    """Startup hook used by main.on_startup in eager mode."""
+    registry.warmup("whisper")
+
+
+def model_identity() -> str:
+    """Identifies the ASR model (and VAD gate settings) for cache keys; changing either invalidates cached transcripts."""
+    ident = asr_backend.identity()
+    if config.VAD_ENABLED:
+        ident += (f"+vad/{config.VAD_THRESHOLD_DB:g}/{config.VAD_MARGIN_DB:g}/{config.VAD_BIMODAL_GAP_DB:g}"
+                  f"/{config.VAD_MIN_SPEECH_RATIO:g}/{config.VAD_PAD_MS}")
+    return ident
+
+
+def transcribe_chunk(chunk_path: Union[str, np.ndarray]) -> str:
+    """
+    Transcribe a single chunk with the configured ASR backend.
+    Accepts a file path or an already decoded 16 kHz float32 array.
+    Returns transcript string.
+    """
+    backend = registry.get("whisper")  # loaded once per process
+    return backend.transcribe(chunk_path)
+
+
+def transcribe_audio(audio: np.ndarray, record_stats: bool = True) -> dict:
+    """
+    Transcribe decoded audio behind the VAD gate: fully silent chunks are
+    skipped (no Whisper call, no hallucinated text) and leading/trailing
+    silence is trimmed from the rest.
+    record_stats=False keeps the call out of vad_stats() (WebSocket partials,
+    which re-transcribe a growing buffer).
+    Returns {"text", "speech_ratio", "vad_skipped"}.
+    """
+    seconds = len(audio) / SAMPLE_RATE
+    if not config.VAD_ENABLED:
+        return {"text": transcribe_chunk(audio) if len(audio) else "", "speech_ratio": None, "vad_skipped": False}
+
+    vad = detect_speech(audio)
+    skipped = vad["start"] is None or vad["speech_ratio"] < config.VAD_MIN_SPEECH_RATIO
+    if not skipped:
+        audio = audio[vad["start"]:vad["end"]]
+    if record_stats:
+        _record_vad(seconds, skipped, len(audio) / SAMPLE_RATE)
+    text = "" if skipped else transcribe_chunk(audio)
+    return {"text": text, "speech_ratio": round(vad["speech_ratio"], 4), "vad_skipped": skipped}
+
+
+def transcribe_bytes(data: bytes) -> dict:
+    """Decode an uploaded chunk in memory and transcribe it (no temp files); see transcribe_audio."""
+    if not data:
+        return {"text": "", "speech_ratio": 0.0, "vad_skipped": True}
+    return transcribe_audio(decode_audio_bytes(data))
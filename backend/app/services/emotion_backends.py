@@ -0,0 +1,240 @@
+# backend/app/services/emotion_backends.py
+"""
+Inference backends for the go_emotions classifier, selected at startup
+with EMOTION_BACKEND:
+
+  - "torch":      the transformers pipeline in fp32 (reference).
+  - "torch-int8": same model with its Linear layers dynamically quantized
+                  to int8 (CPU only).
+  - "onnx":       the model exported once to ONNX (cached under
+                  EMOTION_ONNX_DIR) and run by ONNX Runtime through a small
+                  pool of sessions, so concurrent batches don't share one.
+  - "onnx-int8":  the ONNX export with int8 dynamically quantized weights.
+
+Every backend's score(texts) returns, per text, [{"label", "score"}, ...]
+in the model's label order (the shape the transformers pipeline returns
+with return_all_scores=True). app/services/emotion_parity.py checks the
+accelerated backends against the fp32 one.
+"""
+
+import os
+import queue
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from app import config
+
+
+def _device_arg(device: str):
+    """EMOTION_DEVICE may be an int index ("-1", "0") or a torch device string."""
+    try:
+        return int(device)
+    except (TypeError, ValueError):
+        return device
+
+
+def _is_cpu(device) -> bool:
+    return device == -1 or str(device).lower() == "cpu"
+
+
+class EmotionBackend(ABC):
+    name = "base"
+
+    def __init__(self, model_name: str, device: str = "-1"):
+        self.model_name = model_name
+        self.device = _device_arg(device)
+        self.model = None       # the underlying model (torch module or ORT sessions)
+        self.tokenizer = None
+
+    def identity(self) -> str:
+        """Model + numerics, used in cache keys (int8 scores differ slightly from fp32)."""
+        return f"{self.model_name}/{self.name}"
+
+    @abstractmethod
+    def load(self) -> "EmotionBackend":
+        ...
+
+    @abstractmethod
+    def score(self, texts: List[str]) -> List[List[dict]]:
+        ...
+
+    def warmup(self):
+        self.score(["warmup"])
+
+
+class TorchEmotionBackend(EmotionBackend):
+    name = "torch"
+
+    def __init__(self, model_name: str, device: str = "-1", quantize: bool = False):
+        super().__init__(model_name, device)
+        self.quantize = quantize
+        if quantize:
+            self.name = "torch-int8"
+        self.pipe = None
+
+    def load(self):
+        # heavy import kept lazy so MODEL_LOAD_MODE=lazy starts fast
+        from transformers import pipeline
+        device = self.device
+        if self.quantize and not _is_cpu(device):
+            raise ValueError("torch-int8 dynamic quantization runs on CPU only (set EMOTION_DEVICE=-1)")
+        self.pipe = pipeline(
+            "text-classification",
+            model=self.model_name,
+            return_all_scores=True,
+            device=device,
+        )
+        if self.quantize:
+            import torch
+            # weights stored as int8, activations quantized on the fly per batch
+            self.pipe.model = torch.quantization.quantize_dynamic(
+                self.pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.model = self.pipe.model
+        self.tokenizer = self.pipe.tokenizer
+        return self
+
+    def score(self, texts):
+        return self.pipe(texts, batch_size=len(texts), padding=True, truncation=True)
+
+
+class OnnxEmotionBackend(EmotionBackend):
+    name = "onnx"
+
+    def __init__(self, model_name: str, device: str = "-1", quantize: bool = False,
+                 onnx_dir: Optional[str] = None, sessions: int = 2, threads: int = 0):
+        super().__init__(model_name, device)
+        self.quantize = quantize
+        if quantize:
+            self.name = "onnx-int8"
+        self.onnx_dir = onnx_dir or config.EMOTION_ONNX_DIR
+        self.sessions = max(1, int(sessions))
+        self.threads = max(0, int(threads))
+        self._pool: "queue.Queue" = queue.Queue()
+        self._labels: List[str] = []
+        self._multi_label = True
+
+    def _paths(self):
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_name)
+        fp32 = os.path.join(self.onnx_dir, f"{stem}.onnx")
+        return fp32, os.path.join(self.onnx_dir, f"{stem}.int8.onnx")
+
+    def _export(self, path: str):
+        """One-time export of the fp32 model (written atomically, reused on later startups)."""
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        dummy = self.tokenizer(["export"], return_tensors="pt")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy["input_ids"], dummy["attention_mask"]),
+                tmp,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"},
+                },
+                opset_version=14,
+            )
+        os.replace(tmp, path)
+
+    def _quantize(self, src: str, dst: str):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        quantize_dynamic(src, tmp, weight_type=QuantType.QInt8)
+        os.replace(tmp, dst)
+
+    def load(self):
+        try:
+            import onnxruntime as ort
+        except Exception:
+            raise RuntimeError("onnxruntime not available in backend venv. Install onnxruntime or set EMOTION_BACKEND.")
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model_config = AutoConfig.from_pretrained(self.model_name)
+        self._labels = [model_config.id2label[i] for i in range(model_config.num_labels)]
+        # go_emotions is multi-label: independent sigmoids, like the pipeline applies
+        self._multi_label = (getattr(model_config, "problem_type", None) == "multi_label_classification"
+                             or model_config.num_labels == 1)
+
+        os.makedirs(self.onnx_dir, exist_ok=True)
+        fp32_path, int8_path = self._paths()
+        if not os.path.exists(fp32_path):
+            self._export(fp32_path)
+        path = fp32_path
+        if self.quantize:
+            if not os.path.exists(int8_path):
+                self._quantize(fp32_path, int8_path)
+            path = int8_path
+
+        providers = ["CPUExecutionProvider"]
+        if not _is_cpu(self.device) and "CUDAExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            opts.intra_op_num_threads = self.threads
+        sessions = [ort.InferenceSession(path, sess_options=opts, providers=providers) for _ in range(self.sessions)]
+        for s in sessions:
+            self._pool.put(s)
+        self.model = sessions
+        return self
+
+    def score(self, texts):
+        enc = self.tokenizer(list(texts), padding=True, truncation=True, max_length=512, return_tensors="np")
+        feeds = {
+            "input_ids": enc["input_ids"].astype(np.int64),
+            "attention_mask": enc["attention_mask"].astype(np.int64),
+        }
+        session = self._pool.get()  # blocks while every session is busy
+        try:
+            logits = session.run(["logits"], feeds)[0]
+        finally:
+            self._pool.put(session)
+
+        if self._multi_label:
+            probs = 1.0 / (1.0 + np.exp(-logits))
+        else:
+            shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = shifted / shifted.sum(axis=1, keepdims=True)
+        return [
+            [{"label": label, "score": float(p)} for label, p in zip(self._labels, row)]
+            for row in probs
+        ]
+
+
+BACKENDS: Dict[str, Type[EmotionBackend]] = {
+    "torch": TorchEmotionBackend,
+    "torch-int8": TorchEmotionBackend,
+    "onnx": OnnxEmotionBackend,
+    "onnx-int8": OnnxEmotionBackend,
+}
+
+
+def make_backend(name: Optional[str] = None, model_name: Optional[str] = None) -> EmotionBackend:
+    """Instantiate (without loading) the configured backend, or `name` if given."""
+    name = (name or config.EMOTION_BACKEND).lower()
+    model_name = model_name or config.EMOTION_MODEL_NAME
+    if name not in BACKENDS:
+        raise ValueError(f"unknown emotion backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+    quantize = name.endswith("-int8")
+    if name.startswith("onnx"):
+        return OnnxEmotionBackend(
+            model_name,
+            device=config.EMOTION_DEVICE,
+            quantize=quantize,
+            sessions=config.EMOTION_ONNX_SESSIONS,
+            threads=config.EMOTION_ONNX_THREADS,
+        )
+    return TorchEmotionBackend(model_name, device=config.EMOTION_DEVICE, quantize=quantize)
+
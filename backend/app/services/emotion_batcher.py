@@ -0,0 +1,147 @@
+# backend/app/services/emotion_batcher.py
+"""
+In-process micro-batching scheduler for the emotion classifier.
+
+Concurrent chunk uploads each submit their transcript(s); a single worker
+thread collects whatever is pending for a short window (or until the batch is
+full), runs ONE padded forward pass over the whole batch and hands each caller
+its own result through a Future.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class EmotionBatcher:
+    """
+    score_fn receives a list of texts and must return one result per text,
+    in order (e.g. the pipeline's list of [{label, score}, ...]).
+    """
+
+    def __init__(self, score_fn: Callable[[List[str]], list], max_batch_size: int = 32, window_ms: float = 15.0):
+        self._score_fn = score_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.window_s = max(0.0, float(window_ms)) / 1000.0
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # metrics
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._infer_total = 0.0
+        self._size_hist = {}  # batch size -> count
+        self._errors = 0
+
+    # ---------- public API ----------
+    def submit(self, text: str) -> Future:
+        """Queue one text; the returned Future resolves to its scores."""
+        self._ensure_worker()
+        item = _Pending(text)
+        self._queue.put(item)
+        return item.future
+
+    def score(self, texts: Sequence[str]) -> list:
+        """Blocking helper: submit all texts and wait for their results."""
+        futures = [self.submit(t) for t in texts]
+        return [f.result() for f in futures]
+
+    async def ascore(self, texts: Sequence[str]) -> list:
+        """Awaitable variant for use from async routes."""
+        futures = [asyncio.wrap_future(self.submit(t)) for t in texts]
+        return list(await asyncio.gather(*futures))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                "batches": batches,
+                "items": self._items,
+                "avg_batch_size": (self._items / batches) if batches else 0.0,
+                "max_batch_size_seen": self._max_batch,
+                "batch_size_histogram": dict(sorted(self._size_hist.items())),
+                "avg_queue_wait_ms": (self._wait_total / self._items * 1000.0) if self._items else 0.0,
+                "max_queue_wait_ms": self._wait_max * 1000.0,
+                "avg_inference_ms": (self._infer_total / batches * 1000.0) if batches else 0.0,
+                "pending": self._queue.qsize(),
+                "errors": self._errors,
+                "config": {"max_batch_size": self.max_batch_size, "window_ms": self.window_s * 1000.0},
+            }
+
+    # ---------- worker ----------
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="emotion-batcher", daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> List[_Pending]:
+        first = self._queue.get()
+        batch = [first]
+        deadline = time.perf_counter() + self.window_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    # window closed: still drain anything already queued
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            waits = [started - p.enqueued_at for p in batch]
+            try:
+                results = self._score_fn([p.text for p in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"score_fn returned {len(results)} results for {len(batch)} texts")
+            except Exception as e:
+                logger.exception("emotion batch of %d failed", len(batch))
+                with self._stats_lock:
+                    self._errors += 1
+                for p in batch:
+                    if not p.future.cancelled():
+                        p.future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - started
+
+            for p, res in zip(batch, results):
+                if not p.future.cancelled():
+                    p.future.set_result(res)
+
+            with self._stats_lock:
+                n = len(batch)
+                self._batches += 1
+                self._items += n
+                self._max_batch = max(self._max_batch, n)
+                self._size_hist[n] = self._size_hist.get(n, 0) + 1
+                self._wait_total += sum(waits)
+                self._wait_max = max(self._wait_max, max(waits))
+                self._infer_total += elapsed
@@ -0,0 +1,98 @@
+# backend/app/services/emotion_matrix.py
+"""
+Fixed label index + float32 score vectors for go_emotions results.
+
+A chunk's emotions are a length-28 float32 vector in LABELS order instead
+of a {label: score} dict; a question's chunks stack into an (n, 28)
+matrix, so averages, duration-weighted averages, percentiles and top-k
+are single NumPy calls. Stored chunks keep the vector (serialized as the
+"emotion_scores" list); dicts only appear at the API boundary.
+
+Labels outside the index (a different EMOTION_MODEL_NAME) are ignored.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# SamLowe/roberta-base-go_emotions id2label order
+LABELS = (
+    "admiration", "amusement", "anger", "annoyance", "approval", "caring",
+    "confusion", "curiosity", "desire", "disappointment", "disapproval",
+    "disgust", "embarrassment", "excitement", "fear", "gratitude", "grief",
+    "joy", "love", "nervousness", "optimism", "pride", "realization",
+    "relief", "remorse", "sadness", "surprise", "neutral",
+)
+LABEL_INDEX: Dict[str, int] = {label: i for i, label in enumerate(LABELS)}
+NUM_LABELS = len(LABELS)
+
+
+def to_vector(emotions) -> Optional[np.ndarray]:
+    """
+    float32 vector from any emotion representation we produce:
+    {label: score}, [{"label", "score"}, ...] (pipeline output) or a stored
+    list of NUM_LABELS floats. Returns None for empty/missing emotions.
+    """
+    if emotions is None or len(emotions) == 0:
+        return None
+    vec = np.zeros(NUM_LABELS, dtype=np.float32)
+    if isinstance(emotions, dict):
+        for label, score in emotions.items():
+            i = LABEL_INDEX.get(label)
+            if i is not None:
+                vec[i] = score
+        return vec
+    first = emotions[0]
+    if isinstance(first, dict):
+        for emo in emotions:
+            i = LABEL_INDEX.get(emo["label"])
+            if i is not None:
+                vec[i] = emo["score"]
+        return vec
+    if len(emotions) != NUM_LABELS:
+        return None
+    return np.asarray(emotions, dtype=np.float32)
+
+
+def to_dict(vec: Optional[np.ndarray]) -> Dict[str, float]:
+    if vec is None:
+        return {}
+    return dict(zip(LABELS, vec.astype(float).tolist()))
+
+
+def stack(items: Iterable) -> np.ndarray:
+    """(n, NUM_LABELS) float32 matrix; items without emotions are skipped."""
+    vectors = [v for v in (to_vector(x) for x in items) if v is not None]
+    if not vectors:
+        return np.zeros((0, NUM_LABELS), dtype=np.float32)
+    return np.stack(vectors)
+
+
+def mean(matrix: np.ndarray, weights: Optional[Sequence[float]] = None) -> Optional[np.ndarray]:
+    """Column means, optionally weighted (e.g. by chunk duration)."""
+    if matrix.shape[0] == 0:
+        return None
+    if weights is None:
+        return matrix.mean(axis=0, dtype=np.float64).astype(np.float32)
+    w = np.asarray(weights, dtype=np.float64)
+    if w.sum() <= 0:
+        return matrix.mean(axis=0, dtype=np.float64).astype(np.float32)
+    return (w @ matrix.astype(np.float64) / w.sum()).astype(np.float32)
+
+
+def percentiles(matrix: np.ndarray, qs: Sequence[float] = (50, 90)) -> Dict[str, Dict[str, float]]:
+    """{"p50": {label: score}, "p90": {...}} over the chunks of the matrix."""
+    if matrix.shape[0] == 0:
+        return {}
+    values = np.percentile(matrix, qs, axis=0)
+    return {f"p{q:g}": to_dict(row) for q, row in zip(qs, values)}
+
+
+def top_k(vec: Optional[np.ndarray], k: int = 3) -> List[dict]:
+    """Highest-scoring labels, best first."""
+    if vec is None:
+        return []
+    k = min(k, NUM_LABELS)
+    idx = np.argpartition(-vec, k - 1)[:k]
+    idx = idx[np.argsort(-vec[idx])]
+    return [{"label": LABELS[i], "score": float(vec[i])} for i in idx]
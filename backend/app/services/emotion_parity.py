@@ -0,0 +1,124 @@
+# backend/app/services/emotion_parity.py
+"""
+Accuracy + latency check for the accelerated emotion backends.
+
+Scores a local corpus with the fp32 "torch" backend and with each
+candidate (torch-int8, onnx, onnx-int8), then reports the per-label
+absolute score difference (max / mean), top-label agreement and batch
+latency. By default the built-in sample of interview answers below is
+scored; --corpus points at a text file with one transcript per line.
+
+Usage (from backend/):
+
+  python -m app.services.emotion_parity \\
+      --backends torch-int8,onnx,onnx-int8 --tolerance 0.05
+
+Exits non-zero when any label score drifts more than --tolerance from fp32.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+from app.services import emotion_backends
+
+SAMPLE_CORPUS = [
+    "I led the migration of our billing service to Kubernetes and cut deploy times in half.",
+    "Um, I'm not really sure, I think maybe I would, like, ask my manager first?",
+    "Honestly that project was a disaster and I was pretty frustrated with the team.",
+    "I'm really excited about this role because it combines data engineering and product work.",
+    "When the outage happened I was nervous, but I stayed calm and rolled back the release.",
+    "Thank you.",
+    "My biggest weakness is that I sometimes take on too much myself instead of delegating.",
+    "I disagreed with the design, so I wrote up the trade-offs and we agreed on a compromise.",
+    "I'm sorry, could you repeat the question?",
+    "We grew the user base from ten thousand to a million in under a year, which I'm proud of.",
+]
+
+
+def load_corpus(path: Optional[str]) -> List[str]:
+    """Non-empty lines of `path`, or SAMPLE_CORPUS when no path is given."""
+    if not path:
+        return list(SAMPLE_CORPUS)
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _score_all(backend, texts: List[str], batch_size: int):
+    scores, latencies = [], []
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        began = time.perf_counter()
+        out = backend.score(batch)
+        latencies.append(time.perf_counter() - began)
+        scores.extend({e["label"]: float(e["score"]) for e in row} for row in out)
+    return scores, latencies
+
+
+def run(backends: List[str], texts: List[str], batch_size: int = 8) -> List[dict]:
+    reference = emotion_backends.make_backend("torch").load()
+    reference.warmup()
+    ref_scores, ref_lat = _score_all(reference, texts, batch_size)
+    ref_mean = statistics.mean(ref_lat)
+
+    report = [{"backend": reference.identity(), "latency_mean_s": ref_mean, "max_abs_diff": 0.0,
+               "mean_abs_diff": 0.0, "top1_agreement": 1.0, "speedup": 1.0}]
+    for name in backends:
+        backend = emotion_backends.make_backend(name).load()
+        backend.warmup()
+        scores, lat = _score_all(backend, texts, batch_size)
+        diffs, agree, worst = [], 0, ("", 0.0)
+        for ref, cand in zip(ref_scores, scores):
+            for label, value in ref.items():
+                d = abs(value - cand.get(label, 0.0))
+                diffs.append(d)
+                if d > worst[1]:
+                    worst = (label, d)
+            agree += max(ref, key=ref.get) == max(cand, key=cand.get)
+        mean = statistics.mean(lat)
+        report.append({
+            "backend": backend.identity(),
+            "latency_mean_s": mean,
+            "max_abs_diff": max(diffs) if diffs else 0.0,
+            "worst_label": worst[0],
+            "mean_abs_diff": statistics.mean(diffs) if diffs else 0.0,
+            "top1_agreement": agree / len(texts) if texts else 1.0,
+            "speedup": (ref_mean / mean) if mean else None,
+        })
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare emotion backends against the fp32 model.")
+    parser.add_argument("--corpus", default=None, help="one transcript per line (default: the built-in SAMPLE_CORPUS)")
+    parser.add_argument("--backends", default="torch-int8,onnx,onnx-int8")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--tolerance", type=float, default=0.05, help="max allowed per-label score difference")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    texts = load_corpus(args.corpus)
+    names = [n.strip() for n in args.backends.split(",") if n.strip() and n.strip() != "torch"]
+    report = run(names, texts, args.batch_size)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{len(texts)} texts, batch size {args.batch_size}")
+        print(f"{'backend':<50} {'max diff':>9} {'mean diff':>10} {'top1':>6} {'mean s':>8} {'speedup':>8}")
+        for r in report:
+            print(f"{r['backend']:<50} {r['max_abs_diff']:>9.4f} {r['mean_abs_diff']:>10.5f} "
+                  f"{r['top1_agreement']:>6.2f} {r['latency_mean_s']:>8.4f} {(r['speedup'] or 0):>7.2f}x")
+
+    failed = [r["backend"] for r in report if r["max_abs_diff"] > args.tolerance]
+    if failed:
+        print(f"scores drift beyond {args.tolerance}: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
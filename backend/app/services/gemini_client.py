@@ -1,53 +1,60 @@
 # backend/app/services/gemini_client.py
-import os
 import logging
 
-try:
-    import google.generativeai as genai
-except Exception:
-    genai = None
+from app import config
+from app.services import llm_client
 
 logger = logging.getLogger(__name__)
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-# Only configure if lib available and key present
-if genai and GEMINI_API_KEY:
+# Gemini generateContent over REST through the shared pooled client
+# (deadline, retries and circuit breaker live in llm_client)
+_ENABLED = bool(config.GEMINI_API_KEY)
+if not _ENABLED:
+    logger.warning("GEMINI_API_KEY missing — Gemini disabled.")
+
+_client = llm_client.client("gemini")
+
+
+def _fallback(prompt_text: str, count: int):
+    # simple, deterministic fallbacks to avoid failures
+    base = prompt_text.splitlines()[:3]
+    # return lightweight paraphrases as fallback (or empty)
+    return [f"Follow-up: {b}" for b in base][:count]
+
+
+def _generate(prompt: str):
+    """Text of the first candidate, or None if the call failed / was short-circuited."""
+    data = _client.post_json(
+        f"{config.GEMINI_API_BASE}/models/{config.GEMINI_MODEL}:generateContent",
+        {"contents": [{"parts": [{"text": prompt}]}]},
+        # header rather than ?key=, so the key never appears in a URL (or a logged error)
+        headers={"x-goog-api-key": config.GEMINI_API_KEY},
+    )
+    if not isinstance(data, dict):
+        return None
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        _MODEL = genai.GenerativeModel("gemini-pro")
-        _ENABLED = True
-    except Exception as e:
-        logger.exception("Failed to configure Gemini client, disabling it.")
-        _MODEL = None
-        _ENABLED = False
-else:
-    if not genai:
-        logger.warning("google-generativeai library not installed — Gemini disabled.")
-    if not GEMINI_API_KEY:
-        logger.warning("GEMINI_API_KEY missing — Gemini disabled.")
-    _MODEL = None
-    _ENABLED = False
-
-
-def generate_similar_questions(prompt_text: str, count: int = 3):
+        parts = data["candidates"][0]["content"]["parts"]
+        return "".join(p.get("text", "") for p in parts)
+    except (KeyError, IndexError, TypeError):
+        logger.warning("Unexpected Gemini response shape: %s", str(data)[:200])
+        return None
+
+
+def generate_similar_questions(prompt_text: str, count: int = 3, use_fallback: bool = True):
     """
-    If Gemini disabled, returns an empty list immediately or some simple fallbacks.
+    If Gemini is disabled, unavailable (breaker open) or fails, returns the
+    templated fallbacks immediately (or [] with use_fallback=False, so the
+    question pool never stores templated lines as generated questions).
     """
-    if not _ENABLED:
-        # provide simple, deterministic fallbacks to avoid failures
-        base = prompt_text.splitlines()[:3]
-        # return lightweight paraphrases as fallback (or empty)
-        return [f"Follow-up: {b}" for b in base][:count]
+    if not _ENABLED or count <= 0:
+        return _fallback(prompt_text, count) if use_fallback else []
 
-    try:
-        prompt = f"""Generate {count} short interview questions similar to these examples:
+    prompt = f"""Generate {count} short interview questions similar to these examples:
 {prompt_text}
 
 Return them as plain lines, one question per line."""
-        resp = _MODEL.generate_content(prompt)
-        text = getattr(resp, "text", "") or str(resp)
-        questions = [line.lstrip("- ").strip() for line in text.splitlines() if line.strip()]
-        return questions[:count]
-    except Exception:
-        logger.exception("Gemini generation failed; returning fallback.")
-        return []
+    text = _generate(prompt)
+    if not text:
+        return _fallback(prompt_text, count) if use_fallback else []
+    questions = [line.lstrip("- ").strip() for line in text.splitlines() if line.strip()]
+    return questions[:count]
@@ -0,0 +1,197 @@
+# backend/app/services/inference_cache.py
+"""
+Content-addressed caches for inference results.
+
+TieredCache = bounded in-memory LRU in front of an optional on-disk tier
+(one small JSON file per key under DATA_DIR/cache/<name>, evicted oldest
+first once the directory grows past its byte budget).
+
+audio_cache maps sha256(audio bytes) + model identity to the transcript and
+emotion results of a chunk, so client retries of byte-identical uploads
+skip Whisper and the emotion model entirely.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app import config
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(0, int(max_entries))
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data[key] = value  # move to most-recent end
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+class DiskCache:
+    """JSON-file-per-key cache with a total size budget (oldest evicted first)."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key → size, oldest first
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name[:-5], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path, None)  # refresh recency for the next scan
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            if key in self._index:
+                self._index.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        if self.max_bytes == 0:
+            return
+        payload = json.dumps(value).encode("utf-8")
+        path = self._path(key)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)  # atomic: readers never see a partial file
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._total -= self._index.pop(key, 0)
+            self._index[key] = len(payload)
+            self._total += len(payload)
+            victims = []
+            while self._total > self.max_bytes and len(self._index) > 1:
+                old_key, size = self._index.popitem(last=False)
+                self._total -= size
+                victims.append(old_key)
+            self.evictions += len(victims)
+        for old_key in victims:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class TieredCache:
+    def __init__(self, name: str, max_entries: int, disk_dir: Optional[str] = None, disk_max_bytes: int = 0):
+        self.name = name
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskCache(disk_dir, disk_max_bytes) if disk_dir and disk_max_bytes > 0 else None
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)  # promote
+        return value
+
+    def put(self, key: str, value: Any):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def stats(self) -> dict:
+        return {"memory": self.memory.stats(), "disk": self.disk.stats() if self.disk else None}
+
+
+def content_key(content_sha256: str, model_identity: str) -> str:
+    """
+    Cache key from the content's sha256 hex digest (computed while the upload
+    streams in), salted with the model identity so a model change invalidates entries.
+    """
+    return hashlib.sha256(f"{content_sha256}\0{model_identity}".encode("utf-8")).hexdigest()
+
+
+# transcript + emotions per uploaded chunk, keyed by content_key(sha256(audio), models)
+audio_cache = TieredCache(
+    "audio",
+    max_entries=config.AUDIO_CACHE_ENTRIES,
+    disk_dir=os.path.join(config.DATA_DIR, "cache", "audio") if config.AUDIO_CACHE_DISK else None,
+    disk_max_bytes=config.AUDIO_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
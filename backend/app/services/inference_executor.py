@@ -0,0 +1,166 @@
+# backend/app/services/inference_executor.py
+"""
+Bounded worker pool for blocking model work (Whisper decoding/transcription).
+
+Emotion analysis does not run here: it is awaited on the in-process emotion
+batcher (analysis.analyze_text_async), which bounds the classifier to one
+batched forward pass at a time. Holding a pool worker while it waits on a
+batch future would cap batches at INFERENCE_WORKERS texts, and in process
+mode every child would build its own model and batcher.
+
+Routes `await inference.run("transcribe", fn, ...)` instead of calling the
+model inline, so the uvicorn event loop keeps serving other requests.
+When more than INFERENCE_WORKERS + INFERENCE_MAX_QUEUE jobs are outstanding,
+new work is rejected with InferenceBusyError (routes map it to 503).
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBusyError(RuntimeError):
+    """Raised when the executor's queue is full; callers should retry later."""
+
+
+class _StageStats:
+    __slots__ = ("queued", "running", "completed", "failed", "rejected",
+                 "wait_total", "wait_max", "run_total")
+
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+
+    def as_dict(self) -> dict:
+        done = self.completed + self.failed
+        started = done + self.running
+        return {
+            "queue_depth": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (self.wait_total / started * 1000.0) if started else 0.0,
+            "max_wait_ms": self.wait_max * 1000.0,
+            "avg_run_ms": (self.run_total / done * 1000.0) if done else 0.0,
+        }
+
+
+class InferenceExecutor:
+    def __init__(self, kind: str = "thread", max_workers: int = 2, max_queue: int = 16):
+        self.kind = "process" if kind == "process" else "thread"
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._stages: Dict[str, _StageStats] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.kind == "process":
+                        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._pool
+
+    def _stage(self, name: str) -> _StageStats:
+        st = self._stages.get(name)
+        if st is None:
+            st = self._stages[name] = _StageStats()
+        return st
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # one slot per worker: a job holding a slot is running, everything
+        # else is waiting in the queue (this keeps depth/wait exact for both
+        # thread and process pools)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    async def run(self, stage: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool, accounting it under `stage`."""
+        with self._lock:
+            st = self._stage(stage)
+            if self._outstanding >= self.capacity:
+                st.rejected += 1
+                raise InferenceBusyError(f"inference queue full ({self._outstanding} outstanding)")
+            self._outstanding += 1
+            st.queued += 1
+
+        submitted = time.monotonic()
+        started = None
+        ok = False
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._get_slots():
+                started = time.monotonic()
+                with self._lock:
+                    st.queued -= 1
+                    st.running += 1
+                    wait = started - submitted
+                    st.wait_total += wait
+                    st.wait_max = max(st.wait_max, wait)
+                try:
+                    result = await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args, **kwargs))
+                finally:
+                    with self._lock:
+                        st.running -= 1
+                        st.run_total += time.monotonic() - started
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+                if started is None:
+                    # cancelled while still waiting for a slot
+                    st.queued -= 1
+                if ok:
+                    st.completed += 1
+                else:
+                    st.failed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "outstanding": self._outstanding,
+                "stages": {name: st.as_dict() for name, st in self._stages.items()},
+            }
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+# Process-wide executor shared by all routes
+inference = InferenceExecutor(
+    kind=config.INFERENCE_EXECUTOR,
+    max_workers=config.INFERENCE_WORKERS,
+    max_queue=config.INFERENCE_MAX_QUEUE,
+)
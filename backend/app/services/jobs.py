@@ -0,0 +1,129 @@
+# backend/app/services/jobs.py
+"""
+In-memory registry for background chunk-analysis jobs.
+
+/feedback/analyze in job mode creates a job, returns its id right away and
+runs the pipeline in the background. Clients either poll the job or listen
+on a per-session event stream (SSE) that receives each chunk's feedback as
+soon as it is ready.
+
+Like the in-memory session store, jobs live in this process only.
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from app import config
+
+# job_id -> job dict (oldest first, so finished jobs can be pruned cheaply)
+_JOBS: "OrderedDict[str, dict]" = OrderedDict()
+# session_id -> set of subscriber queues (one per open SSE connection)
+_SUBSCRIBERS: Dict[str, Set[asyncio.Queue]] = {}
+# strong references to running tasks so they are not garbage collected
+_TASKS: Set[asyncio.Task] = set()
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def pending_count() -> int:
+    return sum(1 for j in _JOBS.values() if j["status"] in ("queued", "running"))
+
+
+def create_job(session_id: str, question_id: str, chunk_index: int) -> dict:
+    job = {
+        "id": uuid.uuid4().hex,
+        "session_id": session_id,
+        "question_id": question_id,
+        "chunk_index": chunk_index,
+        "status": "queued",
+        "created_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+    _JOBS[job["id"]] = job
+    _prune()
+    return job
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    return _JOBS.get(job_id)
+
+
+def start(job_id: str, coro) -> asyncio.Task:
+    """Schedule the job's coroutine on the running loop."""
+    task = asyncio.get_running_loop().create_task(coro)
+    _TASKS.add(task)
+    task.add_done_callback(_TASKS.discard)
+    return task
+
+
+def mark_running(job_id: str):
+    job = _JOBS.get(job_id)
+    if job:
+        job["status"] = "running"
+        job["started_at"] = _now()
+
+
+def mark_done(job_id: str, result: dict):
+    job = _JOBS.get(job_id)
+    if not job:
+        return
+    job["status"] = "done"
+    job["result"] = result
+    job["finished_at"] = _now()
+    _publish(job["session_id"], "chunk_feedback", job)
+
+
+def mark_failed(job_id: str, error: str):
+    job = _JOBS.get(job_id)
+    if not job:
+        return
+    job["status"] = "failed"
+    job["error"] = error
+    job["finished_at"] = _now()
+    _publish(job["session_id"], "chunk_failed", job)
+
+
+# ---------- SSE fan-out ----------
+def subscribe(session_id: str) -> asyncio.Queue:
+    q: asyncio.Queue = asyncio.Queue(maxsize=config.JOBS_SUBSCRIBER_BUFFER)
+    _SUBSCRIBERS.setdefault(session_id, set()).add(q)
+    return q
+
+
+def unsubscribe(session_id: str, q: asyncio.Queue):
+    subs = _SUBSCRIBERS.get(session_id)
+    if subs is None:
+        return
+    subs.discard(q)
+    if not subs:
+        _SUBSCRIBERS.pop(session_id, None)
+
+
+def _publish(session_id: str, event: str, job: dict):
+    for q in list(_SUBSCRIBERS.get(session_id, ())):
+        try:
+            q.put_nowait({"event": event, "job": job})
+        except asyncio.QueueFull:
+            # slow consumer: drop the event, it can still poll the job
+            pass
+
+
+def _prune():
+    """Forget the oldest finished jobs beyond JOBS_MAX_RETAINED."""
+    excess = len(_JOBS) - config.JOBS_MAX_RETAINED
+    if excess <= 0:
+        return
+    for job_id in list(_JOBS.keys()):
+        if excess <= 0:
+            break
+        if _JOBS[job_id]["status"] in ("done", "failed"):
+            del _JOBS[job_id]
+            excess -= 1
@@ -0,0 +1,21 @@
+# backend/app/services/json_response.py
+"""
+Response class shared by the routers (and the app's default response class).
+
+Rendered with session_models.dumps: orjson when installed, so large
+payloads (sessions with many chunks) serialize several times faster than
+with the stdlib encoder, and records / numpy vectors are handled
+natively. Routes on hot paths return FastJSONResponse(...) directly,
+which also skips FastAPI's jsonable_encoder pass.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.services.session_models import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
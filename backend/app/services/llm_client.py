@@ -0,0 +1,252 @@
+# backend/app/services/llm_client.py
+"""
+Shared client layer for the LLM endpoints (Gemini question generation,
+the Google AI resume endpoint).
+
+  - one pooled requests.Session (keep-alive connections reused across calls)
+  - per-call deadline covering all attempts, per-attempt socket timeout
+  - exponential backoff with jitter on timeouts, connection errors, 429 and 5xx
+  - a circuit breaker per endpoint: after LLM_BREAKER_FAILURES failed calls
+    in a row, calls return None immediately (callers use their templated
+    fallbacks) until LLM_BREAKER_RESET_SECONDS have passed
+  - fan_out() to run independent generation steps concurrently
+
+Every URL comes from config / env, so the whole layer can be pointed at
+the local stub server in app/services/llm_stub.py.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# query strings and key=... pairs in exception messages (requests puts the full URL in them)
+_URL_QUERY = re.compile(r"(https?://[^\s?'\"]+)\?[^\s'\"]*")
+_SECRET_PARAM = re.compile(r"(?i)\b((?:api_?)?key|token|secret)=[^&\s'\"]+")
+
+
+def redact(message: str) -> str:
+    """Drop URL query strings and key/token parameters from a message before it is logged."""
+    return _SECRET_PARAM.sub(r"\1=<redacted>", _URL_QUERY.sub(r"\1?<redacted>", message))
+
+
+class CircuitBreaker:
+    """closed → open after `failures` consecutive failures → half-open (one trial) after `reset_seconds`."""
+
+    def __init__(self, failures: int, reset_seconds: float):
+        self.failures = max(1, int(failures))
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._consecutive = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self.opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            # a failed half-open trial re-opens right away
+            if self._trial_running or self._consecutive >= self.failures:
+                if self._opened_at is None:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._consecutive,
+                "opened": self.opened,
+                "short_circuited": self.short_circuited,
+            }
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def http_session() -> requests.Session:
+    """Process-wide pooled session (created on first use)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.LLM_POOL_SIZE)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                _session = s
+    return _session
+
+
+class LLMClient:
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(config.LLM_BREAKER_FAILURES, config.LLM_BREAKER_RESET_SECONDS)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.latency_total = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        base = config.LLM_BACKOFF_BASE_MS / 1000.0
+        cap = config.LLM_BACKOFF_MAX_MS / 1000.0
+        return random.uniform(0, min(cap, base * (2 ** attempt)))  # "full jitter"
+
+    def post_json(self, url: str, payload: dict, headers: Optional[dict] = None,
+                  params: Optional[dict] = None, deadline: Optional[float] = None) -> Optional[Any]:
+        """
+        POST payload as JSON and return the decoded response, or None when the
+        breaker is open, the deadline passes, or all attempts fail. Never raises.
+        """
+        if not self.breaker.allow():
+            return None
+        started = time.monotonic()
+        deadline_at = started + (deadline if deadline is not None else config.LLM_DEADLINE_SECONDS)
+        attempt = 0
+        error = None
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                error = error or "deadline exceeded"
+                break
+            try:
+                resp = http_session().post(url, json=payload, headers=headers, params=params,
+                                           timeout=min(config.LLM_TIMEOUT_SECONDS, remaining))
+                if resp.status_code in _RETRY_STATUS:
+                    error = f"HTTP {resp.status_code}"
+                else:
+                    resp.raise_for_status()  # other 4xx: our request is wrong, retrying won't help
+                    data = resp.json()
+                    self._record(started, ok=True)
+                    return data
+            except (requests.Timeout, requests.ConnectionError) as e:
+                error = redact(str(e))
+            except Exception as e:
+                error = redact(str(e))
+                break
+            if attempt >= config.LLM_RETRIES:
+                break
+            pause = self._backoff(attempt)
+            if time.monotonic() + pause >= deadline_at:
+                break
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            time.sleep(pause)
+
+        logger.warning("%s call failed after %d attempt(s): %s", self.name, attempt + 1, error)
+        self._record(started, ok=False)
+        return None
+
+    def _record(self, started: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            self.latency_total += time.monotonic() - started
+            if not ok:
+                self.failures += 1
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "avg_latency_s": (self.latency_total / self.calls) if self.calls else 0.0,
+            }
+        out["breaker"] = self.breaker.stats()
+        return out
+
+
+_CLIENTS: Dict[str, LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def client(name: str) -> LLMClient:
+    """Named client (one breaker + counters per endpoint), shared by the whole process."""
+    with _clients_lock:
+        c = _CLIENTS.get(name)
+        if c is None:
+            c = _CLIENTS[name] = LLMClient(name)
+        return c
+
+
+_fanout_pool = ThreadPoolExecutor(max_workers=max(1, config.LLM_FANOUT_WORKERS), thread_name_prefix="llm-fanout")
+
+
+def fan_out(tasks: Dict[str, Callable[[], Any]], fallbacks: Optional[Dict[str, Callable[[], Any]]] = None,
+            timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run independent tasks concurrently and return {name: result}. A task that
+    raises or is still running after `timeout` seconds is replaced by its
+    fallback (called inline), or None without one.
+    """
+    fallbacks = fallbacks or {}
+    timeout = timeout if timeout is not None else config.LLM_DEADLINE_SECONDS + 1.0
+    deadline_at = time.monotonic() + timeout
+    futures = {name: _fanout_pool.submit(fn) for name, fn in tasks.items()}
+    results = {}
+    for name, fut in futures.items():
+        try:
+            results[name] = fut.result(timeout=max(0.0, deadline_at - time.monotonic()))
+        except FutureTimeout:
+            logger.warning("fan-out task %s missed its deadline; using fallback", name)
+            results[name] = fallbacks[name]() if name in fallbacks else None
+        except Exception:
+            logger.exception("fan-out task %s failed; using fallback", name)
+            results[name] = fallbacks[name]() if name in fallbacks else None
+    return results
+
+
+def stats() -> dict:
+    with _clients_lock:
+        clients = list(_CLIENTS.values())
+    return {c.name: c.stats() for c in clients}
@@ -0,0 +1,88 @@
+# backend/app/services/llm_stub.py
+"""
+Local stub for the LLM endpoints, to exercise llm_client (timeouts,
+retries, circuit breaker, fan-out) without network access or API keys.
+
+  python -m app.services.llm_stub --port 8765 --delay 0.3 --fail-rate 0.2
+
+then start the backend with
+
+  GEMINI_API_KEY=stub GEMINI_API_BASE=http://127.0.0.1:8765/v1beta \\
+  GOOGLE_AI_API_KEY=stub GOOGLE_AI_API_URL=http://127.0.0.1:8765/resume
+
+Gemini-style paths (.../models/<model>:generateContent) get a
+candidates/content/parts response with numbered questions; any other path
+gets {"output": "[...]"} with a JSON array of questions, like the resume
+endpoint. --fail-rate answers that fraction of requests with HTTP 503,
+--delay sleeps before every response (set it above LLM_TIMEOUT_SECONDS to
+test deadlines).
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(delay: float, fail_rate: float):
+    counter = {"requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            with lock:
+                counter["requests"] += 1
+                n = counter["requests"]
+            if delay:
+                time.sleep(delay)
+            if random.random() < fail_rate:
+                self._send(503, {"error": "stub failure"})
+                return
+            questions = [f"Stub question {n}.{i}: describe a challenge you solved." for i in range(1, 4)]
+            if ":generateContent" in self.path:
+                body = {"candidates": [{"content": {"parts": [{"text": "\n".join(questions)}]}}]}
+            else:
+                body = {"output": json.dumps(questions)}
+            self._send(200, body)
+
+        def _send(self, code: int, body: dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(port: int = 8765, delay: float = 0.0, fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stub in a background thread (handy from a script); returns the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(delay, fail_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stub for the Gemini / Google AI endpoints.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to sleep before each response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args(argv)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.delay, args.fail_rate))
+    print(f"LLM stub listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# backend/app/services/model_registry.py
+"""
+Process-wide registry owning the heavy models (Whisper, emotion classifier).
+
+Services register a loader (and optional warmup) under a name; the first
+get() loads the model exactly once, even when called from several threads.
+With MODEL_LOAD_MODE=eager, main.on_startup loads and warms every model
+before serving; with MODEL_LOAD_MODE=lazy, models load on first use.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (Linux /proc, else None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _param_bytes(model: Any) -> Optional[int]:
+    """
+    Size of a torch model's parameters + buffers (pipelines expose .model).
+
+    Modules swapped in by torch.ao.quantization.quantize_dynamic keep their
+    int8 weights in packed params that are neither parameters nor buffers;
+    those are unpacked via _weight_bias() and counted too.
+    """
+    target = getattr(model, "model", model)
+    try:
+        total = 0
+        for t in list(target.parameters()) + list(target.buffers()):
+            total += t.numel() * t.element_size()
+        for module in target.modules():
+            # the holder module (LinearPackedParams) owns the packed object; the
+            # quantized Linear wrapping it exposes _weight_bias() as well
+            weight_bias = getattr(module, "_weight_bias", None)
+            packed = getattr(module, "_packed_params", None)
+            if not callable(weight_bias) or packed is None or hasattr(packed, "_weight_bias"):
+                continue
+            for t in weight_bias():
+                if t is not None:
+                    total += t.numel() * t.element_size()
+        return total
+    except Exception:
+        return None
+
+
+class _Entry:
+    __slots__ = ("name", "loader", "warmup", "info", "lock", "model", "error",
+                 "load_seconds", "warmup_seconds", "param_bytes", "rss_delta_bytes", "loaded_at")
+
+    def __init__(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]], info: Optional[dict]):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.info = info or {}
+        self.lock = threading.Lock()
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.param_bytes = None
+        self.rss_delta_bytes = None
+        self.loaded_at = None
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]] = None, info: Optional[dict] = None):
+        """Register (or replace) a model loader. Does not load anything."""
+        with self._lock:
+            self._entries[name] = _Entry(name, loader, warmup, info)
+
+    def _entry(self, name: str) -> _Entry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"model '{name}' is not registered")
+        return entry
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.model is not None
+
+    def get(self, name: str) -> Any:
+        """Return the model, loading it on first use (thread-safe, loads once)."""
+        entry = self._entry(name)
+        if entry.model is not None:
+            return entry.model
+        with entry.lock:
+            if entry.model is None:
+                logger.info("Loading model %s ...", name)
+                rss_before = _rss_bytes()
+                started = time.perf_counter()
+                try:
+                    model = entry.loader()
+                except Exception as e:
+                    entry.error = str(e)
+                    raise
+                entry.load_seconds = time.perf_counter() - started
+                rss_after = _rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    entry.rss_delta_bytes = rss_after - rss_before
+                entry.param_bytes = _param_bytes(model)
+                entry.loaded_at = time.time()
+                entry.error = None
+                entry.model = model
+                logger.info("Model %s loaded in %.2fs", name, entry.load_seconds)
+        return entry.model
+
+    def warmup(self, name: str):
+        """Load the model and run its dummy inference once."""
+        entry = self._entry(name)
+        model = self.get(name)
+        if entry.warmup is None:
+            return
+        started = time.perf_counter()
+        try:
+            entry.warmup(model)
+        except Exception as e:
+            entry.error = f"warmup failed: {e}"
+            raise
+        entry.warmup_seconds = time.perf_counter() - started
+
+    def stats(self) -> dict:
+        out = {}
+        for name, e in list(self._entries.items()):
+            out[name] = {
+                "loaded": e.model is not None,
+                "load_seconds": e.load_seconds,
+                "warmup_seconds": e.warmup_seconds,
+                "param_bytes": e.param_bytes,
+                "rss_delta_bytes": e.rss_delta_bytes,
+                "loaded_at": e.loaded_at,
+                "error": e.error,
+                **e.info,
+            }
+        return out
+
+
+# Process-wide registry; services register their models at import time
+registry = ModelRegistry()
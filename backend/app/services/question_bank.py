@@ -1,6 +1,40 @@
+# backend/app/services/question_bank.py
+"""
+Curated interview questions, loaded from a JSONL file (QUESTION_BANK_PATH,
+under DATA_DIR) — one question per line:
+
+  {"id": "ai-1", "text": "...", "type": "domain", "domain": "ai-ml",
+   "difficulty": "medium", "tags": ["ml-basics"], "weight": 1.0}
+
+Only id and text are required (type defaults to "domain", difficulty to
+"medium", weight to 1.0). The file is seeded from the built-in questions
+below when it doesn't exist, and re-read when its mtime changes (checked
+at most every QUESTION_BANK_RELOAD_SECONDS), so questions can be added
+without restarting the server.
+
+Questions are indexed by type, domain, difficulty and tag; each index
+bucket keeps cumulative weights, so weighted sampling of k questions costs
+O(k log n) draws rather than a scan of the bank. Questions the user has
+already seen (ids from their earlier sessions) are skipped while enough
+unseen ones remain.
+"""
+
+import bisect
+import json
+import logging
+import os
 import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app import config
+from app.services import question_pool, session_store
 from app.services.gemini_client import generate_similar_questions
 
+logger = logging.getLogger(__name__)
+
+# built-in questions: written to QUESTION_BANK_PATH on first start
 GENERAL_QUESTIONS = [
     {"id": "g-1", "text": "Tell me about yourself.", "type": "general"},
     {"id": "g-2", "text": "What are your strengths and weaknesses?", "type": "general"},
@@ -19,16 +53,263 @@ DOMAIN_QUESTION_BANK = [
     {"id": "fs-3", "domain": "fullstack", "text": "Describe a deployment pipeline you built.", "type": "domain"},
 ]
 
-def sample_general(n=3, ai_generated=2):
+_SEED_TEXTS = 50  # example questions handed to the question pool per key
+
+
+class _Bucket:
+    __slots__ = ("items", "cum", "total")
+
+    def __init__(self):
+        self.items: List[dict] = []
+        self.cum: List[float] = []  # running sum of weights, for bisect draws
+        self.total = 0.0
+
+    def add(self, q: dict):
+        self.total += q["weight"]
+        self.items.append(q)
+        self.cum.append(self.total)
+
+    def draw(self, rng: random.Random) -> dict:
+        return self.items[bisect.bisect_right(self.cum, rng.random() * self.total)]
+
+
+class QuestionBank:
+    """Immutable index over one version of the bank file (swapped whole on reload)."""
+
+    def __init__(self, questions: Iterable[dict], mtime: float = 0.0):
+        self.mtime = mtime
+        self.by_id: Dict[str, dict] = {}
+        self._index: Dict[tuple, _Bucket] = {}
+        for q in questions:
+            if q["id"] in self.by_id:
+                continue
+            self.by_id[q["id"]] = q
+            keys = [("type", q["type"]), ("difficulty", q["difficulty"])]
+            if q.get("domain"):
+                keys.append(("domain", q["domain"]))
+            keys.extend(("tag", t) for t in q["tags"])
+            for key in keys:
+                bucket = self._index.get(key)
+                if bucket is None:
+                    bucket = self._index[key] = _Bucket()
+                bucket.add(q)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def domains(self) -> List[str]:
+        return sorted(v for k, v in self._index if k == "domain")
+
+    def count(self, type: Optional[str] = None, domain: Optional[str] = None) -> int:
+        bucket = self._index.get(("domain", domain) if domain else ("type", type))
+        return len(bucket.items) if bucket else 0
+
+    def seed_texts(self, type: Optional[str] = None, domain: Optional[str] = None) -> List[str]:
+        bucket = self._index.get(("domain", domain) if domain else ("type", type))
+        if not bucket:
+            return []
+        items = bucket.items if len(bucket.items) <= _SEED_TEXTS else random.sample(bucket.items, _SEED_TEXTS)
+        return [q["text"] for q in items]
+
+    def sample(self, k: int, type: Optional[str] = None, domain: Optional[str] = None,
+               difficulty: Optional[str] = None, tags: Optional[Iterable[str]] = None,
+               exclude_ids: Optional[set] = None, rng: Optional[random.Random] = None) -> List[dict]:
+        """
+        Weighted sample of up to k distinct questions matching every given
+        filter (any of `tags`), skipping exclude_ids. Draws from the smallest
+        matching index bucket and rejects the rest; falls back to one pass
+        over that bucket only when most of it is excluded.
+        """
+        if k <= 0:
+            return []
+        rng = rng or random
+        difficulty = difficulty.lower() if difficulty else None
+        tags = {str(t).lower() for t in (tags or ())}
+        keys = [("type", type) if type else None, ("domain", domain) if domain else None,
+                ("difficulty", difficulty) if difficulty else None]
+        keys = [key for key in keys if key]
+        if not keys and not tags:
+            keys = [("type", "general")]
+        buckets = [self._index.get(key) for key in keys]
+        if any(b is None for b in buckets):
+            return []
+        if tags:
+            tag_buckets = [self._index[("tag", t)] for t in tags if ("tag", t) in self._index]
+            if not tag_buckets:
+                return []
+            if len(tag_buckets) == 1:
+                buckets.append(tag_buckets[0])
+            elif not buckets:
+                # several tags and nothing else to narrow by: draw from their union
+                union = _Bucket()
+                for q in {q["id"]: q for b in tag_buckets for q in b.items}.values():
+                    union.add(q)
+                buckets.append(union)
+        bucket = min(buckets, key=lambda b: len(b.items))
+        exclude_ids = exclude_ids or set()
+
+        def ok(q):
+            return (q["id"] not in exclude_ids
+                    and (not type or q["type"] == type)
+                    and (not domain or q.get("domain") == domain)
+                    and (not difficulty or q["difficulty"] == difficulty)
+                    and (not tags or not tags.isdisjoint(q["tags"])))
+
+        chosen: Dict[str, dict] = {}
+        for _ in range(4 * k + 16):
+            if len(chosen) >= k:
+                break
+            q = bucket.draw(rng)
+            if q["id"] not in chosen and ok(q):
+                chosen[q["id"]] = q
+        if len(chosen) < k:
+            # heavily filtered / excluded bucket: weighted sample without
+            # replacement over what's left (Efraimidis–Spirakis keys)
+            rest = [q for q in bucket.items if q["id"] not in chosen and ok(q)]
+            rest.sort(key=lambda q: rng.random() ** (1.0 / q["weight"]), reverse=True)
+            for q in rest[:k - len(chosen)]:
+                chosen[q["id"]] = q
+        return list(chosen.values())
+
+
+def _normalize(raw: dict, line_no: int) -> Optional[dict]:
+    if not isinstance(raw, dict) or not raw.get("id") or not raw.get("text"):
+        logger.warning("question bank line %d: missing id/text, skipped", line_no)
+        return None
+    try:
+        weight = float(raw.get("weight", 1.0))
+    except (TypeError, ValueError):
+        weight = 1.0
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = [tags]
+    return {
+        "id": str(raw["id"]),
+        "text": str(raw["text"]),
+        "type": raw.get("type") or "domain",
+        "domain": raw.get("domain"),
+        "difficulty": (raw.get("difficulty") or "medium").lower(),
+        "tags": [str(t).lower() for t in tags],
+        "weight": weight if weight > 0 else 1.0,
+    }
+
+
+def _seed_file(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for q in GENERAL_QUESTIONS + DOMAIN_QUESTION_BANK:
+            f.write(json.dumps(q) + "\n")
+    os.replace(tmp, path)
+    logger.info("seeded question bank %s with %d built-in questions", path, len(GENERAL_QUESTIONS) + len(DOMAIN_QUESTION_BANK))
+
+
+def load_bank(path: str) -> QuestionBank:
+    if not os.path.exists(path):
+        _seed_file(path)
+    mtime = os.stat(path).st_mtime
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                q = _normalize(json.loads(line), line_no)
+            except json.JSONDecodeError:
+                logger.warning("question bank line %d: invalid JSON, skipped", line_no)
+                continue
+            if q:
+                questions.append(q)
+    return QuestionBank(questions, mtime)
+
+
+_bank: Optional[QuestionBank] = None
+_bank_lock = threading.Lock()
+_checked_at = 0.0
+
+
+def get_bank() -> QuestionBank:
+    """Current bank; reloaded when the file's mtime changes (a bad file keeps the old bank)."""
+    global _bank, _checked_at
+    now = time.monotonic()
+    if _bank is not None and now - _checked_at < config.QUESTION_BANK_RELOAD_SECONDS:
+        return _bank
+    with _bank_lock:
+        if _bank is not None and now - _checked_at < config.QUESTION_BANK_RELOAD_SECONDS:
+            return _bank
+        _checked_at = now
+        path = config.QUESTION_BANK_PATH
+        try:
+            if _bank is None or not os.path.exists(path) or os.stat(path).st_mtime != _bank.mtime:
+                bank = load_bank(path)
+                if _bank is not None:
+                    logger.info("question bank reloaded: %d questions", len(bank))
+                _bank = bank
+        except Exception:
+            logger.exception("could not load question bank %s", path)
+            if _bank is None:
+                _bank = QuestionBank(_normalize(q, 0) for q in GENERAL_QUESTIONS + DOMAIN_QUESTION_BANK)
+        return _bank
+
+
+def seen_question_ids(user_id: Optional[str]) -> set:
+    """Ids of the questions in the user's earlier sessions (empty for anonymous users)."""
+    if not user_id:
+        return set()
+    try:
+        return session_store.user_question_ids(user_id)
+    except Exception:
+        logger.exception("could not read earlier questions for %s", user_id)
+        return set()
+
+
+def _pick(bank: QuestionBank, n: int, exclude_ids: Optional[set], **filters) -> List[dict]:
+    picked = bank.sample(n, exclude_ids=exclude_ids, **filters)
+    if len(picked) < n and exclude_ids:
+        # not enough unseen questions left: repeat some rather than return fewer
+        picked += bank.sample(n - len(picked), exclude_ids={q["id"] for q in picked}, **filters)
+    return [{k: q[k] for k in ("id", "text", "type", "domain") if q.get(k) is not None} for q in picked]
+
+
+def _ai_questions(pool_key, seeds, example_text, count):
+    """
+    AI-generated questions: drawn from the pre-generated pool when possible;
+    only a shortfall (cold or drained pool) costs a Gemini round-trip here.
+    """
+    if count <= 0:
+        return []
+    if not config.QUESTION_POOL_ENABLED or pool_key is None:
+        return generate_similar_questions(example_text, count)
+    pooled = question_pool.take(pool_key, count, seeds)
+    if len(pooled) < count:
+        pooled += generate_similar_questions(example_text, count - len(pooled))
+    return pooled
+
+
+def warm_pools():
+    """Top up the general pool and one pool per domain in the bank in the background."""
+    if not config.QUESTION_POOL_ENABLED:
+        return
+    bank = get_bank()
+    question_pool.warm("general", bank.seed_texts(type="general"))
+    for domain in bank.domains():
+        question_pool.warm(f"domain:{domain}", bank.seed_texts(domain=domain))
+
+
+def sample_general(n=3, ai_generated=2, difficulty=None, tags=None, exclude_ids=None):
     """
     Returns fixed sampled + AI-generated similar questions.
     """
-    fixed = random.sample(GENERAL_QUESTIONS, min(n, len(GENERAL_QUESTIONS)))
+    bank = get_bank()
+    fixed = _pick(bank, n, exclude_ids, type="general", difficulty=difficulty, tags=tags)
+    if not fixed and (difficulty or tags):
+        fixed = _pick(bank, n, exclude_ids, type="general")  # filters matched nothing
 
     # Prepare prompt examples
     example_text = "\n".join([q["text"] for q in fixed])
 
-    generated = generate_similar_questions(example_text, ai_generated)
+    generated = _ai_questions("general", bank.seed_texts(type="general"), example_text, ai_generated)
 
     generated_formatted = [
         {"id": f"g-ai-{i}", "text": q, "type": "general-ai"}
@@ -38,20 +319,25 @@ def sample_general(n=3, ai_generated=2):
     return fixed + generated_formatted
 
 
-def sample_domain(domain: str, n=3, ai_generated=2):
+def sample_domain(domain: str, n=3, ai_generated=2, difficulty=None, tags=None, exclude_ids=None):
     """
     Returns fixed sampled + AI-generated domain-specific questions.
     """
-    filtered = [q for q in DOMAIN_QUESTION_BANK if q["domain"] == domain]
-    if not filtered:
-        filtered = DOMAIN_QUESTION_BANK  # fallback
+    bank = get_bank()
+    known = bool(domain) and bank.count(domain=domain) > 0
+    # only known domains get a pool (domain comes straight from the request body)
+    pool_key = f"domain:{domain}" if known else None
 
-    fixed = random.sample(filtered, min(n, len(filtered)))
+    filters = {"domain": domain} if known else {"type": "domain"}  # fallback: any domain
+    fixed = _pick(bank, n, exclude_ids, difficulty=difficulty, tags=tags, **filters)
+    if not fixed and (difficulty or tags):
+        fixed = _pick(bank, n, exclude_ids, **filters)  # filters matched nothing
 
     # Example text from domain questions
     example_text = "\n".join([q["text"] for q in fixed])
 
-    generated = generate_similar_questions(example_text, ai_generated)
+    seeds = bank.seed_texts(domain=domain) if known else []
+    generated = _ai_questions(pool_key, seeds, example_text, ai_generated)
 
     generated_formatted = [
         {"id": f"{domain}-ai-{i}", "domain": domain, "text": q, "type": "domain-ai"}
@@ -59,4 +345,3 @@ def sample_domain(domain: str, n=3, ai_generated=2):
     ]
 
     return fixed + generated_formatted
-
@@ -0,0 +1,208 @@
+# backend/app/services/question_pool.py
+"""
+Pre-generated AI questions, one pool per key ("general", "domain:<name>").
+
+Session creation draws from the pool (popleft: O(1) per question, no LLM
+round-trip). When a pool drops below QUESTION_POOL_LOW_WATER a background
+refill asks Gemini for more questions similar to the pool's seed questions
+until it holds QUESTION_POOL_TARGET again. Only one refill runs per key.
+
+  - dedup: a question already in a pool (or one of its seeds) is not added twice
+  - TTL: questions older than QUESTION_POOL_TTL_HOURS are dropped when drawn
+  - persisted to QUESTION_POOL_PATH (JSON, written atomically after each
+    change), so a restart starts with the pool it left off with
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app import config
+from app.services.gemini_client import generate_similar_questions
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _norm(text: str) -> str:
+    return _WS_RE.sub(" ", text.strip().lower()).rstrip("?.! ")
+
+
+class _Pool:
+    __slots__ = ("items", "texts", "seeds", "refilling")
+
+    def __init__(self):
+        self.items: deque = deque()  # (created_at, text), oldest first
+        self.texts: set = set()  # normalized texts of items
+        self.seeds: List[str] = []
+        self.refilling = False
+
+
+_pools: Dict[str, _Pool] = {}
+_lock = threading.Lock()
+# one worker: refills are LLM-bound and rare; also serializes the file writes
+_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-pool")
+_stats = {"drawn": 0, "shortfall": 0, "expired": 0, "refills": 0, "refill_failures": 0, "duplicates": 0}
+_loaded = False
+
+
+def _ttl_seconds() -> float:
+    return config.QUESTION_POOL_TTL_HOURS * 3600.0
+
+
+def _pool(key: str) -> _Pool:
+    p = _pools.get(key)
+    if p is None:
+        p = _pools[key] = _Pool()
+    return p
+
+
+def _drop_expired(p: _Pool, now: float):
+    ttl = _ttl_seconds()
+    while p.items and now - p.items[0][0] > ttl:
+        _, text = p.items.popleft()
+        p.texts.discard(_norm(text))
+        _stats["expired"] += 1
+
+
+def take(key: str, n: int, seeds: List[str]) -> List[str]:
+    """
+    Draw up to n pooled questions for `key` (fewer if the pool is short) and
+    schedule a refill when the pool runs low. `seeds` are the fixed questions
+    the refill prompt is built from.
+    """
+    if n <= 0:
+        return []
+    _ensure_loaded()
+    now = time.time()
+    with _lock:
+        p = _pool(key)
+        if seeds:
+            p.seeds = list(seeds)
+        _drop_expired(p, now)
+        out = []
+        while p.items and len(out) < n:
+            _, text = p.items.popleft()
+            p.texts.discard(_norm(text))
+            out.append(text)
+        _stats["drawn"] += len(out)
+        _stats["shortfall"] += n - len(out)
+    if out:
+        _worker.submit(_save)
+    _maybe_refill(key)
+    return out
+
+
+def warm(key: str, seeds: List[str]):
+    """Register seeds for a key and top it up in the background (startup)."""
+    _ensure_loaded()
+    with _lock:
+        _pool(key).seeds = list(seeds)
+    _maybe_refill(key)
+
+
+def _maybe_refill(key: str):
+    with _lock:
+        p = _pool(key)
+        if p.refilling or len(p.items) >= config.QUESTION_POOL_LOW_WATER or not p.seeds:
+            return
+        p.refilling = True
+    _worker.submit(_refill, key)
+
+
+def _refill(key: str):
+    try:
+        # a bounded number of LLM calls per refill, so a model that keeps
+        # repeating itself cannot spin here
+        for _ in range(max(1, config.QUESTION_POOL_TARGET // max(1, config.QUESTION_POOL_BATCH)) + 2):
+            with _lock:
+                p = _pool(key)
+                missing = config.QUESTION_POOL_TARGET - len(p.items)
+                seeds = list(p.seeds)
+            if missing <= 0:
+                break
+            examples = random.sample(seeds, min(3, len(seeds)))
+            generated = generate_similar_questions("\n".join(examples), min(missing, config.QUESTION_POOL_BATCH),
+                                                   use_fallback=False)
+            if not generated:
+                with _lock:
+                    _stats["refill_failures"] += 1
+                break
+            now = time.time()
+            with _lock:
+                seen = {_norm(s) for s in p.seeds}
+                for text in generated:
+                    t = _norm(text)
+                    if not t or t in p.texts or t in seen:
+                        _stats["duplicates"] += 1
+                        continue
+                    p.items.append((now, text.strip()))
+                    p.texts.add(t)
+        with _lock:
+            _stats["refills"] += 1
+        _save()
+    except Exception:
+        logger.exception("question pool refill for %s failed", key)
+    finally:
+        with _lock:
+            _pool(key).refilling = False
+
+
+def _ensure_loaded():
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        _loaded = True
+        path = config.QUESTION_POOL_PATH
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            logger.warning("could not read question pool %s; starting empty", path)
+            return
+        now = time.time()
+        for key, items in (data.get("pools") or {}).items():
+            p = _pool(key)
+            for created_at, text in items:
+                t = _norm(text)
+                if now - created_at > _ttl_seconds() or t in p.texts:
+                    continue
+                p.items.append((created_at, text))
+                p.texts.add(t)
+
+
+def _save():
+    with _lock:
+        data = {"version": 1, "pools": {k: list(p.items) for k, p in _pools.items() if p.items}}
+    path = config.QUESTION_POOL_PATH
+    tmp = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except Exception:
+        logger.warning("could not write question pool %s", path)
+
+
+def stats(key: Optional[str] = None) -> dict:
+    with _lock:
+        sizes = {k: len(p.items) for k, p in _pools.items()}
+        out = dict(_stats)
+    out["sizes"] = {key: sizes.get(key, 0)} if key else sizes
+    out["target"] = config.QUESTION_POOL_TARGET
+    out["low_water"] = config.QUESTION_POOL_LOW_WATER
+    return out
@@ -0,0 +1,200 @@
+# backend/app/services/recording_pipeline.py
+"""
+Staged split -> transcribe -> analyze pipeline for full recordings.
+
+Each stage runs in its own thread and hands work to the next one through a
+small bounded queue, so chunk N is being scored while chunk N+1 is being
+transcribed and chunk N+2 is being decoded. The bounded queues keep at most
+a few decoded chunks in memory regardless of recording length.
+
+The stage threads only coordinate: callers pass transcribe_fn to route the
+Whisper call through the shared inference pool, and emotion scoring goes
+through the emotion batcher, so model concurrency stays bounded however
+many recordings are in flight.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from app.services import analysis, audio_processing
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class _StageTimer:
+    __slots__ = ("started", "finished", "busy", "items")
+
+    def __init__(self):
+        self.started = None
+        self.finished = None
+        self.busy = 0.0
+        self.items = 0
+
+    def as_dict(self, origin: float) -> dict:
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy, 4),
+            "started_at_seconds": round(self.started - origin, 4) if self.started else None,
+            "finished_at_seconds": round(self.finished - origin, 4) if self.finished else None,
+            "wall_seconds": round(self.finished - self.started, 4) if self.started and self.finished else None,
+        }
+
+
+def _put(q: queue.Queue, item, stop: threading.Event):
+    """Blocking put that gives up once another stage has failed."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def run_recording_pipeline(
+    source: Union[str, bytes],
+    chunk_seconds: int = 30,
+    queue_size: int = 2,
+    transcribe_fn: Optional[Callable] = None,
+) -> dict:
+    """
+    Run the full pipeline over `source` (file path or encoded bytes).
+    transcribe_fn(audio) -> asr dict defaults to audio_processing.transcribe_audio.
+    Returns {"chunks": [...], "aggregated": {...}, "timings": {...}}.
+    Stage failures raise RuntimeError chained from the first stage exception.
+    """
+    transcribe_chunk = transcribe_fn or audio_processing.transcribe_audio
+    to_asr: queue.Queue = queue.Queue(maxsize=queue_size)
+    to_emotion: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    chunks = []
+    raw_emotions = []
+    raw_durations = []
+    timers = {"segment": _StageTimer(), "transcribe": _StageTimer(), "analyze": _StageTimer()}
+
+    def segment():
+        t = timers["segment"]
+        t.started = time.perf_counter()
+        try:
+            it = audio_processing.iter_audio_chunks(source, chunk_seconds=chunk_seconds)
+            idx = 0
+            while True:
+                began = time.perf_counter()
+                audio = next(it, None)
+                t.busy += time.perf_counter() - began
+                if audio is None:
+                    break
+                t.items += 1
+                if not _put(to_asr, (idx, audio), stop):
+                    break
+                idx += 1
+        except Exception as e:
+            logger.exception("segment stage failed")
+            errors.append((f"segment: {e}", e))
+            stop.set()
+        finally:
+            t.finished = time.perf_counter()
+            _put(to_asr, _DONE, stop)
+
+    def transcribe():
+        t = timers["transcribe"]
+        t.started = time.perf_counter()
+        try:
+            while True:
+                item = _get(to_asr, stop)
+                if item is _DONE:
+                    break
+                idx, audio = item
+                began = time.perf_counter()
+                asr = transcribe_chunk(audio)
+                t.busy += time.perf_counter() - began
+                t.items += 1
+                if not _put(to_emotion, (idx, len(audio) / audio_processing.SAMPLE_RATE, asr), stop):
+                    break
+        except Exception as e:
+            logger.exception("transcribe stage failed")
+            errors.append((f"transcribe: {e}", e))
+            stop.set()
+        finally:
+            t.finished = time.perf_counter()
+            _put(to_emotion, _DONE, stop)
+
+    def analyze():
+        t = timers["analyze"]
+        t.started = time.perf_counter()
+        try:
+            while True:
+                item = _get(to_emotion, stop)
+                if item is _DONE:
+                    break
+                idx, duration, asr = item
+                text = asr["text"]
+                began = time.perf_counter()
+                # chunks the VAD gate found silent skip the emotion model
+                scored = analysis.analyze_emotions([text]) if not asr["vad_skipped"] else []
+                t.busy += time.perf_counter() - began
+                t.items += 1
+                emotions = {}
+                if scored:
+                    raw_emotions.append(scored[0])
+                    raw_durations.append(duration)
+                    emotions = {e["label"]: float(e["score"]) for e in scored[0]}
+                chunks.append({
+                    "chunk_index": idx,
+                    "start_seconds": idx * chunk_seconds,
+                    "duration_seconds": round(duration, 3),
+                    "transcript": text,
+                    "emotions": emotions,
+                    "speech_ratio": asr["speech_ratio"],
+                    "clarity_score": analysis.estimate_clarity(text),
+                    "confidence_score": analysis.estimate_confidence(emotions),
+                })
+        except Exception as e:
+            logger.exception("analyze stage failed")
+            errors.append((f"analyze: {e}", e))
+            stop.set()
+        finally:
+            t.finished = time.perf_counter()
+
+    origin = time.perf_counter()
+    threads = [
+        threading.Thread(target=fn, name=f"recording-{name}", daemon=True)
+        for name, fn in (("segment", segment), ("transcribe", transcribe), ("analyze", analyze))
+    ]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    total = time.perf_counter() - origin
+
+    if errors:
+        raise RuntimeError("; ".join(msg for msg, _ in errors)) from errors[0][1]
+
+    chunks.sort(key=lambda c: c["chunk_index"])
+    n = len(chunks)
+    aggregated = {
+        "num_chunks": n,
+        "transcript": " ".join(c["transcript"] for c in chunks if c["transcript"]).strip(),
+        "avg_clarity": (sum(c["clarity_score"] for c in chunks) / n) if n else None,
+        "avg_confidence": (sum(c["confidence_score"] for c in chunks) / n) if n else None,
+        # duration-weighted: a short trailing chunk counts less than a full one
+        "avg_emotions": analysis.aggregate_emotions(raw_emotions, raw_durations) if raw_emotions else {},
+    }
+    timings = {name: t.as_dict(origin) for name, t in timers.items()}
+    timings["total_wall_seconds"] = round(total, 4)
+    return {"chunks": chunks, "aggregated": aggregated, "timings": timings}
@@ -0,0 +1,232 @@
+# backend/app/services/resume_ingest.py
+"""
+Background text extraction for uploaded resumes.
+
+/files/upload hands PDF / DOCX / TXT / MD uploads to submit(): a worker
+thread extracts the text (pypdf for PDF, zipfile + XML for
+DOCX, plain decode for text), runs the skill matcher once and caches
+{text, skills, skill_counts} keyed by the upload's sha256 — in memory and
+under DATA_DIR/cache/resume, so re-uploading the same file (or restarting
+the server) costs nothing. GET /files/resumes/{sha256} reports the status.
+
+POST /sessions with resume_file_path then only looks the result up (or
+waits briefly for an extraction that is still running); no parsing
+happens on the request path.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+from xml.etree import ElementTree
+
+from app import config
+from app.services.inference_cache import TieredCache, content_key
+from app.services.resume_parser import match_skills
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".md"}
+# bump when extraction changes, so cached texts are re-extracted
+EXTRACTOR_VERSION = "resume-extract-v1"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# extracted text + skills per upload, keyed by content_key(sha256, EXTRACTOR_VERSION)
+resume_cache = TieredCache(
+    "resume",
+    max_entries=config.RESUME_CACHE_ENTRIES,
+    disk_dir=os.path.join(config.DATA_DIR, "cache", "resume"),
+    disk_max_bytes=config.RESUME_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
+
+_worker = ThreadPoolExecutor(max_workers=max(1, config.RESUME_INGEST_WORKERS), thread_name_prefix="resume-ingest")
+_lock = threading.Lock()
+# sha256 -> status dict for uploads seen by this process (text lives in resume_cache)
+_STATUS: Dict[str, dict] = {}
+_FUTURES: Dict[str, Future] = {}
+# absolute upload path -> sha256
+_PATHS: Dict[str, str] = {}
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+# -------------------------
+# Extractors
+# -------------------------
+def _extract_pdf(path: str) -> str:
+    try:
+        from pypdf import PdfReader  # imported on first PDF only
+    except ImportError:
+        raise RuntimeError("PDF extraction needs the 'pypdf' package (pip install -r requirments.txt)")
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx(path: str) -> str:
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo("word/document.xml")
+        if info.file_size > config.RESUME_MAX_XML_BYTES:
+            raise RuntimeError("document.xml is too large")
+        root = ElementTree.fromstring(zf.read(info))
+    paragraphs = []
+    for p in root.iter(f"{_W}p"):
+        parts = []
+        for el in p.iter():
+            if el.tag == f"{_W}t" and el.text:
+                parts.append(el.text)
+            elif el.tag == f"{_W}tab":
+                parts.append("\t")
+            elif el.tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def _extract_plain(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read(config.RESUME_MAX_CHARS * 4).decode("utf-8", errors="ignore")
+
+
+_EXTRACTORS = {".pdf": _extract_pdf, ".docx": _extract_docx, ".txt": _extract_plain, ".md": _extract_plain}
+
+
+def extract_text(path: str) -> str:
+    """Plain text of a PDF / DOCX / TXT / MD file (whitespace-normalized, capped at RESUME_MAX_CHARS)."""
+    ext = os.path.splitext(path)[1].lower()
+    extractor = _EXTRACTORS.get(ext)
+    if extractor is None:
+        raise ValueError(f"unsupported resume type: {ext or 'no extension'}")
+    text = extractor(path)
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)[:config.RESUME_MAX_CHARS]
+
+
+# -------------------------
+# Background ingestion
+# -------------------------
+def _cache_key(sha256: str) -> str:
+    return content_key(sha256, EXTRACTOR_VERSION)
+
+
+def _run(sha256: str, path: str):
+    with _lock:
+        _STATUS[sha256]["status"] = "running"
+    try:
+        text = extract_text(path)
+        matches = match_skills(text)
+        skills = sorted(matches, key=lambda s: (-matches[s]["count"], matches[s]["positions"][0][0]))
+        record = {
+            "sha256": sha256,
+            "text": text,
+            "skills": skills,
+            "skill_counts": {s: matches[s]["count"] for s in skills},
+            "chars": len(text),
+            "extracted_at": _now(),
+        }
+        resume_cache.put(_cache_key(sha256), record)
+        with _lock:
+            _STATUS[sha256].update(status="done", chars=len(text), skills=skills, finished_at=record["extracted_at"])
+        return record
+    except Exception as e:
+        logger.warning("resume extraction failed for %s: %s", path, e)
+        with _lock:
+            _STATUS[sha256].update(status="failed", error=str(e), finished_at=_now())
+        return None
+    finally:
+        with _lock:
+            _FUTURES.pop(sha256, None)
+
+
+def submit(path: str, sha256: str) -> dict:
+    """Queue text extraction for an uploaded file (no-op if already cached or running). Returns its status."""
+    path = os.path.abspath(path)
+    with _lock:
+        _PATHS[path] = sha256
+        status = _STATUS.get(sha256)
+        if status and status["status"] in ("queued", "running", "done"):
+            return dict(status)
+    cached = resume_cache.get(_cache_key(sha256))
+    with _lock:
+        if cached is not None:
+            status = _STATUS[sha256] = {"sha256": sha256, "status": "done", "chars": cached["chars"],
+                                        "skills": cached["skills"], "finished_at": cached["extracted_at"]}
+            return dict(status)
+        status = _STATUS[sha256] = {"sha256": sha256, "status": "queued", "queued_at": _now()}
+        _FUTURES[sha256] = _worker.submit(_run, sha256, path)
+        return dict(status)
+
+
+def get_status(sha256: str) -> Optional[dict]:
+    with _lock:
+        status = _STATUS.get(sha256)
+        if status:
+            return dict(status)
+    cached = resume_cache.get(_cache_key(sha256))
+    if cached is None:
+        return None
+    return {"sha256": sha256, "status": "done", "chars": cached["chars"], "skills": cached["skills"],
+            "finished_at": cached["extracted_at"]}
+
+
+def get_result(sha256: str) -> Optional[dict]:
+    """Cached {text, skills, skill_counts, ...} for an upload, or None."""
+    return resume_cache.get(_cache_key(sha256))
+
+
+def resolve_upload_path(resume_file_path: str) -> Optional[str]:
+    """Map a file_url ("/uploads/x.pdf"), file name or path to the file under UPLOADS_DIR (nothing outside it)."""
+    name = os.path.basename((resume_file_path or "").replace("\\", "/"))
+    if not name:
+        return None
+    path = os.path.abspath(os.path.join(config.UPLOADS_DIR, name))
+    return path if os.path.isfile(path) else None
+
+
+def resume_for_path(resume_file_path: str, wait: Optional[float] = None) -> Optional[dict]:
+    """
+    Extracted resume for an uploaded file: served from the cache; if the
+    extraction is still running (or the file was never submitted, e.g.
+    after a restart), waits up to `wait` seconds for the background worker.
+    """
+    path = resolve_upload_path(resume_file_path)
+    if path is None:
+        return None
+    with _lock:
+        sha256 = _PATHS.get(path)
+    if sha256 is None:
+        try:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for piece in iter(lambda: f.read(config.UPLOAD_PIECE_BYTES), b""):
+                    digest.update(piece)
+            sha256 = digest.hexdigest()
+        except OSError:
+            return None
+    record = get_result(sha256)
+    if record is not None:
+        return record
+    submit(path, sha256)
+    with _lock:
+        future = _FUTURES.get(sha256)
+    if future is None:
+        return get_result(sha256)
+    try:
+        return future.result(timeout=config.RESUME_INGEST_WAIT_SECONDS if wait is None else wait)
+    except Exception:
+        logger.info("resume %s not extracted in time; continuing without it", sha256[:12])
+        return None
+
+
+def stats() -> dict:
+    with _lock:
+        counts: Dict[str, int] = {}
+        for status in _STATUS.values():
+            counts[status["status"]] = counts.get(status["status"], 0) + 1
+    return {"jobs": counts, "cache": resume_cache.stats()}
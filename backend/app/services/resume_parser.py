@@ -2,14 +2,18 @@
 import os
 import re
 import json
-import requests
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 
-# local skill list — extend to improve matching
-SKILL_KEYWORDS = [
-    "python", "java", "c++", "pytorch", "tensorflow", "sklearn", "react", "node", "docker",
-    "kubernetes", "nlp", "transformers", "sql", "postgres", "aws", "gcp", "azure"
-]
+from app import config
+from app.services import llm_client, skill_matcher
+from app.services.inference_cache import TieredCache, content_key
+
+# built-in skill names — extend the taxonomy (SKILL_TAXONOMY_PATH) to improve matching
+SKILL_KEYWORDS = list(skill_matcher.BUILTIN_TAXONOMY)
 
 # env-driven AI endpoint + key (optional)
 GOOGLE_API_URL = os.environ.get("GOOGLE_AI_API_URL")
@@ -17,15 +21,53 @@ GOOGLE_API_KEY = os.environ.get("GOOGLE_AI_API_KEY")
 # Some setups expect Bearer auth, others x-api-key. Use BEARER if set to "1"
 USE_BEARER = os.environ.get("GOOGLE_AI_USE_BEARER", "1") == "1"
 
+# pooled client with deadline / retries / circuit breaker (see llm_client)
+_client = llm_client.client("google_ai")
+
+# bump when the prompt or parsing below changes, so cached questions are regenerated
+PROMPT_VERSION = "resume-questions-v1"
+
+# LLM questions keyed by (normalized resume hash, domain, max_questions, PROMPT_VERSION);
+# skills keyed by (normalized resume hash, taxonomy identity)
+question_cache = TieredCache(
+    "resume_questions",
+    max_entries=config.RESUME_QUESTION_CACHE_ENTRIES,
+    disk_dir=os.path.join(config.DATA_DIR, "cache", "resume_questions"),
+    disk_max_bytes=config.RESUME_QUESTION_CACHE_DISK_MB * 1024 * 1024,
+)
+skills_cache = TieredCache(
+    "skills",
+    max_entries=config.SKILL_CACHE_ENTRIES,
+    disk_dir=os.path.join(config.DATA_DIR, "cache", "skills"),
+    disk_max_bytes=config.SKILL_CACHE_DISK_MB * 1024 * 1024,
+)
+# stale entries are regenerated here while the cached questions are served
+_refresh_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-refresh")
+_refreshing = set()
+_refresh_lock = threading.Lock()
+_refresh_stats = {"served_stale": 0, "refreshed": 0, "expired": 0}
+
+
+def resume_hash(resume_text: str) -> str:
+    """sha256 of the resume with case and whitespace normalized (re-pasted resumes hash the same)."""
+    return hashlib.sha256(" ".join((resume_text or "").lower().split()).encode("utf-8")).hexdigest()
+
 
 def extract_skills(resume_text: str) -> List[str]:
-    """Very simple keyword matching for skills from resume text."""
-    txt = resume_text.lower()
-    found = []
-    for skill in SKILL_KEYWORDS:
-        if re.search(r"\b" + re.escape(skill.lower()) + r"\b", txt):
-            found.append(skill)
-    return found
+    """Canonical skills mentioned in the resume (aliases included), most mentioned first. Memoized."""
+    matcher = skill_matcher.get_matcher()
+    key = content_key(resume_hash(resume_text), matcher.identity)
+    cached = skills_cache.get(key)
+    if cached is not None:
+        return list(cached)
+    skills = matcher.extract(resume_text or "")
+    skills_cache.put(key, skills)
+    return list(skills)
+
+
+def match_skills(resume_text: str) -> Dict[str, dict]:
+    """Like extract_skills, with match counts and (start, end) positions per skill."""
+    return skill_matcher.get_matcher().match(resume_text or "")
 
 
 def _call_google_api(prompt: str, max_tokens: int = 300) -> Optional[str]:
@@ -50,10 +92,11 @@ def _call_google_api(prompt: str, max_tokens: int = 300) -> Optional[str]:
         # NOTE: specific param names vary between Google endpoints; adjust if necessary.
     }
 
+    data = _client.post_json(GOOGLE_API_URL, payload, headers=headers)
+    if data is None:
+        # failed, timed out or short-circuited by the breaker; fallback will be used
+        return None
     try:
-        resp = requests.post(GOOGLE_API_URL, headers=headers, json=payload, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
         # Response shape varies by API. Attempt common fields:
         # - data["candidates"][0]["output"]  (some GA APIs)
         # - data["output"] or data["generated_text"]
@@ -77,51 +120,116 @@ def _call_google_api(prompt: str, max_tokens: int = 300) -> Optional[str]:
         return json.dumps(data)
     except Exception as e:
         # Log or print — but don't crash; fallback will be used
-        print("Google AI call failed:", e)
+        print("Google AI response parsing failed:", e)
         return None
 
 
-def generate_resume_questions(resume_text: str, domain: str = None, max_questions: int = 3) -> List[Dict]:
+def _llm_questions(resume_text: str, domain: Optional[str], max_questions: int) -> Optional[List[Dict]]:
+    """One LLM round-trip; None if the call failed or returned nothing usable."""
+    prompt = (
+        "You are an interview question generator. Given the resume text and domain, "
+        "produce up to {n} focused interview questions that probe the candidate's "
+        "projects, skills, and depth of understanding. Return results as JSON array with fields "
+        "'id' (short), 'text'.\n\n"
+        "Domain: {domain}\n\nResume:\n{resume}\n\n"
+        "Output only valid JSON array."
+    ).format(n=max_questions, domain=(domain or "general"), resume=resume_text)
+
+    ai_out = _call_google_api(prompt)
+    if ai_out:
+        # Try to parse JSON from the output
+        try:
+            parsed = json.loads(ai_out)
+            # normalize results
+            out = []
+            for i, item in enumerate(parsed[:max_questions]):
+                if isinstance(item, str):
+                    out.append({"id": f"r-{i}", "text": item, "type": "resume"})
+                elif isinstance(item, dict) and "text" in item:
+                    out.append({"id": item.get("id", f"r-{i}"), "text": item["text"], "type": "resume"})
+            if out:
+                return out
+        except Exception as e:
+            # If JSON parsing failed, but we got a plain string with lines, convert lines to questions
+            lines = [l.strip("- \n") for l in (ai_out or "").splitlines() if l.strip()]
+            if lines:
+                out = []
+                for i, l in enumerate(lines[:max_questions]):
+                    out.append({"id": f"r-{i}", "text": l, "type": "resume"})
+                return out
+    return None
+
+
+def _question_key(resume_text: str, domain: Optional[str], max_questions: int) -> str:
+    return content_key(resume_hash(resume_text), f"{(domain or 'general').lower()}\0{max_questions}\0{PROMPT_VERSION}")
+
+
+def _refresh(key: str, resume_text: str, domain: Optional[str], max_questions: int):
+    try:
+        out = _llm_questions(resume_text, domain, max_questions)
+        if out:
+            question_cache.put(key, {"questions": out, "created_at": time.time()})
+            with _refresh_lock:
+                _refresh_stats["refreshed"] += 1
+    except Exception as e:
+        print("Resume question refresh failed:", e)
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def _cached_llm_questions(resume_text: str, domain: Optional[str], max_questions: int) -> Optional[List[Dict]]:
+    """
+    LLM questions for this resume/domain, memoized:
+      - younger than RESUME_QUESTION_REFRESH_HOURS: served from the cache
+      - older: still served, and regenerated in the background (fresh variants next time)
+      - older than RESUME_QUESTION_TTL_HOURS: regenerated before returning
+    Only LLM output is cached; the templated fallback is cheap and never stored.
+    """
+    key = _question_key(resume_text, domain, max_questions)
+    entry = question_cache.get(key)
+    if entry is not None:
+        age = time.time() - entry.get("created_at", 0)
+        if age <= config.RESUME_QUESTION_TTL_HOURS * 3600:
+            if age > config.RESUME_QUESTION_REFRESH_HOURS * 3600:
+                with _refresh_lock:
+                    _refresh_stats["served_stale"] += 1
+                    start = key not in _refreshing
+                    _refreshing.add(key)
+                if start:
+                    _refresh_pool.submit(_refresh, key, resume_text, domain, max_questions)
+            return [dict(q) for q in entry["questions"]]
+        with _refresh_lock:
+            _refresh_stats["expired"] += 1
+
+    out = _llm_questions(resume_text, domain, max_questions)
+    if out:
+        question_cache.put(key, {"questions": out, "created_at": time.time()})
+    return out
+
+
+def cache_stats() -> dict:
+    with _refresh_lock:
+        refresh = dict(_refresh_stats, in_flight=len(_refreshing))
+    return {"questions": question_cache.stats(), "skills": skills_cache.stats(), "refresh": refresh}
+
+
+def generate_resume_questions(resume_text: str, domain: str = None, max_questions: int = 3, use_llm: bool = True,
+                              skills: Optional[List[str]] = None) -> List[Dict]:
     """
     Returns a list of question dicts based on the resume content.
-    Attempts to use Google AI Studio if config exists; otherwise uses templates.
+    Attempts to use Google AI Studio if config exists (and use_llm); otherwise uses templates.
+    `skills` (e.g. from resume_ingest's cache) skips skill extraction.
     """
     resume_text = (resume_text or "").strip()
-    skills = extract_skills(resume_text)
+    if skills is None:
+        skills = extract_skills(resume_text)
 
     # Try LLM-based generation if KEY and URL provided
-    if GOOGLE_API_KEY and GOOGLE_API_URL and resume_text:
-        prompt = (
-            "You are an interview question generator. Given the resume text and domain, "
-            "produce up to {n} focused interview questions that probe the candidate's "
-            "projects, skills, and depth of understanding. Return results as JSON array with fields "
-            "'id' (short), 'text'.\n\n"
-            "Domain: {domain}\n\nResume:\n{resume}\n\n"
-            "Output only valid JSON array."
-        ).format(n=max_questions, domain=(domain or "general"), resume=resume_text)
-
-        ai_out = _call_google_api(prompt)
-        if ai_out:
-            # Try to parse JSON from the output
-            try:
-                parsed = json.loads(ai_out)
-                # normalize results
-                out = []
-                for i, item in enumerate(parsed[:max_questions]):
-                    if isinstance(item, str):
-                        out.append({"id": f"r-{i}", "text": item, "type": "resume"})
-                    elif isinstance(item, dict) and "text" in item:
-                        out.append({"id": item.get("id", f"r-{i}"), "text": item["text"], "type": "resume"})
-                if out:
-                    return out
-            except Exception as e:
-                # If JSON parsing failed, but we got a plain string with lines, convert lines to questions
-                lines = [l.strip("- \n") for l in (ai_out or "").splitlines() if l.strip()]
-                if lines:
-                    out = []
-                    for i, l in enumerate(lines[:max_questions]):
-                        out.append({"id": f"r-{i}", "text": l, "type": "resume"})
-                    return out
+    if use_llm and GOOGLE_API_KEY and GOOGLE_API_URL and resume_text:
+        out = _cached_llm_questions(resume_text, domain, max_questions)
+        if out:
+            return out
 
     # Fallback heuristics: generate templated questions from skills / simple templates
     out = []
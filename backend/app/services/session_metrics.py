@@ -0,0 +1,313 @@
+# backend/app/services/session_metrics.py
+"""
+Incremental per-question aggregation of chunk feedback.
+
+session_store keeps one running accumulator per (session, question) and
+folds every chunk into it in O(1) when the chunk is stored. Completing a
+session (or peeking at it live) is then just finalize(), which is
+O(questions) no matter how many chunks were uploaded.
+
+Emotion scores are float32 vectors over emotion_matrix.LABELS: the
+accumulator holds their running (and duration-weighted) sums, and stored
+chunks (session_models.ChunkFeedback) keep the vector instead of a
+per-label dict.
+
+For the per-label percentiles the accumulator also keeps a bounded sample
+of the vectors (SESSION_PERCENTILE_SAMPLES): the chunks whose hashed
+chunk_index ranks lowest. The choice doesn't depend on upload order, and a
+re-uploaded chunk (same index) takes exactly its predecessor's place, so
+the sample stays uniform under replacement and completion never needs the
+stored chunks.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app import config
+from app.services import emotion_matrix
+from app.services.session_models import ChunkFeedback
+
+FILLER_WORDS = {"um", "uh", "like", "you know", "so", "actually", "basically", "right", "okay", "ok"}
+
+
+# -------------------------
+# Per-chunk heuristics
+# -------------------------
+def _words_and_filler_stats(text: str):
+    if not text:
+        return {"words": 0, "filler_count": 0, "filler_ratio": 0.0}
+    words = re.findall(r"\w+", text.lower())
+    total = len(words)
+    filler_count = sum(1 for w in words if w in FILLER_WORDS)
+    filler_ratio = (filler_count / total) if total > 0 else 0.0
+    return {"words": total, "filler_count": filler_count, "filler_ratio": filler_ratio}
+
+
+def _estimate_clarity_from_transcript(transcript: str) -> float:
+    """Estimate clarity 0..1 based on filler_ratio (simple heuristic)."""
+    stats = _words_and_filler_stats(transcript)
+    filler = stats["filler_ratio"]
+    # heuristic: clarity declines with filler. clamp to [0,1]
+    clarity = max(0.0, min(1.0, 1.0 - (filler * 2.0)))
+    return clarity
+
+
+def _estimate_confidence_from_emotions(emotions: Dict[str, float]) -> Optional[float]:
+    """
+    Estimate confidence from emotion scores (if available).
+    Uses 'joy' and 'neutral' positively, and 'sadness'/'fear'/'anger' negatively.
+    Returns 0..1 or None if not computable.
+    """
+    if not emotions or not isinstance(emotions, dict):
+        return None
+    joy = emotions.get("joy", 0.0)
+    neutral = emotions.get("neutral", 0.0)
+    sadness = emotions.get("sadness", 0.0)
+    fear = emotions.get("fear", 0.0)
+    anger = emotions.get("anger", 0.0)
+    positive = joy + neutral
+    negative = sadness + fear + anger
+    raw = positive - negative
+    conf = max(0.0, min(1.0, (raw + 1.0) / 2.0))
+    return conf
+
+
+def chunk_metrics(chunk) -> dict:
+    """
+    Clarity, confidence, emotion vector (float32, emotion_matrix.LABELS
+    order, or None) and duration weight contributed by one stored chunk
+    (a ChunkFeedback record, or a chunk dict in the route/stored shape).
+    """
+    if not isinstance(chunk, ChunkFeedback):
+        chunk = ChunkFeedback.from_dict(chunk)
+
+    # clarity: use provided score, else estimate
+    if isinstance(chunk.clarity_score, (int, float)):
+        clarity = float(chunk.clarity_score)
+    else:
+        clarity = _estimate_clarity_from_transcript(chunk.transcript)
+
+    vec = chunk.emotion_scores
+
+    # confidence: use provided, else estimate from emotions or fallback to neutral
+    if isinstance(chunk.confidence_score, (int, float)):
+        conf = float(chunk.confidence_score)
+    else:
+        conf = _estimate_confidence_from_emotions(emotion_matrix.to_dict(vec))
+        if conf is None:
+            conf = 0.5
+
+    return {
+        "chunk_index": chunk.chunk_index,
+        "clarity": clarity,
+        "confidence": conf,
+        "emotions": vec,
+        "duration": _chunk_duration(chunk),
+    }
+
+
+def _chunk_duration(chunk: ChunkFeedback) -> float:
+    """Chunk length in seconds from its start/end times (ms); 1.0 when unknown, i.e. unweighted."""
+    start, end = chunk.chunk_start_time, chunk.chunk_end_time
+    if isinstance(start, (int, float)) and isinstance(end, (int, float)) and end > start:
+        return (end - start) / 1000.0
+    return 1.0
+
+
+# -------------------------
+# Running accumulators
+# -------------------------
+def new_accumulator() -> dict:
+    # plain lists so the accumulator stays JSON-serializable for the sqlite backend
+    return {
+        "chunks": 0,
+        "clarity_sum": 0.0,
+        "confidence_sum": 0.0,
+        "emotion_chunks": 0,                        # chunks that carried emotion scores
+        "emotion_sum": [0.0] * emotion_matrix.NUM_LABELS,
+        "emotion_weighted_sum": [0.0] * emotion_matrix.NUM_LABELS,  # Σ duration · scores
+        "duration_sum": 0.0,                        # Σ duration over those chunks
+        "samples": [],                              # [[rank, chunk_index, [scores]]], see _sample
+    }
+
+
+def _upgrade(acc: dict) -> dict:
+    """Convert an accumulator written with per-label dicts to the vector layout."""
+    if "emotion_sum" in acc:
+        return acc
+    sums = acc.pop("emotion_sums", {}) or {}
+    counts = acc.pop("emotion_counts", {}) or {}
+    vec = emotion_matrix.to_vector(sums)
+    n = max(counts.values()) if counts else 0
+    acc["emotion_chunks"] = n
+    acc["emotion_sum"] = vec.astype(float).tolist() if vec is not None else [0.0] * emotion_matrix.NUM_LABELS
+    acc["emotion_weighted_sum"] = list(acc["emotion_sum"])
+    acc["duration_sum"] = float(n)
+    return acc
+
+
+def _rank(chunk_index: int) -> int:
+    # Knuth multiplicative hash: spreads consecutive indexes over 32 bits
+    return (int(chunk_index) * 2654435761) % (1 << 32)
+
+
+def _sample(acc: dict, chunk_index: int, vec: np.ndarray, sign: int):
+    """Keep the SESSION_PERCENTILE_SAMPLES lowest-ranked chunks' vectors (bottom-k by _rank)."""
+    samples = acc["samples"]
+    if sign < 0:
+        acc["samples"] = [s for s in samples if s[1] != chunk_index]
+        return
+    rank = _rank(chunk_index)
+    entry = [rank, chunk_index, [round(float(x), 5) for x in vec]]
+    if len(samples) < max(0, config.SESSION_PERCENTILE_SAMPLES):
+        samples.append(entry)
+        return
+    worst = max(range(len(samples)), key=lambda i: samples[i][0]) if samples else None
+    if worst is not None and rank < samples[worst][0]:
+        samples[worst] = entry
+
+
+def apply(acc: dict, metrics: dict, sign: int = 1) -> dict:
+    """
+    Fold one chunk's metrics into acc in O(1) (sign=-1 removes a chunk,
+    used when a re-uploaded chunk replaces an earlier one).
+    """
+    _upgrade(acc)
+    acc["chunks"] += sign
+    acc["clarity_sum"] += sign * metrics["clarity"]
+    acc["confidence_sum"] += sign * metrics["confidence"]
+    vec = metrics["emotions"]
+    if vec is not None:
+        scores = vec.astype(np.float64)
+        weight = metrics["duration"]
+        acc["emotion_chunks"] += sign
+        acc["emotion_sum"] = (np.asarray(acc["emotion_sum"]) + sign * scores).tolist()
+        acc["emotion_weighted_sum"] = (np.asarray(acc["emotion_weighted_sum"]) + (sign * weight) * scores).tolist()
+        acc["duration_sum"] += sign * weight
+        # accumulators written before sampling existed have no "samples"
+        # and keep using the stored chunks for percentiles
+        if "samples" in acc:
+            _sample(acc, metrics.get("chunk_index") or 0, vec, sign)
+    return acc
+
+
+# -------------------------
+# Finalize
+# -------------------------
+def _acc_emotions(acc: dict):
+    """(mean vector, duration-weighted mean vector) from an accumulator, or (None, None)."""
+    n = acc["emotion_chunks"]
+    if n <= 0:
+        return None, None
+    avg = np.asarray(acc["emotion_sum"], dtype=np.float64) / n
+    weighted = avg
+    if acc["duration_sum"] > 0:
+        weighted = np.asarray(acc["emotion_weighted_sum"], dtype=np.float64) / acc["duration_sum"]
+    return avg.astype(np.float32), weighted.astype(np.float32)
+
+
+def needs_chunks(stats: Dict[str, dict]) -> bool:
+    """True if some accumulator predates the percentile sample and finalize() needs the stored chunks."""
+    return any(acc.get("emotion_chunks") and "samples" not in acc for acc in stats.values())
+
+
+def finalize_question(question_id: str, acc: dict, chunks: Optional[List[ChunkFeedback]] = None) -> dict:
+    """
+    Report for one question from its accumulator, with per-label
+    percentiles over its sampled score vectors (or, for an accumulator
+    without a sample, over the question's stored chunks when given).
+    """
+    _upgrade(acc)
+    n = acc["chunks"]
+    avg_clarity = (acc["clarity_sum"] / n) if n else None
+    avg_confidence = (acc["confidence_sum"] / n) if n else None
+    avg_vec, weighted_vec = _acc_emotions(acc)
+    avg_emotions = emotion_matrix.to_dict(avg_vec)
+
+    # question performance metric (0..100)
+    question_performance = round(avg_clarity * 100) if avg_clarity is not None else None
+
+    # recommendations
+    recs = []
+    if avg_clarity is not None and avg_clarity < 0.6:
+        recs.append("Reduce filler words and pause to form clearer sentences.")
+    if avg_confidence is not None and avg_confidence < 0.6:
+        recs.append("Practice speaking with more confidence — mock interviews help.")
+    if avg_emotions:
+        if avg_emotions.get("sadness", 0) > 0.4 or avg_emotions.get("fear", 0) > 0.4:
+            recs.append("Try to convey more positive energy — highlight accomplishments.")
+        if avg_emotions.get("joy", 0) > 0.6:
+            recs.append("Good expressiveness — maintain this energy.")
+
+    report = {
+        "question_id": question_id,
+        "chunk_count": n,
+        "avg_clarity": avg_clarity,
+        "avg_confidence": avg_confidence,
+        "avg_emotions": avg_emotions,
+        "weighted_avg_emotions": emotion_matrix.to_dict(weighted_vec),
+        "top_emotions": emotion_matrix.top_k(weighted_vec),
+        "question_performance": question_performance,
+        "recommendations": recs,
+    }
+    if acc.get("samples"):
+        matrix = np.asarray([s[2] for s in acc["samples"]], dtype=np.float32)
+        report["emotion_percentiles"] = emotion_matrix.percentiles(matrix)
+    elif chunks and "samples" not in acc:
+        matrix = emotion_matrix.stack(c.emotion_scores for c in chunks)
+        report["emotion_percentiles"] = emotion_matrix.percentiles(matrix)
+    return report
+
+
+def finalize(session_id: str, stats: Dict[str, dict], chunks: Optional[Dict[str, List[ChunkFeedback]]] = None) -> Dict[str, Any]:
+    """
+    Build the aggregated session report from per-question accumulators.
+    O(questions): percentiles come from the accumulators' samples. chunks
+    ({question_id: [ChunkFeedback]}, i.e. Session.chunks) is only needed for
+    accumulators written before sampling existed (see needs_chunks).
+    """
+    question_reports: Dict[str, Any] = {}
+    overall_clarity_acc = 0.0
+    overall_confidence_acc = 0.0
+    clarity_count = 0
+    confidence_count = 0
+    emotion_total = np.zeros(emotion_matrix.NUM_LABELS, dtype=np.float64)
+    emotion_chunks = 0
+
+    for qid, acc in stats.items():
+        if not acc.get("chunks"):
+            continue
+        qr = question_reports[qid] = finalize_question(qid, acc, (chunks or {}).get(qid))
+        if qr["avg_clarity"] is not None:
+            overall_clarity_acc += qr["avg_clarity"]
+            clarity_count += 1
+        if qr["avg_confidence"] is not None:
+            overall_confidence_acc += qr["avg_confidence"]
+            confidence_count += 1
+        if acc["emotion_chunks"] > 0:
+            emotion_total += np.asarray(acc["emotion_sum"], dtype=np.float64)
+            emotion_chunks += acc["emotion_chunks"]
+
+    # Collect unique recommendations
+    seen = set()
+    uniq_recs = []
+    for qr in question_reports.values():
+        for r in qr["recommendations"]:
+            if r not in seen:
+                seen.add(r)
+                uniq_recs.append(r)
+
+    overall_vec = (emotion_total / emotion_chunks).astype(np.float32) if emotion_chunks else None
+    return {
+        "session_id": session_id,
+        "questions": question_reports,
+        "overall": {
+            "avg_clarity": (overall_clarity_acc / clarity_count) if clarity_count else None,
+            "avg_confidence": (overall_confidence_acc / confidence_count) if confidence_count else None,
+            "avg_emotions": emotion_matrix.to_dict(overall_vec),
+            "top_emotions": emotion_matrix.top_k(overall_vec),
+            "recommendations": uniq_recs,
+        },
+    }
@@ -0,0 +1,165 @@
+# backend/app/services/session_models.py
+"""
+Slotted records for sessions, their questions and chunk feedback, plus
+the JSON serializer the session routes and the sqlite store use.
+
+Records have fixed fields (no per-instance __dict__) and keep each chunk's
+emotions as a float32 vector over emotion_matrix.LABELS, so a long-running
+server holds far less per session than the nested dicts did. to_dict() /
+from_dict() convert at the edges, and the shape is not the old one: a
+chunk's feedback carries "emotion_scores" (a list in emotion_matrix.LABELS
+order) instead of an "emotions" {label: score} dict, and only the fields
+declared on ChunkFeedback are kept; any other key posted in a chunk's
+feedback is dropped by from_dict().
+
+dumps() uses orjson when installed (numpy arrays serialized natively) and
+falls back to the json module.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services import emotion_matrix
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class Question:
+    __slots__ = ("id", "text", "type", "domain")
+
+    def __init__(self, id: str, text: Optional[str] = None, type: str = "domain", domain: Optional[str] = None):
+        self.id = id
+        self.text = text
+        self.type = type
+        self.domain = domain
+
+    @classmethod
+    def from_dict(cls, q: dict) -> "Question":
+        return cls(str(q.get("id")), q.get("text"), q.get("type", "domain"), q.get("domain"))
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "text": self.text, "type": self.type, "domain": self.domain}
+
+
+class ChunkFeedback:
+    __slots__ = ("chunk_index", "chunk_start_time", "chunk_end_time", "transcript", "clarity_score",
+                 "confidence_score", "emotion_scores", "speech_ratio", "audio_path", "processed_at", "saved_at")
+
+    def __init__(self, chunk_index: int = 0, chunk_start_time: Optional[int] = None, chunk_end_time: Optional[int] = None,
+                 transcript: str = "", clarity_score: Optional[float] = None, confidence_score: Optional[float] = None,
+                 emotion_scores: Optional[np.ndarray] = None, speech_ratio: Optional[float] = None,
+                 audio_path: Optional[str] = None, processed_at: Optional[str] = None, saved_at: Optional[str] = None):
+        self.chunk_index = chunk_index
+        self.chunk_start_time = chunk_start_time
+        self.chunk_end_time = chunk_end_time
+        self.transcript = transcript
+        self.clarity_score = clarity_score
+        self.confidence_score = confidence_score
+        self.emotion_scores = emotion_scores  # float32[NUM_LABELS] or None
+        self.speech_ratio = speech_ratio
+        self.audio_path = audio_path
+        self.processed_at = processed_at
+        self.saved_at = saved_at
+
+    @classmethod
+    def from_dict(cls, chunk: dict) -> "ChunkFeedback":
+        """
+        From the route-level chunk dict ({..., "feedback": {..., "emotions": {label: score}}})
+        or its stored form (emotions as an "emotion_scores" list).
+        """
+        fb = chunk.get("feedback") or {}
+        raw = fb.get("emotion_scores")
+        if raw is None:
+            raw = fb.get("emotions")
+        return cls(
+            chunk_index=int(chunk.get("chunk_index") or 0),
+            chunk_start_time=chunk.get("chunk_start_time"),
+            chunk_end_time=chunk.get("chunk_end_time"),
+            transcript=fb.get("transcript") or "",
+            clarity_score=fb.get("clarity_score"),
+            confidence_score=fb.get("confidence_score"),
+            emotion_scores=emotion_matrix.to_vector(raw),
+            speech_ratio=fb.get("speech_ratio"),
+            audio_path=fb.get("audio_path"),
+            processed_at=fb.get("processed_at"),
+            saved_at=chunk.get("saved_at"),
+        )
+
+    def to_dict(self) -> dict:
+        """Stored/API shape; emotion_scores stays an ndarray (dumps() handles it)."""
+        return {
+            "chunk_index": self.chunk_index,
+            "chunk_start_time": self.chunk_start_time,
+            "chunk_end_time": self.chunk_end_time,
+            "feedback": {
+                "transcript": self.transcript,
+                "clarity_score": self.clarity_score,
+                "confidence_score": self.confidence_score,
+                "emotion_scores": self.emotion_scores,
+                "speech_ratio": self.speech_ratio,
+                "audio_path": self.audio_path,
+                "processed_at": self.processed_at,
+            },
+            "saved_at": self.saved_at,
+        }
+
+
+class Session:
+    __slots__ = ("id", "user_id", "title", "questions", "chunks", "created_at",
+                 "completed", "aggregated_feedback", "completed_at")
+
+    def __init__(self, id: str, user_id: Optional[str], title: str, questions: List[Question],
+                 chunks: Optional[Dict[str, List[ChunkFeedback]]] = None, created_at: Optional[str] = None,
+                 completed: bool = False, aggregated_feedback: Optional[dict] = None, completed_at: Optional[str] = None):
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.questions = questions
+        self.chunks = chunks if chunks is not None else {}  # question_id → [ChunkFeedback] by chunk_index
+        self.created_at = created_at
+        self.completed = completed
+        self.aggregated_feedback = aggregated_feedback
+        self.completed_at = completed_at
+
+    def to_dict(self) -> dict:
+        out = {
+            "id": self.id,
+            "user_id": self.user_id,
+            "title": self.title,
+            "questions": [q.to_dict() for q in self.questions],
+            "chunks": {qid: [c.to_dict() for c in chunks] for qid, chunks in self.chunks.items()},
+            "created_at": self.created_at,
+            "completed": self.completed,
+            "aggregated_feedback": self.aggregated_feedback,
+        }
+        if self.completed_at:
+            out["completed_at"] = self.completed_at
+        return out
+
+
+def _default(obj: Any):
+    if isinstance(obj, (Session, Question, ChunkFeedback)):
+        return obj.to_dict()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize records / plain structures (ndarrays included) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
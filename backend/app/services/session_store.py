@@ -1,17 +1,332 @@
 # backend/app/services/session_store.py
 
 """
-A simple in-memory session store for interview sessions.
-This is NOT persistent — restart backend = all sessions reset.
-Replace later with MongoDB/Postgres.
+Session store for interview sessions.
+
+Two interchangeable backends, selected with SESSION_STORE_BACKEND:
+  - "sqlite" (default): durable file under DATA_DIR in WAL mode, so sessions
+    survive restarts and several uvicorn workers can share them.
+  - "memory": the original in-process dict (restart = all sessions reset).
+
+The module-level functions below are the public API; both backends return
+slotted Session records (see session_models; .to_dict() gives the JSON
+shape). Alongside the chunks, each backend keeps a running per-question
+accumulator (see session_metrics) that is updated in O(1) on every
+add_chunk_feedback.
 """
 
+import os
+import sqlite3
+import threading
 import uuid
 from datetime import datetime
 
+from app import config
+from app.services import session_metrics
+from app.services.session_models import ChunkFeedback, Question, Session, dumps, loads
+
+
+def _ensure_data_dir():
+    os.makedirs(config.DATA_DIR, exist_ok=True)
+
+
+def _new_session(user_id, title, questions):
+    return Session(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        title=title,
+        questions=[q if isinstance(q, Question) else Question.from_dict(q) for q in (questions or [])],
+        chunks={},      # question_id → list of ChunkFeedback
+        created_at=datetime.utcnow().isoformat(),
+    )
+
+
+def _copy_accumulator(acc):
+    out = dict(acc)
+    if "samples" in out:
+        out["samples"] = list(out["samples"])
+    return out
+
+
+# -------------------------
+# In-memory backend
+# -------------------------
+class MemorySessionBackend:
+    def __init__(self):
+        self._sessions = {}  # session_id → session_object
+        self._stats = {}     # session_id → {question_id → accumulator}
+        self._lock = threading.Lock()
+
+    def create_session(self, user_id=None, title="Interview Session", questions=None):
+        session_obj = _new_session(user_id, title, questions)
+        with self._lock:
+            self._sessions[session_obj.id] = session_obj
+            self._stats[session_obj.id] = {}
+        return session_obj
+
+    def get_session(self, session_id, include_chunks=True, chunks_offset=0, chunks_limit=None):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            chunks = {}
+            if include_chunks:
+                if not chunks_offset and chunks_limit is None:
+                    chunks = {qid: list(items) for qid, items in session.chunks.items()}
+                else:
+                    end = None if chunks_limit is None else chunks_offset + chunks_limit
+                    chunks = {qid: sorted(items, key=lambda c: c.chunk_index)[chunks_offset:end]
+                              for qid, items in session.chunks.items()}
+            return self._snapshot(session, chunks)
+
+    @staticmethod
+    def _snapshot(session, chunks):
+        # a copy taken under the lock, so serializing it can't race with add_chunk_feedback
+        # (ChunkFeedback records are replaced, never mutated, so sharing them is safe)
+        return Session(session.id, session.user_id, session.title, list(session.questions), chunks,
+                       session.created_at, session.completed, session.aggregated_feedback, session.completed_at)
+
+    def session_exists(self, session_id):
+        return session_id in self._sessions
+
+    def add_chunk_feedback(self, session_id, question_id, chunk: ChunkFeedback):
+        question_id = str(question_id)
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session:
+                raise ValueError("Session not found")
+            chunks = session.chunks.setdefault(question_id, [])
+            acc = self._stats[session_id].get(question_id)
+            if acc is None:
+                acc = self._stats[session_id][question_id] = session_metrics.new_accumulator()
+            # same key as the sqlite backend: a re-uploaded chunk replaces the old one
+            for i, existing in enumerate(chunks):
+                if existing.chunk_index == chunk.chunk_index:
+                    session_metrics.apply(acc, session_metrics.chunk_metrics(existing), sign=-1)
+                    chunks[i] = chunk
+                    break
+            else:
+                chunks.append(chunk)
+            session_metrics.apply(acc, session_metrics.chunk_metrics(chunk))
+        return True
+
+    def get_question_stats(self, session_id):
+        with self._lock:
+            stats = self._stats.get(session_id)
+            if stats is None:
+                return None
+            # copy so callers can't race with concurrent updates: apply() replaces
+            # the score-sum lists, but grows / overwrites the "samples" list in place
+            return {qid: _copy_accumulator(acc) for qid, acc in stats.items()}
+
+    def complete_session(self, session_id, aggregated_feedback):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session:
+                raise ValueError("Session not found")
+            session.completed = True
+            session.aggregated_feedback = aggregated_feedback
+            session.completed_at = datetime.utcnow().isoformat()
+            return self._snapshot(session, {qid: list(items) for qid, items in session.chunks.items()})
+
+    def list_sessions(self, user_id=None, include_chunks=True):
+        with self._lock:
+            return [
+                self._snapshot(s, {qid: list(items) for qid, items in s.chunks.items()} if include_chunks else {})
+                for s in self._sessions.values()
+                if user_id is None or s.user_id == user_id
+            ]
+
+    def user_question_ids(self, user_id):
+        with self._lock:
+            return {q.id for s in self._sessions.values() if s.user_id == user_id for q in s.questions}
+
+
+# -------------------------
+# SQLite backend
+# -------------------------
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    title TEXT,
+    questions TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    completed_at TEXT,
+    aggregated_feedback TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_id, created_at);
+CREATE TABLE IF NOT EXISTS chunks (
+    session_id TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, question_id, chunk_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS question_stats (
+    session_id TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, question_id)
+) WITHOUT ROWID;
+"""
+
+
+_NO_LIMIT = 2 ** 62  # upper bound for an unbounded chunk page
+
+
+class SQLiteSessionBackend:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # one connection per thread
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
 
-# Global in-memory storage
-_SESSIONS = {}  # session_id → session_object
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _row_to_session(self, row, chunk_rows):
+        chunks = {}
+        for c in chunk_rows:
+            chunks.setdefault(c["question_id"], []).append(ChunkFeedback.from_dict(loads(c["data"])))
+        return Session(
+            id=row["id"],
+            user_id=row["user_id"],
+            title=row["title"],
+            questions=[Question.from_dict(q) for q in loads(row["questions"])],
+            chunks=chunks,
+            created_at=row["created_at"],
+            completed=bool(row["completed"]),
+            aggregated_feedback=loads(row["aggregated_feedback"]) if row["aggregated_feedback"] else None,
+            completed_at=row["completed_at"],
+        )
+
+    def create_session(self, user_id=None, title="Interview Session", questions=None):
+        s = _new_session(user_id, title, questions)
+        self._conn().execute(
+            "INSERT INTO sessions (id, user_id, title, questions, created_at) VALUES (?, ?, ?, ?, ?)",
+            (s.id, user_id, title, dumps(s.questions).decode("utf-8"), s.created_at),
+        )
+        return s
+
+    def get_session(self, session_id, include_chunks=True, chunks_offset=0, chunks_limit=None):
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        if not include_chunks:
+            chunk_rows = []
+        elif chunks_offset or chunks_limit is not None:
+            # page within each question: rn = position of the chunk in its question
+            chunk_rows = conn.execute(
+                """
+                SELECT question_id, data FROM (
+                    SELECT question_id, chunk_index, data,
+                           ROW_NUMBER() OVER (PARTITION BY question_id ORDER BY chunk_index) - 1 AS rn
+                    FROM chunks WHERE session_id = ?
+                ) WHERE rn >= ? AND rn < ?
+                ORDER BY question_id, chunk_index
+                """,
+                (session_id, chunks_offset, chunks_offset + chunks_limit if chunks_limit is not None else _NO_LIMIT),
+            ).fetchall()
+        else:
+            chunk_rows = conn.execute(
+                "SELECT question_id, data FROM chunks WHERE session_id = ? ORDER BY question_id, chunk_index",
+                (session_id,),
+            ).fetchall()
+        return self._row_to_session(row, chunk_rows)
+
+    def session_exists(self, session_id):
+        return self._conn().execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+    def add_chunk_feedback(self, session_id, question_id, chunk: ChunkFeedback):
+        conn = self._conn()
+        qid = str(question_id)
+        idx = chunk.chunk_index
+        # IMMEDIATE: take the write lock up front so concurrent workers
+        # serialize their read-modify-write of the accumulator
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is None:
+                raise ValueError("Session not found")
+            row = conn.execute(
+                "SELECT data FROM question_stats WHERE session_id = ? AND question_id = ?", (session_id, qid)
+            ).fetchone()
+            acc = loads(row["data"]) if row else session_metrics.new_accumulator()
+            old = conn.execute(
+                "SELECT data FROM chunks WHERE session_id = ? AND question_id = ? AND chunk_index = ?",
+                (session_id, qid, idx),
+            ).fetchone()
+            if old is not None:
+                session_metrics.apply(acc, session_metrics.chunk_metrics(ChunkFeedback.from_dict(loads(old["data"]))), sign=-1)
+            session_metrics.apply(acc, session_metrics.chunk_metrics(chunk))
+            conn.execute(
+                "INSERT OR REPLACE INTO chunks (session_id, question_id, chunk_index, data) VALUES (?, ?, ?, ?)",
+                (session_id, qid, idx, dumps(chunk).decode("utf-8")),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO question_stats (session_id, question_id, data) VALUES (?, ?, ?)",
+                (session_id, qid, dumps(acc).decode("utf-8")),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def get_question_stats(self, session_id):
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is None:
+            return None
+        rows = conn.execute(
+            "SELECT question_id, data FROM question_stats WHERE session_id = ?", (session_id,)
+        ).fetchall()
+        return {r["question_id"]: loads(r["data"]) for r in rows}
+
+    def complete_session(self, session_id, aggregated_feedback):
+        completed_at = datetime.utcnow().isoformat()
+        cur = self._conn().execute(
+            "UPDATE sessions SET completed = 1, completed_at = ?, aggregated_feedback = ? WHERE id = ?",
+            (completed_at, dumps(aggregated_feedback).decode("utf-8"), session_id),
+        )
+        if cur.rowcount == 0:
+            raise ValueError("Session not found")
+        return self.get_session(session_id)
+
+    def list_sessions(self, user_id=None, include_chunks=True):
+        conn = self._conn()
+        if user_id is None:
+            ids = conn.execute("SELECT id FROM sessions ORDER BY created_at").fetchall()
+        else:
+            ids = conn.execute("SELECT id FROM sessions WHERE user_id = ? ORDER BY created_at", (user_id,)).fetchall()
+        return [self.get_session(r["id"], include_chunks=include_chunks) for r in ids]
+
+    def user_question_ids(self, user_id):
+        # one indexed query over the questions column, no per-session lookups
+        rows = self._conn().execute("SELECT questions FROM sessions WHERE user_id = ?", (user_id,)).fetchall()
+        return {str(q.get("id")) for r in rows for q in loads(r["questions"])}
+
+
+def _make_backend():
+    if config.SESSION_STORE_BACKEND == "memory":
+        return MemorySessionBackend()
+    return SQLiteSessionBackend(config.SESSION_DB_PATH)
+
+
+# Active backend (chosen once per process)
+_BACKEND = _make_backend()
 
 
 def create_session(user_id=None, title="Interview Session", questions=None):
@@ -19,47 +334,38 @@ def create_session(user_id=None, title="Interview Session", questions=None):
     Create a new interview session.
     questions = list of { id, text, type, domain }
     """
-    session_id = str(uuid.uuid4())
-
-    session_obj = {
-        "id": session_id,
-        "user_id": user_id,
-        "title": title,
-        "questions": questions or [],
-        "chunks": {},      # question_id → list of chunk feedback
-        "created_at": datetime.utcnow().isoformat(),
-        "completed": False,
-        "aggregated_feedback": None,
-    }
+    return _BACKEND.create_session(user_id=user_id, title=title, questions=questions)
+
 
-    _SESSIONS[session_id] = session_obj
-    return session_obj
+def get_session(session_id, include_chunks=True, chunks_offset=0, chunks_limit=None):
+    """
+    Return the Session record or None (treat it as read-only).
+    include_chunks=False skips loading chunks entirely; chunks_offset /
+    chunks_limit page each question's chunks (ordered by chunk_index).
+    """
+    return _BACKEND.get_session(session_id, include_chunks=include_chunks,
+                                chunks_offset=chunks_offset, chunks_limit=chunks_limit)
 
 
-def get_session(session_id):
-    """Return session object or None."""
-    return _SESSIONS.get(session_id)
+def session_exists(session_id):
+    """Cheap existence check (doesn't load the session's chunks)."""
+    return _BACKEND.session_exists(session_id)
 
 
 def add_chunk_feedback(session_id, question_id, chunk_feedback):
     """
-    Insert chunk-level feedback.
+    Insert chunk-level feedback (keyed by session, question and chunk_index;
+    re-sending the same chunk_index replaces the earlier entry).
     chunk_feedback = {
         "chunk_index": int,
         "transcript": str,
         "emotions": {},
         "scores": {},
     }
+    Stored as a ChunkFeedback record (emotions as a compact float32 vector);
+    the caller's dict is not modified.
     """
-    session = _SESSIONS.get(session_id)
-    if not session:
-        raise ValueError("Session not found")
-
-    if question_id not in session["chunks"]:
-        session["chunks"][question_id] = []
-
-    session["chunks"][question_id].append(chunk_feedback)
-    return True
+    return _BACKEND.add_chunk_feedback(session_id, question_id, ChunkFeedback.from_dict(chunk_feedback))
 
 
 def complete_session(session_id, aggregated_feedback):
@@ -67,16 +373,25 @@ def complete_session(session_id, aggregated_feedback):
     Mark session as completed and store aggregated feedback.
     aggregated_feedback = dict returned by your feedback/analyze + aggregator
     """
-    session = _SESSIONS.get(session_id)
-    if not session:
-        raise ValueError("Session not found")
+    return _BACKEND.complete_session(session_id, aggregated_feedback)
+
 
-    session["completed"] = True
-    session["aggregated_feedback"] = aggregated_feedback
-    session["completed_at"] = datetime.utcnow().isoformat()
-    return session
+def get_question_stats(session_id):
+    """
+    Running per-question accumulators for a session ({question_id: acc}),
+    or None if the session doesn't exist. See session_metrics.finalize.
+    """
+    return _BACKEND.get_question_stats(session_id)
+
+
+def list_sessions(user_id=None, include_chunks=True):
+    """
+    List all sessions (optionally only one user's). include_chunks=False
+    skips loading chunks (e.g. when only the questions are needed).
+    """
+    return _BACKEND.list_sessions(user_id=user_id, include_chunks=include_chunks)
 
 
-def list_sessions():
-    """Debug helper — list all sessions."""
-    return list(_SESSIONS.values())
+def user_question_ids(user_id):
+    """Ids of every question asked in the user's sessions (one query)."""
+    return _BACKEND.user_question_ids(user_id)
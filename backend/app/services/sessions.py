@@ -46,4 +46,4 @@ def create_session(body: CreateSessionBody):
     # 2) create session in store and attach questions
     sess = session_store.create_session(user_id=body.user_id, title=body.title, questions=questions)
 
-    return {"id": sess["id"], "questions": questions}
+    return {"id": sess.id, "questions": questions}
@@ -0,0 +1,246 @@
+# backend/app/services/skill_matcher.py
+"""
+Single-pass skill matching for resumes.
+
+A taxonomy maps canonical skill names to aliases ("scikit-learn" →
+["sklearn", "scikit learn"]). All names and aliases are compiled once into
+one regex built from a character trie, so each resume position tries one
+branch per character instead of one alternative per alias, and the whole
+resume is scanned once regardless of taxonomy size (the old per-skill
+\\b...\\b search was O(skills × resume length)).
+
+The taxonomy is read from SKILL_TAXONOMY_PATH when that file exists,
+either {"canonical": ["alias", ...], ...} or a list of
+{"name": ..., "aliases": [...]}; otherwise the built-in one below is used.
+
+  python -m app.services.skill_matcher  → scaling micro-benchmark
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# canonical name → aliases; canonical names match the old SKILL_KEYWORDS
+BUILTIN_TAXONOMY: Dict[str, List[str]] = {
+    "python": ["python3"],
+    "java": [],
+    "c++": ["cpp"],
+    "pytorch": ["torch"],
+    "tensorflow": ["tf2", "keras"],
+    "sklearn": ["scikit-learn", "scikit learn"],
+    "react": ["react.js", "reactjs"],
+    "node": ["node.js", "nodejs"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "nlp": ["natural language processing"],
+    "transformers": ["hugging face transformers"],
+    "sql": [],
+    "postgres": ["postgresql"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+}
+
+
+# bump when matching rules change, so cached skill lists are recomputed
+_MATCHER_VERSION = 2
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex source matching any of `words` (longest first), factored as a trie.
+    Boundaries are per term, like the old \\b...\\b search: a term starting
+    (ending) with a word character must not be preceded (followed) by one;
+    a symbol at either end needs no check, so "c++" matches in "c++11".
+    """
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of word
+
+    def is_word(ch: str) -> bool:
+        return ch.isalnum() or ch == "_"
+
+    def build(node: dict, last: str) -> str:
+        branches = []
+        for ch, child in sorted(node.items()):
+            if ch:
+                lead = r"(?<!\w)" if not last and is_word(ch) else ""
+                branches.append(lead + re.escape(ch) + build(child, ch))
+        if "" in node:
+            # tried after the longer continuations, so the longest alias wins
+            branches.append(r"(?!\w)" if is_word(last) else "")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie, "")
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.canonical: Dict[str, str] = {}  # lowercased alias / name → canonical
+        for name, aliases in taxonomy.items():
+            for term in [name, *(aliases or [])]:
+                term = " ".join(str(term).lower().split())
+                if term:
+                    self.canonical.setdefault(term, name)
+        # changes whenever a name or alias (or the matching rules) does; salts skill caches
+        self.identity = hashlib.sha256(
+            json.dumps([_MATCHER_VERSION, sorted(self.canonical.items())]).encode("utf-8")
+        ).hexdigest()[:16]
+        source = _trie_pattern(self.canonical) if self.canonical else "(?!)"
+        self._regex = re.compile(source, re.IGNORECASE)
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def match(self, text: str) -> Dict[str, dict]:
+        """{canonical: {"count": n, "positions": [(start, end), ...]}} in one scan of `text`."""
+        found: Dict[str, dict] = {}
+        for m in self._regex.finditer(text or ""):
+            name = self.canonical.get(" ".join(m.group().lower().split()))
+            if name is None:
+                continue
+            entry = found.get(name)
+            if entry is None:
+                entry = found[name] = {"count": 0, "positions": []}
+            entry["count"] += 1
+            entry["positions"].append((m.start(), m.end()))
+        return found
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills found, most mentioned first (ties: earliest mention)."""
+        found = self.match(text)
+        return sorted(found, key=lambda s: (-found[s]["count"], found[s]["positions"][0][0]))
+
+
+def load_taxonomy(path: Optional[str]) -> Dict[str, List[str]]:
+    if not path or not os.path.exists(path):
+        return dict(BUILTIN_TAXONOMY)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {item["name"]: item.get("aliases") or [] for item in data if isinstance(item, dict) and item.get("name")}
+    return {str(k): [str(a) for a in (v or [])] for k, v in data.items()}
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> SkillMatcher:
+    """Process-wide matcher, compiled on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                try:
+                    taxonomy = load_taxonomy(config.SKILL_TAXONOMY_PATH)
+                except Exception:
+                    logger.exception("could not read skill taxonomy %s; using built-in", config.SKILL_TAXONOMY_PATH)
+                    taxonomy = dict(BUILTIN_TAXONOMY)
+                _matcher = SkillMatcher(taxonomy)
+    return _matcher
+
+
+# -------------------------
+# Micro-benchmark
+# -------------------------
+def _synthetic_taxonomy(size: int) -> Dict[str, List[str]]:
+    taxonomy = dict(BUILTIN_TAXONOMY)
+    i = 0
+    while len(taxonomy) < size:
+        taxonomy[f"skill{i}x"] = [f"skill {i} x", f"sk{i}"]
+        i += 1
+    return taxonomy
+
+
+def _naive_extract(text: str, taxonomy: Dict[str, List[str]]) -> List[str]:
+    # the previous implementation: one regex search per name / alias
+    txt = text.lower()
+    found = []
+    for name, aliases in taxonomy.items():
+        for term in [name, *aliases]:
+            if re.search(r"\b" + re.escape(term.lower()) + r"\b", txt):
+                found.append(name)
+                break
+    return found
+
+
+# (text, skills that must be found); symbol-ending names keep matching before digits / punctuation
+BOUNDARY_CASES: List[Tuple[str, List[str]]] = [
+    ("Wrote C++11 and Java services", ["c++", "java"]),
+    ("Modern c++ (c++17), some python3.", ["c++", "python"]),
+    ("JavaScript and TypeScript only", []),
+    ("Frontends in React.js, APIs in node.js", ["react", "node"]),
+    ("scikit-learn, k8s, PostgreSQL", ["sklearn", "kubernetes", "postgres"]),
+]
+
+
+def check_boundaries(matcher: SkillMatcher) -> List[Tuple[str, List[str], List[str]]]:
+    """Boundary cases whose extracted skills differ from the expected ones: [(text, expected, got)]."""
+    failures = []
+    for text, expected in BOUNDARY_CASES:
+        got = matcher.extract(text)
+        if sorted(got) != sorted(expected):
+            failures.append((text, expected, got))
+    return failures
+
+
+def _bench(sizes: List[int], resume_words: int, repeat: int) -> List[Tuple[int, float, float, float]]:
+    words = ("Built data pipelines in Python and SQL on AWS, deployed with Docker and k8s; "
+             "trained PyTorch and scikit-learn models for NLP using Hugging Face transformers. ").split()
+    text = " ".join(words[i % len(words)] for i in range(resume_words))
+    rows = []
+    for size in sizes:
+        taxonomy = _synthetic_taxonomy(size)
+        t = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        compile_ms = (time.perf_counter() - t) * 1000
+        t = time.perf_counter()
+        for _ in range(repeat):
+            matcher.extract(text)
+        compiled_ms = (time.perf_counter() - t) * 1000 / repeat
+        naive_repeat = max(1, repeat // 10)
+        t = time.perf_counter()
+        for _ in range(naive_repeat):
+            _naive_extract(text, taxonomy)
+        naive_ms = (time.perf_counter() - t) * 1000 / naive_repeat
+        rows.append((size, compile_ms, compiled_ms, naive_ms))
+    return rows
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Skill matcher scaling benchmark (compiled trie regex vs per-skill regex).")
+    parser.add_argument("--sizes", default="20,200,1000,5000", help="comma-separated taxonomy sizes")
+    parser.add_argument("--words", type=int, default=800, help="resume length in words")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    failures = check_boundaries(SkillMatcher(BUILTIN_TAXONOMY))
+    print(f"boundary cases: {len(BOUNDARY_CASES) - len(failures)}/{len(BOUNDARY_CASES)} ok")
+    for text, expected, got in failures:
+        print(f"  {text!r}: expected {expected}, got {got}")
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(f"{'skills':>8} {'compile ms':>11} {'compiled ms':>12} {'per-skill ms':>13} {'speedup':>8}")
+    for size, compile_ms, compiled_ms, naive_ms in _bench(sizes, args.words, args.repeat):
+        print(f"{size:>8} {compile_ms:>11.1f} {compiled_ms:>12.3f} {naive_ms:>13.3f} {naive_ms / max(compiled_ms, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
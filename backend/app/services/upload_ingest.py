@@ -0,0 +1,222 @@
+# backend/app/services/upload_ingest.py
+"""
+Size-limited multipart uploads for /files/upload and the /feedback routes.
+
+Those routes take the raw Request and parse the body with read_form()
+instead of declaring File()/Form() parameters: FastAPI would spool the
+whole body to a temp file before the handler runs, so a limit checked
+afterwards can't stop a client from filling the disk. read_form() rejects
+a Content-Length above the limit before reading anything and counts the
+body while the multipart parser consumes it, raising UploadTooLarge (413)
+as soon as it is exceeded.
+
+ingest_upload() then reads the parsed file part in bounded pieces, hashing
+on the fly and optionally writing it to disk (file I/O off the event loop)
+or keeping it in memory. form_text() / form_int() / form_file() read the
+other fields, and form_schema() documents the body in OpenAPI.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, UploadFile
+from starlette.datastructures import FormData
+from starlette.formparsers import MultiPartParser
+
+from app import config
+
+
+class UploadTooLarge(Exception):
+    """Upload exceeded its byte limit (routes map this to 413)."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"upload exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+# multipart framing and small form fields allowed on top of a file's byte limit
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class IngestResult:
+    __slots__ = ("size", "sha256", "path", "data", "seconds")
+
+    def __init__(self, size: int, sha256: str, path: Optional[str], data: Optional[bytes], seconds: float):
+        self.size = size
+        self.sha256 = sha256
+        self.path = path
+        self.data = data
+        self.seconds = seconds
+
+
+# ingest throughput counters (per route label)
+_STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+def _record(label: str, size: int, seconds: float, rejected: bool = False):
+    with _STATS_LOCK:
+        st = _STATS.setdefault(label, {"uploads": 0, "bytes": 0, "seconds": 0.0, "rejected": 0, "max_bytes": 0})
+        if rejected:
+            st["rejected"] += 1
+            return
+        st["uploads"] += 1
+        st["bytes"] += size
+        st["seconds"] += seconds
+        st["max_bytes"] = max(st["max_bytes"], size)
+
+
+def stats() -> dict:
+    with _STATS_LOCK:
+        out = {}
+        for label, st in _STATS.items():
+            out[label] = {
+                **st,
+                "throughput_mb_s": (st["bytes"] / st["seconds"] / (1024 * 1024)) if st["seconds"] else 0.0,
+                "avg_bytes": (st["bytes"] / st["uploads"]) if st["uploads"] else 0.0,
+            }
+        return out
+
+
+def _remove_quietly(path: str):
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError:
+        pass
+
+
+async def ingest_upload(
+    upload: UploadFile,
+    max_bytes: int,
+    dest_path: Optional[str] = None,
+    keep_bytes: bool = False,
+    label: str = "upload",
+    piece_size: Optional[int] = None,
+) -> IngestResult:
+    """
+    Read `upload` (a part parsed by read_form) in pieces of piece_size bytes.
+      - dest_path: also write the upload there (writes run in a worker thread)
+      - keep_bytes: return the content in memory (bounded by max_bytes)
+    Raises UploadTooLarge as soon as more than max_bytes have been read;
+    a partially written dest_path is removed.
+    """
+    piece_size = piece_size or config.UPLOAD_PIECE_BYTES
+    started = time.perf_counter()
+    digest = hashlib.sha256()
+    pieces = [] if keep_bytes else None
+    size = 0
+    f = None
+    try:
+        if dest_path:
+            f = await asyncio.to_thread(open, dest_path, "wb")
+        while True:
+            piece = await upload.read(piece_size)
+            if not piece:
+                break
+            size += len(piece)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(piece)
+            if pieces is not None:
+                pieces.append(piece)
+            if f is not None:
+                await asyncio.to_thread(f.write, piece)
+    except BaseException as e:
+        if f is not None:
+            await asyncio.to_thread(f.close)
+            f = None
+            await asyncio.to_thread(_remove_quietly, dest_path)
+        if isinstance(e, UploadTooLarge):
+            _record(label, size, 0.0, rejected=True)
+        raise
+    finally:
+        if f is not None:
+            await asyncio.to_thread(f.close)
+
+    seconds = time.perf_counter() - started
+    _record(label, size, seconds)
+    return IngestResult(
+        size=size,
+        sha256=digest.hexdigest(),
+        path=dest_path,
+        data=b"".join(pieces) if pieces is not None else None,
+        seconds=seconds,
+    )
+
+
+async def _limited_stream(request: Request, max_bytes: int):
+    size = 0
+    async for piece in request.stream():
+        size += len(piece)
+        if size > max_bytes + FORM_OVERHEAD_BYTES:
+            raise UploadTooLarge(max_bytes)
+        yield piece
+
+
+async def read_form(request: Request, max_bytes: int, label: str = "upload", max_files: int = 1) -> FormData:
+    """
+    Parse a multipart request body whose file parts may hold up to max_bytes.
+    A Content-Length above the limit is rejected before anything is read, and
+    the body is counted as it streams in, so UploadTooLarge is raised while
+    uploading rather than after Starlette has spooled the whole file.
+    Raises ValueError for a non-multipart body. Close the result (await form.close()).
+    """
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes + FORM_OVERHEAD_BYTES:
+        _record(label, 0, 0.0, rejected=True)
+        raise UploadTooLarge(max_bytes)
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise ValueError("expected a multipart/form-data body")
+    parser = MultiPartParser(request.headers, _limited_stream(request, max_bytes), max_files=max_files, max_fields=16)
+    try:
+        return await parser.parse()
+    except UploadTooLarge:
+        _record(label, 0, 0.0, rejected=True)
+        raise
+
+
+def form_file(form: FormData, name: str) -> UploadFile:
+    value = form.get(name)
+    if value is None or isinstance(value, str):
+        raise ValueError(f"{name} file is required")
+    return value
+
+
+def form_text(form: FormData, name: str, required: bool = False) -> Optional[str]:
+    value = form.get(name)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{name} must be a text field")
+    if not value:
+        if required:
+            raise ValueError(f"{name} is required")
+        return None
+    return value
+
+
+def form_int(form: FormData, name: str, required: bool = False, default: Optional[int] = None) -> Optional[int]:
+    value = form_text(form, name, required)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+def form_schema(file_field: str, fields: Dict[str, dict], required: Iterable[str] = ()) -> dict:
+    """openapi_extra for a route that parses its multipart body with read_form (FastAPI can't infer it)."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": {
+                "type": "object",
+                "required": [file_field, *required],
+                "properties": {file_field: {"type": "string", "format": "binary"}, **fields},
+            }}},
+        }
+    }